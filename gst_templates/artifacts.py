@@ -0,0 +1,217 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import logging
+import os
+import zipfile
+
+from gst_templates.common import imports
+from gst_templates import indexes
+from gst_templates import paths
+
+
+jinja2 = imports.lazy_import("jinja2")
+
+
+LOG = logging.getLogger(__name__)
+
+# The name of the artifact metadata inside the archive
+METADATA_FILE_NAME = "artifact.json"
+
+# Path segment templates are stored under names which can not clash with
+# template files
+SEGMENT_TEMPLATE_PREFIX = "@segment:"
+
+
+class TemplateCompileError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(
+            "\n".join(f"{name}:{lineno}: {message}" for name, lineno, message in errors)
+        )
+
+
+class TemplateArtifact:
+    """
+    A template precompiled into Python modules.
+
+    The artifact is a zip archive with one module per file and path segment
+    template, in the layout of `jinja2.Environment.compile_templates`, and
+    the template index the modules were compiled from. Templates are loaded
+    from it through `jinja2.ModuleLoader`, so nothing is parsed by Jinja at
+    render time.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, template_name, template_version, entries, segments):
+        super().__init__()
+        self._path = path
+        self._template_name = template_name
+        self._template_version = template_version
+        self._entries = entries
+        self._segments = segments
+
+    @staticmethod
+    def _get_hashes(entries):
+        return {entry.name: entry.hash for entry in entries if not entry.is_dir}
+
+    @classmethod
+    def compile(cls, template_settings, environment, artifact_path):
+        """
+        Compile all templates of a template and save them as an artifact.
+
+        Every file and path segment with Jinja markup is compiled, and all
+        syntax errors are collected before anything is written.
+
+        :param template_settings: The template settings.
+        :type template_settings: gst_templates.settings.TemplateSetting
+        :param environment: The environment to compile with. It must be
+            configured like the environment the artifact is rendered with.
+        :type environment: jinja2.Environment
+        :param artifact_path: The path of the artifact to write.
+        :type artifact_path: str
+        :return: The artifact.
+        :rtype: TemplateArtifact
+        :raises TemplateCompileError: If any template has a syntax error.
+        """
+        index = template_settings.index
+        modules = {}
+        segments = {}
+        errors = []
+
+        def compile_source(name, source, filename=None):
+            try:
+                modules[name] = environment.compile(
+                    source, name, filename, raw=True, defer_init=True
+                )
+            except jinja2.TemplateSyntaxError as e:
+                errors.append((e.filename or name, e.lineno, e.message))
+
+        for entry in index.entries:
+            # Every directory has its own entry, so the last segments of all
+            # entries cover all segments
+            segment = entry.name.rsplit("/", 1)[-1]
+            if segment not in segments and paths.TEMPLATE_MARKERS_RE.search(segment):
+                segments[segment] = SEGMENT_TEMPLATE_PREFIX + segment
+                compile_source(segments[segment], segment, entry.name)
+
+            if entry.is_dir or not entry.needs_render:
+                continue
+            source_path = index.get_path(entry)
+            with open(source_path, "r", encoding="utf-8") as fp:
+                compile_source(entry.name, fp.read(), source_path)
+
+        if errors:
+            raise TemplateCompileError(errors)
+
+        artifact = cls(
+            artifact_path,
+            template_settings.name,
+            template_settings.version,
+            index.entries,
+            segments,
+        )
+        tmp_path = f"{artifact_path}.{os.getpid()}.tmp"
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, code in modules.items():
+                zf.writestr(jinja2.ModuleLoader.get_module_filename(name), code)
+            zf.writestr(METADATA_FILE_NAME, json.dumps(artifact._get_metadata()))
+        os.replace(tmp_path, artifact_path)
+        return artifact
+
+    def _get_metadata(self):
+        return {
+            "version": self.VERSION,
+            "jinja2": jinja2.__version__,
+            "template_name": self._template_name,
+            "template_version": self._template_version,
+            "entries": self._entries,
+            "segments": self._segments,
+        }
+
+    @classmethod
+    def load(cls, artifact_path):
+        """
+        Load an artifact.
+
+        :param artifact_path: The path of the artifact.
+        :type artifact_path: str
+        :return: The artifact or None if there is no usable artifact, like
+            one compiled by another version of Jinja.
+        :rtype: TemplateArtifact or None
+        """
+        try:
+            with zipfile.ZipFile(artifact_path) as zf:
+                data = json.loads(zf.read(METADATA_FILE_NAME))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+        if data.get("version") != cls.VERSION or data.get("jinja2") != (
+            jinja2.__version__
+        ):
+            LOG.warning("Ignoring incompatible template artifact %s", artifact_path)
+            return None
+
+        return cls(
+            artifact_path,
+            data["template_name"],
+            data["template_version"],
+            [indexes.IndexEntry(*entry) for entry in data["entries"]],
+            data["segments"],
+        )
+
+    def is_up_to_date(self, template_settings):
+        """
+        Check that the artifact was compiled from the current template.
+
+        :param template_settings: The template settings.
+        :type template_settings: gst_templates.settings.TemplateSetting
+        :return: Whether the name, the version and the content of every file
+            of the template match the artifact.
+        :rtype: bool
+        """
+        return (
+            self._template_name == template_settings.name
+            and self._template_version == template_settings.version
+            and self._get_hashes(self._entries)
+            == self._get_hashes(template_settings.index.entries)
+        )
+
+    def get_loader(self):
+        """
+        Build a loader of the compiled templates.
+
+        :return: The loader.
+        :rtype: jinja2.ModuleLoader
+        """
+        return jinja2.ModuleLoader(self._path)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def segments(self):
+        """
+        The compiled path segment templates.
+
+        :return: A dict mapping the literal text of path segments to the
+            names of their templates.
+        :rtype: dict
+        """
+        return self._segments
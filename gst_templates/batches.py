@@ -0,0 +1,145 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+from concurrent import futures
+import json
+import logging
+import os
+import time
+
+from gst_templates.common import imports
+from gst_templates import renders
+from gst_templates import repositories
+
+
+yaml = imports.lazy_import("yaml")
+
+
+LOG = logging.getLogger(__name__)
+
+
+ProjectResult = collections.namedtuple(
+    "ProjectResult",
+    ["target_directory", "duration", "files", "error"],
+)
+
+
+class UncommittedChanges(Exception):
+    pass
+
+
+def load_batch_file(batch_file_path):
+    """
+    Load project entries from a batch file.
+
+    The file is either a YAML list or a JSONL file with one entry per line.
+    Every entry is a dictionary with the `target_directory` of the project
+    and optional `settings` overrides, grouped by section like in the
+    template settings file.
+
+    :param batch_file_path: The path to the batch file.
+    :type batch_file_path: str
+    :return: The list of project entries.
+    :rtype: list
+    """
+    with open(batch_file_path, "r", encoding="utf-8") as fp:
+        if os.path.splitext(batch_file_path)[1] in (".yaml", ".yml"):
+            entries = yaml.safe_load(fp) or []
+        else:
+            entries = [json.loads(line) for line in fp if line.strip()]
+
+    for entry in entries:
+        if "target_directory" not in entry:
+            raise ValueError(f"Entry {entry} has no target_directory")
+    return entries
+
+
+class BatchGenerator:
+    """
+    Generates many projects from one template in a single process.
+
+    The template is indexed once and compiled templates are shared by
+    all projects through a single Jinja environment. Projects are generated
+    concurrently by a pool of threads and may share a render cache.
+    """
+
+    def __init__(self, template_settings, cache_dir=None, jobs=1, render_cache=None):
+        super().__init__()
+        self._template_settings = template_settings
+        self._render_cache = render_cache
+        self._environment = renders.build_environment(template_settings, cache_dir)
+        self._jobs = max(jobs, 1)
+
+    def _generate_project(self, entry):
+        """
+        Generate one project of the batch.
+
+        :param entry: The project entry.
+        :type entry: dict
+        :return: The number of rendered files.
+        :rtype: int
+        """
+        template_settings = self._template_settings.copy()
+        template_settings.update(entry.get("settings", {}))
+
+        repository = repositories.GitRepository(entry["target_directory"])
+        repository.initialize_repository()
+        if repository.has_uncommitted_changes():
+            raise UncommittedChanges(f"{repository.path} contains uncommitted changes")
+
+        template_render = renders.JinjaTemplateRender(
+            template_settings,
+            repository,
+            environment=self._environment,
+            render_cache=self._render_cache,
+        )
+        template_render.initialize_project_settings(interactive=False)
+        rendered_files = template_render.render_template()
+        template_render.save_manifest(rendered_files)
+        template_render.commit_project()
+        return len(rendered_files)
+
+    def _timed_generate_project(self, entry):
+        start = time.monotonic()
+        files, error = 0, None
+        try:
+            files = self._generate_project(entry)
+        except Exception as e:
+            LOG.exception("Unable to generate %s", entry["target_directory"])
+            error = str(e)
+        return ProjectResult(
+            target_directory=entry["target_directory"],
+            duration=time.monotonic() - start,
+            files=files,
+            error=error,
+        )
+
+    def generate(self, entries):
+        """
+        Generate all projects of the batch.
+
+        A failure of one project does not stop the others.
+
+        :param entries: The project entries, see `load_batch_file`.
+        :type entries: list
+        :return: The results in the order of `entries`.
+        :rtype: list of ProjectResult
+        """
+        # Index the template once before the projects share it
+        self._template_settings.build_index()
+        with futures.ThreadPoolExecutor(max_workers=self._jobs) as executor:
+            return list(executor.map(self._timed_generate_project, entries))
@@ -0,0 +1,253 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from gst_templates.common import constants
+from gst_templates.common import imports
+from gst_templates import manifests
+from gst_templates import sinks
+from gst_templates import version
+
+
+jinja2 = imports.lazy_import("jinja2")
+
+
+LOG = logging.getLogger(__name__)
+
+# The default size limit of the render cache, in bytes
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+# The share of the size limit the cache is shrunk to once it is exceeded, so
+# the next generations do not have to evict entries again right away
+_PRUNE_RATIO = 0.8
+
+
+def get_tree_hash(template_settings):
+    """
+    Calculate the hash of all files of a template.
+
+    Templates may include, import or extend any other file of the template,
+    so the rendered output of a file depends on the whole tree and not only
+    on its own source.
+
+    :param template_settings: The template settings.
+    :type template_settings: gst_templates.settings.TemplateSetting
+    :return: The hex digest of the names and hashes of all files.
+    :rtype: str
+    """
+    tree_hash = hashlib.sha256()
+    for entry in template_settings.index.entries:
+        if not entry.is_dir:
+            tree_hash.update(f"{entry.name}\0{entry.hash}\n".encode("utf-8"))
+    return tree_hash.hexdigest()
+
+
+class RenderCache:
+    """
+    A cache of rendered files shared by all generations of a user.
+
+    An entry is addressed by the hash of everything its content depends on:
+    the template name and version, the hash of the template sources, the
+    canonical hash of the settings, the generation timestamp returned by
+    `functions.now()`, the path and the permission bits of the template
+    file. A generation with unchanged inputs thus only links or copies the
+    cached files into place.
+
+    The cache is bounded in size. Every hit marks its entry as used and the
+    least recently used entries are evicted once the cache grows over its
+    limit.
+
+    Hits are copied into place, as reflinks on file systems supporting them,
+    or hard linked if `hardlink` is set. Hard linked files share their
+    content with the cache, so they must never be modified in place.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE, hardlink=False):
+        super().__init__()
+        cache_dir = os.path.expanduser(cache_dir or constants.DEFAULT_CACHE_DIR)
+        self._root_path = os.path.join(cache_dir, "renders")
+        self._max_size = max_size
+        self._hardlink = hardlink
+        self._stored = False
+
+    @property
+    def root_path(self):
+        return self._root_path
+
+    def get_base_key(self, template_settings, timestamp):
+        """
+        Calculate the part of the keys shared by all files of a generation.
+
+        :param template_settings: The initialized template settings.
+        :type template_settings: gst_templates.settings.TemplateSetting
+        :param timestamp: The moment of the generation.
+        :type timestamp: datetime.datetime
+        :return: The hex digest of the generation inputs.
+        :rtype: str
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    self.VERSION,
+                    version.get_version(),
+                    jinja2.__version__,
+                    template_settings.name,
+                    template_settings.version,
+                    get_tree_hash(template_settings),
+                    manifests.get_settings_hash(template_settings),
+                    timestamp.timestamp(),
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def get_key(self, base_key, template_name, mode):
+        """
+        Calculate the key of a rendered file.
+
+        :param base_key: The key of the generation, see `get_base_key`.
+        :type base_key: str
+        :param template_name: The template name relative to the template
+            directory.
+        :type template_name: str
+        :param mode: The permission bits of the template file.
+        :type mode: int
+        :return: The key.
+        :rtype: str
+        """
+        return hashlib.sha256(
+            f"{base_key}\0{template_name}\0{mode:o}".encode("utf-8")
+        ).hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self._root_path, key[:2], key)
+
+    def get(self, key):
+        """
+        Look up a rendered file.
+
+        :param key: The key of the file.
+        :type key: str
+        :return: The path of the cached file or None on a miss.
+        :rtype: str or None
+        """
+        path = self._get_path(key)
+        try:
+            # The access time orders entries for eviction. It is set
+            # explicitly as file systems are often mounted with noatime.
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, path):
+        """
+        Move a rendered file into the cache.
+
+        :param key: The key of the file.
+        :type key: str
+        :param path: The path of the rendered file. It must be on the same
+            file system as the cache, like the directories of `stage`.
+        :type path: str
+        :return: The path of the cached file.
+        :rtype: str
+        """
+        cache_path = self._get_path(key)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        os.replace(path, cache_path)
+        self._stored = True
+        return cache_path
+
+    @contextlib.contextmanager
+    def stage(self):
+        """
+        Create a temporary directory to render files before caching them.
+
+        :return: A context manager yielding a sink of the directory, which
+            is removed on exit.
+        """
+        os.makedirs(self._root_path, exist_ok=True)
+        staging_path = tempfile.mkdtemp(prefix="stage-", dir=self._root_path)
+        try:
+            yield sinks.DirectorySink(staging_path)
+        finally:
+            shutil.rmtree(staging_path, ignore_errors=True)
+
+    def materialize(self, cache_path, sink, path):
+        """
+        Write a cached file to a sink.
+
+        :param cache_path: The path of the cached file.
+        :type cache_path: str
+        :param sink: The sink to write to.
+        :type sink: gst_templates.sinks.AbstractSink
+        :param path: The path of the file in the sink.
+        :type path: str
+        """
+        if self._hardlink:
+            sink.link_file(cache_path, path)
+        else:
+            sink.copy_file(cache_path, path)
+
+    def prune(self):
+        """
+        Evict the least recently used entries if the cache is over its limit.
+
+        Nothing is scanned if no entry was stored by this cache object.
+        """
+        if not self._stored:
+            return
+        self._stored = False
+
+        entries = []
+        total_size = 0
+        with os.scandir(self._root_path) as it:
+            for dir_entry in it:
+                if not dir_entry.is_dir() or len(dir_entry.name) != 2:
+                    continue
+                with os.scandir(dir_entry.path) as files:
+                    for file_entry in files:
+                        try:
+                            file_stat = file_entry.stat()
+                        except FileNotFoundError:
+                            # Evicted by a concurrent generation
+                            continue
+                        entries.append(
+                            (file_stat.st_atime_ns, file_stat.st_size, file_entry.path)
+                        )
+                        total_size += file_stat.st_size
+
+        if total_size <= self._max_size:
+            return
+
+        target_size = self._max_size * _PRUNE_RATIO
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= target_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            total_size -= size
+        LOG.debug("Render cache pruned to %d bytes", total_size)
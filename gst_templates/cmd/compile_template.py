@@ -0,0 +1,86 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import sys
+
+from oslo_config import cfg
+
+from gst_templates.common import config
+from gst_templates.common import constants
+from gst_templates.common import log as infra_log
+from gst_templates import artifacts
+from gst_templates import renders
+from gst_templates import settings
+
+
+cli_opts = [
+    cfg.StrOpt(
+        "template_settings",
+        default="./templates/py_element.settings.json",
+        help="The path to the template settings file.",
+    ),
+    cfg.StrOpt(
+        "output",
+        help="The path of the compiled template artifact. Defaults to a"
+        " '.compiled.zip' file next to the template settings file, where"
+        " it is picked up by the other commands.",
+    ),
+    cfg.StrOpt(
+        "cache_dir",
+        default=constants.DEFAULT_CACHE_DIR,
+        help="The path to the directory with compiled templates cache.",
+    ),
+]
+
+
+CONF = cfg.CONF
+CONF.register_cli_opts(cli_opts)
+
+
+def main():
+    # Parse config
+    config.parse(sys.argv[1:])
+
+    # Configure logging
+    infra_log.configure()
+    log = logging.getLogger(__name__)
+
+    template_setting = settings.TemplateSetting(CONF.template_settings)
+    artifact_path = CONF.output or template_setting.artifact_path
+
+    try:
+        artifacts.TemplateArtifact.compile(
+            template_setting,
+            renders.build_environment(template_setting, CONF.cache_dir),
+            artifact_path,
+        )
+    except artifacts.TemplateCompileError as e:
+        for name, lineno, message in e.errors:
+            log.error("%s:%s: %s", name, lineno, message)
+        sys.exit(1)
+
+    log.info(
+        "Compiled %s %s to %s",
+        template_setting.name,
+        template_setting.version,
+        artifact_path,
+    )
+    log.info("Bye!!!")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,16 +14,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
 import logging
 import sys
 
 from oslo_config import cfg
 
 from gst_templates.common import config
+from gst_templates.common import constants
 from gst_templates.common import log as infra_log
+from gst_templates import caches
+from gst_templates import jinja_functions
+from gst_templates import profiles
 from gst_templates import renders
 from gst_templates import repositories
 from gst_templates import settings
+from gst_templates import sinks
 
 
 cli_opts = [
@@ -36,6 +42,57 @@ cli_opts = [
         "target_directory",
         help="The path to the target directory.",
     ),
+    cfg.StrOpt(
+        "cache_dir",
+        default=constants.DEFAULT_CACHE_DIR,
+        help="The path to the directory with compiled templates cache.",
+    ),
+    cfg.BoolOpt(
+        "no_cache",
+        default=False,
+        help="Render every file instead of reusing the files rendered by"
+        " previous generations with the same inputs.",
+    ),
+    cfg.IntOpt(
+        "render_cache_size",
+        default=caches.DEFAULT_MAX_SIZE // (1024 * 1024),
+        min=0,
+        help="The size limit of the render cache in MiB. The least recently"
+        " used files are evicted beyond it.",
+    ),
+    cfg.BoolOpt(
+        "cache_hardlinks",
+        default=False,
+        help="Hard link files from the render cache instead of copying them."
+        " Linked files must not be modified in place.",
+    ),
+    cfg.IntOpt(
+        "jobs",
+        default=1,
+        min=1,
+        help="The number of parallel processes used to render files.",
+    ),
+    cfg.StrOpt(
+        "output",
+        default="git",
+        choices=["git", *sinks.SINKS],
+        help="Where to render the project: a git repository in the target"
+        " directory, or an archive written to the standard output.",
+    ),
+    cfg.BoolOpt(
+        "fsync",
+        default=False,
+        help="Flush rendered files to disk in one batch before committing.",
+    ),
+    cfg.StrOpt(
+        "profile",
+        help="The path of a JSON report with the time spent in every phase"
+        " and per rendered file.",
+    ),
+    cfg.StrOpt(
+        "profile_stats",
+        help="The path of a cProfile statistics dump of the render loop.",
+    ),
 ]
 
 
@@ -43,28 +100,97 @@ CONF = cfg.CONF
 CONF.register_cli_opts(cli_opts)
 
 
-def main():
-    # Parse config
-    config.parse(sys.argv[1:])
+def render_archive(template_setting, output, profiler, render_cache=None):
+    """
+    Render the project as an archive on the standard output.
 
-    # Configure logging
-    infra_log.configure()
-    log = logging.getLogger(__name__)
+    Prompts are written to the standard error, so the standard output only
+    holds the archive.
+    """
+    with profiler.phase("initialize_settings"):
+        with contextlib.redirect_stdout(sys.stderr):
+            template_setting.initialize()
 
-    template_setting = settings.TemplateSetting(CONF.template_settings)
+    sink = sinks.SINKS[output](sys.stdout.buffer)
+    template_render = renders.JinjaTemplateRender(
+        template_setting,
+        None,
+        cache_dir=CONF.cache_dir,
+        jobs=CONF.jobs,
+        sink=sink,
+        profiler=profiler,
+        render_cache=render_cache,
+    )
+    template_render.write_project_settings()
+    template_render.render_template()
+    with profiler.phase("close_output"):
+        sink.close()
+        sys.stdout.buffer.flush()
 
-    repository = repositories.GitRepository(CONF.target_directory)
-    repository.initialize_repository()
-    if repository.has_uncommitted_changes():
-        log.error("The target directory contains uncommitted changes.")
-        sys.exit(-1)
+
+def render_repository(template_setting, profiler, render_cache=None):
+    log = logging.getLogger(__name__)
+
+    with profiler.phase("git_init"):
+        repository = repositories.GitRepository(CONF.target_directory)
+        repository.initialize_repository()
+        if repository.has_uncommitted_changes():
+            log.error("The target directory contains uncommitted changes.")
+            sys.exit(-1)
 
     template_render = renders.JinjaTemplateRender(
         template_setting,
         repository,
+        cache_dir=CONF.cache_dir,
+        jobs=CONF.jobs,
+        sink=sinks.DirectorySink(repository.path, fsync=CONF.fsync),
+        profiler=profiler,
+        render_cache=render_cache,
     )
-    template_render.initialize_project_settings()
-    template_render.render_template()
+    with profiler.phase("initialize_settings"):
+        template_render.initialize_project_settings()
+    rendered_files = template_render.render_template()
+    with profiler.phase("manifest"):
+        template_render.save_manifest(rendered_files)
+    with profiler.phase("git_commit"):
+        template_render.commit_project()
+
+
+def main():
+    # Parse config
+    config.parse(sys.argv[1:])
+
+    # Configure logging
+    infra_log.configure()
+    log = logging.getLogger(__name__)
+
+    profiler = profiles.Profiler(stats_path=CONF.profile_stats)
+
+    with profiler.phase("load_settings"):
+        template_setting = settings.TemplateSetting(CONF.template_settings)
+    with profiler.phase("walk"):
+        template_setting.build_index()
+
+    render_cache = None
+    # Every generation at a different moment would have its own keys
+    if not CONF.no_cache and jinja_functions.is_generation_timestamp_pinned():
+        render_cache = caches.RenderCache(
+            CONF.cache_dir,
+            max_size=CONF.render_cache_size * 1024 * 1024,
+            hardlink=CONF.cache_hardlinks,
+        )
+
+    if CONF.output == "git":
+        render_repository(template_setting, profiler, render_cache)
+    else:
+        render_archive(template_setting, CONF.output, profiler, render_cache)
+    if render_cache is not None:
+        with profiler.phase("prune_cache"):
+            render_cache.prune()
+
+    if CONF.profile:
+        profiler.save(CONF.profile)
+        log.info("Profile saved to %s", CONF.profile)
 
     log.info("Bye!!!")
 
@@ -0,0 +1,128 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import sys
+import time
+
+from oslo_config import cfg
+
+from gst_templates.common import config
+from gst_templates.common import constants
+from gst_templates.common import log as infra_log
+from gst_templates import caches
+from gst_templates import batches
+from gst_templates import jinja_functions
+from gst_templates import settings
+
+
+cli_opts = [
+    cfg.StrOpt(
+        "template_settings",
+        default="./templates/py_element.settings.json",
+        help="The path to the template settings file.",
+    ),
+    cfg.StrOpt(
+        "batch_file",
+        required=True,
+        help="The path to a JSONL or YAML file with the target directory and"
+        " the settings overrides of every project.",
+    ),
+    cfg.StrOpt(
+        "cache_dir",
+        default=constants.DEFAULT_CACHE_DIR,
+        help="The path to the directory with compiled templates cache.",
+    ),
+    cfg.BoolOpt(
+        "no_cache",
+        default=False,
+        help="Render every file instead of reusing the files rendered by"
+        " previous generations with the same inputs.",
+    ),
+    cfg.IntOpt(
+        "render_cache_size",
+        default=caches.DEFAULT_MAX_SIZE // (1024 * 1024),
+        min=0,
+        help="The size limit of the render cache in MiB. The least recently"
+        " used files are evicted beyond it.",
+    ),
+    cfg.BoolOpt(
+        "cache_hardlinks",
+        default=False,
+        help="Hard link files from the render cache instead of copying them."
+        " Linked files must not be modified in place.",
+    ),
+    cfg.IntOpt(
+        "jobs",
+        default=1,
+        min=1,
+        help="The number of projects generated in parallel.",
+    ),
+]
+
+
+CONF = cfg.CONF
+CONF.register_cli_opts(cli_opts)
+
+
+def main():
+    # Parse config
+    config.parse(sys.argv[1:])
+
+    # Configure logging
+    infra_log.configure()
+    log = logging.getLogger(__name__)
+
+    start = time.monotonic()
+    entries = batches.load_batch_file(CONF.batch_file)
+    render_cache = None
+    # Every generation at a different moment would have its own keys
+    if not CONF.no_cache and jinja_functions.is_generation_timestamp_pinned():
+        render_cache = caches.RenderCache(
+            CONF.cache_dir,
+            max_size=CONF.render_cache_size * 1024 * 1024,
+            hardlink=CONF.cache_hardlinks,
+        )
+    generator = batches.BatchGenerator(
+        settings.TemplateSetting(CONF.template_settings),
+        cache_dir=CONF.cache_dir,
+        jobs=CONF.jobs,
+        render_cache=render_cache,
+    )
+    results = generator.generate(entries)
+    if render_cache is not None:
+        render_cache.prune()
+
+    log.info("Generated %d project(s):", len(results))
+    for result in results:
+        log.info(
+            "%-8s %8.3f s %6d file(s) %s%s",
+            "FAILED" if result.error else "OK",
+            result.duration,
+            result.files,
+            result.target_directory,
+            f" ({result.error})" if result.error else "",
+        )
+    log.info("Total time %.3f s", time.monotonic() - start)
+
+    if any(result.error for result in results):
+        sys.exit(1)
+
+    log.info("Bye!!!")
+
+
+if __name__ == "__main__":
+    main()
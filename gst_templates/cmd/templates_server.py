@@ -0,0 +1,120 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import sys
+
+from oslo_config import cfg
+
+from gst_templates.common import config
+from gst_templates.common import constants
+from gst_templates.common import log as infra_log
+from gst_templates import servers
+from gst_templates import settings
+from gst_templates import sinks
+
+
+cli_opts = [
+    cfg.MultiStrOpt(
+        "template_settings",
+        default=["./templates/py_element.settings.json"],
+        help="The path to the settings file of a template to serve. May be"
+        " given several times.",
+    ),
+    cfg.StrOpt(
+        "bind_host",
+        default="127.0.0.1",
+        help="The address to listen on.",
+    ),
+    cfg.PortOpt(
+        "bind_port",
+        default=8080,
+        help="The port to listen on.",
+    ),
+    cfg.IntOpt(
+        "workers",
+        default=4,
+        min=1,
+        help="The number of requests rendered concurrently.",
+    ),
+    cfg.IntOpt(
+        "queue_size",
+        default=16,
+        min=0,
+        help="The number of requests waiting for a free worker. Further"
+        " connections are not accepted until a worker is free.",
+    ),
+    cfg.StrOpt(
+        "output",
+        default="tgz",
+        choices=list(sinks.SINKS),
+        help="The archive format of rendered projects, unless a request asks"
+        " for another one.",
+    ),
+    cfg.StrOpt(
+        "cache_dir",
+        default=constants.DEFAULT_CACHE_DIR,
+        help="The path to the directory with compiled templates cache.",
+    ),
+]
+
+
+CONF = cfg.CONF
+CONF.register_cli_opts(cli_opts)
+
+
+def main():
+    # Parse config
+    config.parse(sys.argv[1:])
+
+    # Configure logging
+    infra_log.configure()
+    log = logging.getLogger(__name__)
+
+    templates = []
+    for template_settings_path in CONF.template_settings:
+        template = servers.WarmTemplate(
+            settings.TemplateSetting(template_settings_path),
+            cache_dir=CONF.cache_dir,
+        )
+        log.info(
+            "Compiled %d file(s) of %s %s",
+            template.warm_up(),
+            template.name,
+            template.version,
+        )
+        templates.append(template)
+
+    server = servers.TemplateServer(
+        (CONF.bind_host, CONF.bind_port),
+        templates,
+        workers=CONF.workers,
+        output=CONF.output,
+        queue_size=CONF.queue_size,
+    )
+    log.info("Serving on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    log.info("Bye!!!")
+
+
+if __name__ == "__main__":
+    main()
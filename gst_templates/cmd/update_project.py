@@ -0,0 +1,130 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import logging
+import os
+import sys
+
+from oslo_config import cfg
+
+from gst_templates.common import config
+from gst_templates.common import constants
+from gst_templates.common import log as infra_log
+from gst_templates import repositories
+from gst_templates import settings
+from gst_templates import updates
+
+
+cli_opts = [
+    cfg.StrOpt(
+        "template_settings",
+        help="The path to the template settings file. Defaults to the file"
+        " recorded in the project settings, looked up in the templates"
+        " directory.",
+    ),
+    cfg.StrOpt(
+        "templates_directory",
+        default="./templates",
+        help="The path to the directory with template settings files.",
+    ),
+    cfg.StrOpt(
+        "target_directory",
+        help="The path to the project to update.",
+    ),
+    cfg.StrOpt(
+        "cache_dir",
+        default=constants.DEFAULT_CACHE_DIR,
+        help="The path to the directory with compiled templates cache.",
+    ),
+    cfg.IntOpt(
+        "jobs",
+        default=1,
+        min=1,
+        help="The number of parallel processes used to render files.",
+    ),
+]
+
+
+CONF = cfg.CONF
+CONF.register_cli_opts(cli_opts)
+
+
+def main():
+    # Parse config
+    config.parse(sys.argv[1:])
+
+    # Configure logging
+    infra_log.configure()
+    log = logging.getLogger(__name__)
+
+    repository = repositories.GitRepository(CONF.target_directory)
+    if not repository.is_repo_initialized():
+        log.error("The target directory is not a git repository.")
+        sys.exit(-1)
+    if repository.has_uncommitted_changes():
+        log.error("The target directory contains uncommitted changes.")
+        sys.exit(-1)
+
+    project_settings_path = os.path.join(
+        repository.path,
+        constants.PROJECT_SETTINGS_FILE_NAME,
+    )
+    with open(project_settings_path, "r", encoding="utf-8") as fp:
+        template_info = json.load(fp)[settings.TemplateSetting.TEMPLATE_INFO_SECTION]
+
+    template_setting = settings.TemplateSetting(
+        CONF.template_settings
+        or os.path.join(
+            CONF.templates_directory,
+            template_info["template_file_name"],
+        )
+    )
+    template_setting.load_project_settings(project_settings_path)
+
+    log.info(
+        "Updating project from %s %s to %s",
+        template_info["name"],
+        template_info["version"],
+        template_setting.version,
+    )
+
+    updater = updates.ProjectUpdater(
+        template_setting,
+        repository,
+        cache_dir=CONF.cache_dir,
+        jobs=CONF.jobs,
+    )
+    conflicts = updater.update()
+
+    if conflicts:
+        log.error(
+            "Resolve conflicts in %s and commit the changes.",
+            ", ".join(conflicts),
+        )
+        sys.exit(1)
+
+    if repository.has_uncommitted_changes():
+        repository.add_all()
+        repository.commit(
+            f"Update project to {template_setting.name} {template_setting.version}"
+        )
+
+    log.info("Bye!!!")
+
+
+if __name__ == "__main__":
+    main()
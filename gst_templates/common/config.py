@@ -40,7 +40,7 @@ def parse(args):
         version="%s %s"
         % (
             GLOBAL_SERVICE_NAME.capitalize(),
-            version.version_info,
+            version.get_version(),
         ),
     )
     if not cfg.CONF.config_file:
@@ -16,3 +16,11 @@
 
 # project
 GLOBAL_SERVICE_NAME = "templater"
+
+# generated project
+PROJECT_SETTINGS_FILE_NAME = "project_settings.json"
+PROJECT_MANIFEST_FILE_NAME = "project_manifest.json"
+PRISTINE_REF = "refs/gst-templates/pristine"
+
+# cache
+DEFAULT_CACHE_DIR = "~/.cache/gst_templates"
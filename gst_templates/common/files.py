@@ -0,0 +1,100 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import errno
+import hashlib
+import os
+import re
+import shutil
+
+
+# Files are scanned in chunks of this size
+SCAN_CHUNK_SIZE = 64 * 1024
+
+# A NUL byte in the first chunk of a file marks it as binary
+BINARY_SNIFF_SIZE = 8 * 1024
+
+# The largest amount of bytes requested from `os.copy_file_range` at once
+COPY_CHUNK_SIZE = 1024 * 1024 * 1024
+
+# Opening sequences of Jinja variables, statements and comments
+TEMPLATE_MARKERS = r"\{[{%#]"
+TEMPLATE_MARKERS_RE = re.compile(TEMPLATE_MARKERS.encode("ascii"))
+
+# Errors of `os.copy_file_range` meaning that the kernel or the file system
+# does not support it for the given files
+_COPY_FILE_RANGE_UNSUPPORTED = frozenset(
+    (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF)
+)
+
+
+def scan_file(path):
+    """
+    Hash a file and check if it has to be rendered with Jinja.
+
+    A file has to be rendered if it is a text file containing at least one
+    Jinja marker (`{{`, `{%` or `{#`). A NUL byte in the beginning of the
+    file marks it as binary. The file is read once, in chunks.
+
+    :param path: The path of the file.
+    :type path: str
+    :return: The SHA-256 hex digest of the file content and whether the
+        file is a template or may be copied as is.
+    :rtype: tuple of (str, bool)
+    """
+    file_hash = hashlib.sha256()
+    needs_render = False
+    with open(path, "rb") as fp:
+        tail = b""
+        chunk = fp.read(SCAN_CHUNK_SIZE)
+        is_binary = b"\0" in chunk[:BINARY_SNIFF_SIZE]
+        while chunk:
+            file_hash.update(chunk)
+            # Keep the last byte of the previous chunk to find markers
+            # split between two chunks
+            if not (is_binary or needs_render):
+                needs_render = bool(TEMPLATE_MARKERS_RE.search(tail + chunk))
+            tail = chunk[-1:]
+            chunk = fp.read(SCAN_CHUNK_SIZE)
+    return file_hash.hexdigest(), needs_render
+
+
+def copy_file(source_path, target_path):
+    """
+    Copy a file with its permission bits.
+
+    The content is copied inside the kernel with `os.copy_file_range` when it
+    is available and falls back to `shutil.copy`, which uses `os.sendfile`
+    on Linux.
+
+    :param source_path: The path of the file to copy.
+    :type source_path: str
+    :param target_path: The path of the copy.
+    :type target_path: str
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+                while copy_file_range(src.fileno(), dst.fileno(), COPY_CHUNK_SIZE):
+                    pass
+            shutil.copymode(source_path, target_path)
+            return
+        except OSError as e:
+            if e.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                raise
+
+    shutil.copy(source_path, target_path)
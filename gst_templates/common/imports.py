@@ -0,0 +1,55 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import importlib
+import sys
+
+
+class LazyModule:
+    """
+    A module imported on first attribute access.
+
+    Heavy dependencies like GitPython or Jinja are only needed once the phase
+    using them runs, so commands exiting early, like `--help`, do not pay
+    for importing them. The import itself goes through `importlib`, so it is
+    thread safe and the module is shared with regular imports.
+    """
+
+    def __init__(self, name):
+        super().__init__()
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name):
+    """
+    Import a module lazily.
+
+    :param name: The absolute name of the module.
+    :type name: str
+    :return: The module if it is already imported, otherwise a proxy
+        importing it on first attribute access.
+    :rtype: module or LazyModule
+    """
+    return sys.modules.get(name) or LazyModule(name)
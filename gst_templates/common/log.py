@@ -19,7 +19,11 @@ from logging import config as logging_config
 import sys
 
 from oslo_config import cfg
-import yaml
+
+from gst_templates.common import imports
+
+
+yaml = imports.lazy_import("yaml")
 
 
 DEFAULT_CONFIG = {
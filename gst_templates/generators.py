@@ -0,0 +1,95 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import functools
+
+from gst_templates import renders
+from gst_templates import settings
+
+
+def generate(
+    settings_path,
+    overrides,
+    sink,
+    cache_dir=None,
+    jobs=1,
+    timestamp=None,
+    render_cache=None,
+):
+    """
+    Generate a project.
+
+    This is the entry point to embed the generator into other programs.
+    Generations share no state, never change the working directory and
+    never use the console, so any number of them may run at the same time
+    in threads of one process.
+
+    The project settings file is written first, then the rendered files.
+    Parameters missing from `overrides` keep the default values of the
+    template.
+
+    :param settings_path: The path to the template settings file.
+    :type settings_path: str
+    :param overrides: The parameter values grouped by section, like in the
+        template settings file.
+    :type overrides: dict or None
+    :param sink: The output of the project. It is not closed, so several
+        projects may be written to the same archive.
+    :type sink: gst_templates.sinks.AbstractSink
+    :param cache_dir: The root cache directory.
+    :type cache_dir: str or None
+    :param jobs: The number of parallel processes used to render files.
+    :type jobs: int
+    :param timestamp: The moment `functions.now()` returns. Defaults to the
+        generation timestamp.
+    :type timestamp: datetime.datetime or None
+    :param render_cache: The cache of rendered files to use.
+    :type render_cache: gst_templates.caches.RenderCache or None
+    :return: A dict mapping rendered paths, relative to the root of the
+        sink, to template names.
+    :rtype: dict
+    """
+    template_settings = settings.TemplateSetting(settings_path)
+    template_settings.update(overrides or {})
+    template_render = renders.JinjaTemplateRender(
+        template_settings,
+        None,
+        cache_dir=cache_dir,
+        jobs=jobs,
+        sink=sink,
+        render_cache=render_cache,
+        timestamp=timestamp,
+    )
+    template_render.write_project_settings()
+    return template_render.render_template()
+
+
+async def generate_async(settings_path, overrides, sink, executor=None, **kwargs):
+    """
+    Generate a project without blocking the event loop.
+
+    The generation runs in `executor`, the default executor of the loop if
+    None. Keyword arguments are passed to `generate`.
+
+    :return: The rendered files, see `generate`.
+    :rtype: dict
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        functools.partial(generate, settings_path, overrides, sink, **kwargs),
+    )
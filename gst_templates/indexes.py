@@ -0,0 +1,239 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+import logging
+import os
+import threading
+
+from gst_templates.common import files as file_utils
+from gst_templates import matchers
+
+
+LOG = logging.getLogger(__name__)
+
+
+# `name` is the path relative to the template directory with "/" separators,
+# the template directory itself is named "". `size`, `mtime` (in
+# nanoseconds), `hash` and `needs_render` are None for directories.
+IndexEntry = collections.namedtuple(
+    "IndexEntry",
+    ["name", "is_dir", "size", "mtime", "hash", "needs_render"],
+)
+
+
+class TemplateIndex:
+    """
+    The index of all directories and files of a template.
+
+    Entries are ordered like `os.walk` lists them: every directory comes
+    before its files and its subdirectories, and names are sorted, so the
+    order does not depend on the file system.
+
+    The index is rebuilt with `os.scandir`. Files whose size and mtime match
+    the previous index keep their hash and render flag, so only new and
+    modified files are read. Paths excluded by the template rules are
+    skipped during the walk, so excluded directories are never listed and
+    excluded files never read.
+    """
+
+    VERSION = 2
+
+    def __init__(self, template_path, entries, rules=None):
+        super().__init__()
+        self._template_path = template_path
+        self._entries = entries
+        self._rules = rules or matchers.TemplateRules()
+        self._entries_by_name = {entry.name: entry for entry in entries}
+
+    @classmethod
+    def build(cls, template_path, previous=None, rules=None):
+        """
+        Build the index of a template directory.
+
+        :param template_path: The path of the template directory.
+        :type template_path: str
+        :param previous: The previous index of the same directory to reuse
+            hashes of unchanged files from. It must have the same rules.
+        :type previous: TemplateIndex or None
+        :param rules: The rules of the template.
+        :type rules: gst_templates.matchers.TemplateRules or None
+        :return: The index.
+        :rtype: TemplateIndex
+        """
+        rules = rules or matchers.TemplateRules()
+        previous_entries = previous._entries_by_name if previous else {}
+        entries = []
+
+        def walk(dir_path, dir_name):
+            entries.append(IndexEntry(dir_name, True, None, None, None, None))
+            subdirs = []
+            with os.scandir(dir_path) as it:
+                dir_entries = sorted(it, key=lambda dir_entry: dir_entry.name)
+
+            for dir_entry in dir_entries:
+                name = f"{dir_name}/{dir_entry.name}" if dir_name else dir_entry.name
+                if rules.is_excluded(name):
+                    continue
+                if dir_entry.is_dir():
+                    # Symbolic links to directories are not followed
+                    if not dir_entry.is_symlink():
+                        subdirs.append((dir_entry.path, name))
+                    continue
+
+                stat = dir_entry.stat()
+                entry = previous_entries.get(name)
+                if (
+                    entry is None
+                    or entry.size != stat.st_size
+                    or entry.mtime != stat.st_mtime_ns
+                ):
+                    file_hash, needs_render = file_utils.scan_file(dir_entry.path)
+                    entry = IndexEntry(
+                        name,
+                        False,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        file_hash,
+                        needs_render and not rules.is_copied(name),
+                    )
+                entries.append(entry)
+
+            for subdir in subdirs:
+                walk(*subdir)
+
+        walk(template_path, "")
+        return cls(template_path, entries, rules)
+
+    @classmethod
+    def load(cls, index_path, template_path, rules=None):
+        """
+        Load a saved index.
+
+        :param index_path: The path of the index file.
+        :type index_path: str
+        :param template_path: The path of the template directory.
+        :type template_path: str
+        :param rules: The rules of the template. An index saved with other
+            rules is not usable.
+        :type rules: gst_templates.matchers.TemplateRules or None
+        :return: The loaded index or None if there is no usable index.
+        :rtype: TemplateIndex or None
+        """
+        rules = rules or matchers.TemplateRules()
+        try:
+            with open(index_path, "r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            data.get("version") != cls.VERSION
+            or data.get("path") != template_path
+            or data.get("rules") != rules.fingerprint
+        ):
+            return None
+
+        return cls(
+            template_path,
+            [IndexEntry(*entry) for entry in data["entries"]],
+            rules,
+        )
+
+    @classmethod
+    def load_or_build(cls, index_path, template_path, rules=None):
+        """
+        Load the saved index and bring it up to date.
+
+        The updated index is saved back if anything changed. Failures to
+        save it, like a read-only template directory, are ignored.
+
+        :param index_path: The path of the index file.
+        :type index_path: str
+        :param template_path: The path of the template directory.
+        :type template_path: str
+        :param rules: The rules of the template.
+        :type rules: gst_templates.matchers.TemplateRules or None
+        :return: The up to date index.
+        :rtype: TemplateIndex
+        """
+        previous = cls.load(index_path, template_path, rules)
+        index = cls.build(template_path, previous, rules)
+        if previous is None or previous.entries != index.entries:
+            try:
+                index.save(index_path)
+            except OSError as e:
+                LOG.debug("Unable to save template index %s: %s", index_path, e)
+        return index
+
+    def save(self, index_path):
+        """
+        Save the index to a file.
+
+        The file is replaced atomically, so concurrent readers never see a
+        partially written index, and every thread writes its own temporary
+        file.
+
+        :param index_path: The path of the index file.
+        :type index_path: str
+        """
+        tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "path": self._template_path,
+                    "rules": self._rules.fingerprint,
+                    "entries": self._entries,
+                },
+                fp,
+            )
+        os.replace(tmp_path, index_path)
+
+    @property
+    def entries(self):
+        """
+        The entries of the index in walk order.
+
+        :rtype: list of IndexEntry
+        """
+        return self._entries
+
+    def get(self, name):
+        """
+        Get the entry of a directory or a file.
+
+        :param name: The path relative to the template directory with "/"
+            separators.
+        :type name: str
+        :return: The entry.
+        :rtype: IndexEntry
+        """
+        return self._entries_by_name[name]
+
+    def get_path(self, entry):
+        """
+        Get the absolute path of an entry.
+
+        :param entry: The index entry.
+        :type entry: IndexEntry
+        :return: The absolute path.
+        :rtype: str
+        """
+        if not entry.name:
+            return self._template_path
+        return os.path.join(self._template_path, *entry.name.split("/"))
@@ -12,6 +12,7 @@
 #    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
 
 import datetime
+import os
 
 
 def now(tz=None):
@@ -27,21 +28,116 @@ def now(tz=None):
     return datetime.datetime.now(tz=tz)
 
 
+def memoize(func):
+    """
+    Mark a Jinja function to be memoized.
+
+    Results of memoized functions are cached for the duration of a
+    generation, so a function called with the same arguments from many
+    files is evaluated once. Only pure functions should be memoized.
+
+    :param func: The function to memoize.
+    :type func: callable
+    :return: The function itself.
+    :rtype: callable
+    """
+    func.memoize = True
+    return func
+
+
+class PinnedNow:
+    """`now` returning the same moment for a whole generation."""
+
+    def __init__(self, timestamp):
+        super().__init__()
+        self._timestamp = timestamp
+
+    def __call__(self, tz=None):
+        if tz is None:
+            return self._timestamp.astimezone().replace(tzinfo=None)
+        return self._timestamp.astimezone(tz)
+
+
+class Memoized:
+    """A function caching its results by arguments."""
+
+    def __init__(self, func):
+        super().__init__()
+        self._func = func
+        self._cache = {}
+
+    def __call__(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments
+            return self._func(*args, **kwargs)
+        result = self._cache[key] = self._func(*args, **kwargs)
+        return result
+
+    def __getstate__(self):
+        # The cache belongs to the process that filled it
+        return {"_func": self._func, "_cache": {}}
+
+
 FUNCTIONS = {
     "now": now,
 }
 
 
-def get_jinja_functions():
+def is_generation_timestamp_pinned():
+    """
+    Check if generations happen at a fixed moment.
+
+    :return: True if `SOURCE_DATE_EPOCH` is set, so templates using the
+        current date render the same output on every generation.
+    :rtype: bool
+    """
+    return bool(os.environ.get("SOURCE_DATE_EPOCH"))
+
+
+def get_generation_timestamp():
+    """
+    Get the moment a generation happens at.
+
+    The `SOURCE_DATE_EPOCH` environment variable pins it, so the output of
+    templates using the current date is reproducible.
+
+    :return: A timezone aware timestamp.
+    :rtype: datetime.datetime
+    """
+    if is_generation_timestamp_pinned():
+        return datetime.datetime.fromtimestamp(
+            int(os.environ["SOURCE_DATE_EPOCH"]), tz=datetime.timezone.utc
+        )
+    return datetime.datetime.now(tz=datetime.timezone.utc)
+
+
+def get_jinja_functions(timestamp=None):
     """
     Retrieves a copy of the available Jinja functions.
 
+    :param timestamp: The moment of the generation. If given, `now` always
+        returns it and functions marked with `memoize` cache their results,
+        so the functions can be shared by all files of a generation.
+    :type timestamp: datetime.datetime or None
     :return: A dictionary containing Jinja function names as keys and their
              corresponding callable objects as values.
     :rtype: dict
     """
+    functions = FUNCTIONS.copy()
+    if timestamp is None:
+        return functions
 
-    return FUNCTIONS.copy()
+    for name, func in functions.items():
+        if getattr(func, "memoize", False):
+            functions[name] = Memoized(func)
+    if functions.get("now") is now:
+        functions["now"] = PinnedNow(timestamp)
+    return functions
 
 
-__all__ = ["get_jinja_functions"]
+__all__ = ["get_jinja_functions", "memoize"]
@@ -0,0 +1,196 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import hashlib
+import json
+import os
+import stat
+
+from gst_templates.common import constants
+
+
+FILE_MODE = 0o100644
+EXECUTABLE_FILE_MODE = 0o100755
+
+# Manifests written before the mode was recorded have regular files only
+ManifestEntry = collections.namedtuple(
+    "ManifestEntry",
+    ["source", "source_hash", "settings_hash", "output_hash", "mode"],
+    defaults=(FILE_MODE,),
+)
+
+
+def get_file_mode(path):
+    """
+    Get the git mode of a file, the same way git records it in a tree.
+
+    :param path: The path of the file.
+    :type path: str
+    :return: The git mode of the file.
+    :rtype: int
+    """
+    if os.stat(path).st_mode & stat.S_IXUSR:
+        return EXECUTABLE_FILE_MODE
+    return FILE_MODE
+
+
+def get_settings_hash(template_settings):
+    """
+    Calculate a canonical hash of the template settings values.
+
+    :param template_settings: The template settings.
+    :type template_settings: gst_templates.settings.TemplateSetting
+    :return: The hex digest of the settings values.
+    :rtype: str
+    """
+    settings_vars = template_settings.settings_vars
+    settings_vars.pop(template_settings.FUNCTIONS_SECTION, None)
+    return hashlib.sha256(
+        json.dumps(settings_vars, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class ProjectManifest:
+    """
+    The content-hash manifest of a generated project.
+
+    For every rendered path, relative to the project root, the manifest
+    keeps the template file it was rendered from, the hash of that file, the
+    hash of the settings, the git blob hash and the git mode of the rendered
+    output. The
+    rendered outputs are also kept in the object database of the project
+    repository, so they can be used as the base of a three-way merge on the
+    next update.
+    """
+
+    def __init__(self, template_name, template_version, files=None):
+        super().__init__()
+        self._template_name = template_name
+        self._template_version = template_version
+        self._files = files or {}
+
+    @classmethod
+    def get_path(cls, repository):
+        return os.path.join(repository.path, constants.PROJECT_MANIFEST_FILE_NAME)
+
+    @classmethod
+    def load(cls, repository):
+        """
+        Load the manifest of the project in the given repository.
+
+        :param repository: The repository of the project.
+        :type repository: gst_templates.repositories.GitRepository
+        :return: The loaded manifest or None if the project has no manifest.
+        :rtype: ProjectManifest or None
+        """
+        try:
+            with open(cls.get_path(repository), "r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return None
+
+        return cls(
+            template_name=data["template_name"],
+            template_version=data["template_version"],
+            files={
+                path: ManifestEntry(**entry) for path, entry in data["files"].items()
+            },
+        )
+
+    @classmethod
+    def build(cls, template_settings, repository, rendered_files, target_path=None):
+        """
+        Build the manifest of freshly rendered files.
+
+        The rendered files are written into the object database of the
+        repository.
+
+        :param template_settings: The template settings.
+        :type template_settings: gst_templates.settings.TemplateSetting
+        :param repository: The repository of the project.
+        :type repository: gst_templates.repositories.GitRepository
+        :param rendered_files: A dict mapping rendered paths, relative to the
+            target directory, to template names.
+        :type rendered_files: dict
+        :param target_path: The directory the files were rendered to.
+            Defaults to the repository path.
+        :type target_path: str or None
+        :return: The manifest.
+        :rtype: ProjectManifest
+        """
+        target_path = target_path or repository.path
+        settings_hash = get_settings_hash(template_settings)
+        paths = sorted(rendered_files)
+        full_paths = [os.path.join(target_path, path) for path in paths]
+        output_hashes = repository.hash_files(full_paths)
+
+        files = {}
+        for path, full_path, output_hash in zip(paths, full_paths, output_hashes):
+            source = rendered_files[path]
+            files[path] = ManifestEntry(
+                source=source,
+                source_hash=template_settings.get_file_hash(source),
+                settings_hash=settings_hash,
+                output_hash=output_hash,
+                mode=get_file_mode(full_path),
+            )
+
+        return cls(template_settings.name, template_settings.version, files)
+
+    @property
+    def files(self):
+        """
+        The manifest entries.
+
+        :return: A dict mapping paths relative to the project root to
+            manifest entries.
+        :rtype: dict
+        """
+        return self._files
+
+    def save(self, repository):
+        """
+        Save the manifest to the project repository.
+
+        A snapshot of the rendered outputs is also committed to a dedicated
+        ref of the repository, so they are never garbage collected.
+
+        :param repository: The repository of the project.
+        :type repository: gst_templates.repositories.GitRepository
+        """
+        repository.save_snapshot(
+            constants.PRISTINE_REF,
+            {
+                path: (entry.mode, entry.output_hash)
+                for path, entry in self._files.items()
+            },
+            f"Render {self._template_name} {self._template_version}",
+        )
+
+        with open(self.get_path(repository), "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "template_name": self._template_name,
+                    "template_version": self._template_version,
+                    "files": {
+                        path: entry._asdict()
+                        for path, entry in sorted(self._files.items())
+                    },
+                },
+                fp,
+                indent=4,
+            )
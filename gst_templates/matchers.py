@@ -0,0 +1,218 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+
+
+def translate(pattern):
+    """
+    Translate a glob pattern into a regular expression.
+
+    `*` and `?` do not match "/", `**` matches any number of directories and
+    a trailing `/**` also matches the directory itself. Character classes
+    like `[abc]` are supported.
+
+    :param pattern: The glob pattern relative to the template directory,
+        with "/" separators.
+    :type pattern: str
+    :return: The regular expression matching whole paths.
+    :rtype: str
+    """
+    pattern = pattern.strip("/")
+    if pattern.endswith("/**"):
+        return f"{translate(pattern[:-3])}(?:/.*)?"
+
+    regex = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            chars = pattern[i + 1 : end].replace("\\", "\\\\")
+            if chars.startswith("!"):
+                chars = f"^{chars[1:]}"
+            regex.append(f"[{chars}]")
+            i = end + 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(regex)
+
+
+class PathMatcher:
+    """
+    Matches template paths against a list of glob patterns.
+
+    All patterns are compiled into a single regular expression, so a path is
+    matched against all of them at once.
+    """
+
+    def __init__(self, patterns):
+        super().__init__()
+        self._patterns = list(patterns)
+        self._regex = None
+        if self._patterns:
+            self._regex = re.compile(
+                "|".join(f"(?:{translate(pattern)})" for pattern in self._patterns)
+            )
+
+    @property
+    def patterns(self):
+        return self._patterns
+
+    def match(self, name):
+        """
+        Check if a path matches any pattern.
+
+        :param name: The path relative to the template directory with "/"
+            separators.
+        :type name: str
+        :rtype: bool
+        """
+        return self._regex is not None and self._regex.fullmatch(name) is not None
+
+    def exclude(self, entries):
+        """
+        Drop the matching entries of an index and the subtrees of matching
+        directories.
+
+        :param entries: The index entries in walk order.
+        :type entries: iterable of gst_templates.indexes.IndexEntry
+        :return: The remaining entries in the same order.
+        :rtype: list
+        """
+        if self._regex is None:
+            return list(entries)
+
+        excluded_dirs = set()
+        remaining = []
+        for entry in entries:
+            if entry.name and (
+                entry.name.rpartition("/")[0] in excluded_dirs or self.match(entry.name)
+            ):
+                if entry.is_dir:
+                    excluded_dirs.add(entry.name)
+                continue
+            remaining.append(entry)
+        return remaining
+
+
+class TemplateRules:
+    """
+    The rules of `template_info` selecting how template files are handled.
+
+    - `exclude`: glob patterns of paths left out of the template. Excluded
+      directories are not walked at all.
+    - `copy_without_render`: glob patterns of files copied as is, even if
+      they contain Jinja markup.
+    - `conditions`: a mapping of glob patterns to Jinja expressions. Matching
+      paths are only generated if the expression is true for the settings
+      of the project, like `project.with_images == "yes"`.
+
+    The patterns are compiled once, when the settings are loaded, and the
+    conditions once per Jinja environment.
+    """
+
+    EXCLUDE = "exclude"
+    COPY_WITHOUT_RENDER = "copy_without_render"
+    CONDITIONS = "conditions"
+
+    def __init__(self, exclude=(), copy_without_render=(), conditions=None):
+        super().__init__()
+        self._exclude = PathMatcher(exclude)
+        self._copy_without_render = PathMatcher(copy_without_render)
+        self._conditions = dict(conditions or {})
+        # The environment and the conditions compiled with it, bound together
+        # so that threads sharing the rules never mix them up
+        self._compiled = None
+
+    @classmethod
+    def from_template_info(cls, template_info):
+        """
+        Take the rules out of the `template_info` section.
+
+        :param template_info: The `template_info` section of the settings.
+            The rules are removed from it.
+        :type template_info: dict
+        :return: The rules.
+        :rtype: TemplateRules
+        """
+        return cls(
+            exclude=template_info.pop(cls.EXCLUDE, ()),
+            copy_without_render=template_info.pop(cls.COPY_WITHOUT_RENDER, ()),
+            conditions=template_info.pop(cls.CONDITIONS, None),
+        )
+
+    @property
+    def fingerprint(self):
+        """
+        The rules affecting the template index, to invalidate saved indexes
+        when they change.
+
+        :rtype: list
+        """
+        return [self._exclude.patterns, self._copy_without_render.patterns]
+
+    def __getstate__(self):
+        # Compiled expressions can not be pickled, workers compile their own
+        return dict(self.__dict__, _compiled=None)
+
+    def _compile_conditions(self, environment):
+        compiled = self._compiled
+        if compiled is None or compiled[0] is not environment:
+            compiled = self._compiled = (
+                environment,
+                [
+                    (pattern, environment.compile_expression(expression))
+                    for pattern, expression in self._conditions.items()
+                ],
+            )
+        return compiled[1]
+
+    def is_excluded(self, name):
+        return self._exclude.match(name)
+
+    def is_copied(self, name):
+        return self._copy_without_render.match(name)
+
+    def get_disabled(self, environment, settings_vars):
+        """
+        Evaluate the conditions for the settings of a project.
+
+        :param environment: The Jinja environment to compile expressions
+            with.
+        :type environment: jinja2.Environment
+        :param settings_vars: The variables to evaluate expressions with.
+        :type settings_vars: dict
+        :return: The matcher of the paths whose condition is false.
+        :rtype: PathMatcher
+        """
+        return PathMatcher(
+            pattern
+            for pattern, expression in self._compile_conditions(environment)
+            if not expression(**settings_vars)
+        )
@@ -0,0 +1,151 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+
+from gst_templates.common import files as file_utils
+
+
+# The template markers of file contents, for path segments
+TEMPLATE_MARKERS_RE = re.compile(file_utils.TEMPLATE_MARKERS)
+
+# Rendered segments must be a single non-special path component
+_INVALID_SEGMENTS = frozenset(("", ".", ".."))
+_INVALID_SEGMENT_CHARS_RE = re.compile(r"[/\0\n]")
+
+
+class InvalidTargetPath(ValueError):
+    pass
+
+
+class PathRender:
+    """
+    Renders template paths into target paths segment by segment.
+
+    Every path segment is handled separately. Plain segments are used as is,
+    templated segments are compiled once and their rendered value is cached
+    by the literal text of the segment, so a segment like
+    `{{ project.package_name }}` is rendered once for the whole template.
+    Segments found in `segment_templates` are loaded from the environment
+    instead of being compiled, like the ones of a precompiled artifact. The
+    other ones are compiled into `compiled_segments`, which may be shared by
+    the renders of many projects with the same environment.
+    """
+
+    def __init__(
+        self,
+        environment,
+        settings_vars,
+        segment_templates=None,
+        compiled_segments=None,
+    ):
+        super().__init__()
+        self._environment = environment
+        self._settings_vars = settings_vars
+        self._segment_templates = segment_templates or {}
+        self._compiled_segments = {} if compiled_segments is None else compiled_segments
+        self._segments = {}
+
+    def _get_template(self, segment):
+        template_name = self._segment_templates.get(segment)
+        if template_name is not None:
+            return self._environment.get_template(template_name)
+        template = self._compiled_segments.get(segment)
+        if template is None:
+            template = self._compiled_segments.setdefault(
+                segment, self._environment.from_string(segment)
+            )
+        return template
+
+    def compile_path(self, name):
+        """
+        Compile the templated segments of a template path without rendering
+        them.
+
+        :param name: The path relative to the template directory with "/"
+            separators.
+        :type name: str
+        """
+        for segment in name.split("/"):
+            if TEMPLATE_MARKERS_RE.search(segment):
+                self._get_template(segment)
+
+    def render_segment(self, segment):
+        """
+        Render a single path segment.
+
+        :param segment: The literal text of the segment.
+        :type segment: str
+        :return: The rendered segment.
+        :rtype: str
+        :raises InvalidTargetPath: If a templated segment renders to an
+            empty or special name or contains a path separator, a NUL byte or
+            a newline.
+        """
+        rendered = self._segments.get(segment)
+        if rendered is not None:
+            return rendered
+
+        if not TEMPLATE_MARKERS_RE.search(segment):
+            rendered = segment
+        else:
+            rendered = self._get_template(segment).render(**self._settings_vars)
+            if rendered in _INVALID_SEGMENTS or _INVALID_SEGMENT_CHARS_RE.search(
+                rendered
+            ):
+                raise InvalidTargetPath(
+                    f"Path segment {segment!r} renders to invalid name {rendered!r}"
+                )
+
+        self._segments[segment] = rendered
+        return rendered
+
+    def render_path(self, name):
+        """
+        Render a template path.
+
+        :param name: The path relative to the template directory with "/"
+            separators.
+        :type name: str
+        :return: The rendered path with "/" separators.
+        :rtype: str
+        """
+        if not name:
+            return name
+        return "/".join(self.render_segment(segment) for segment in name.split("/"))
+
+    def render_paths(self, names):
+        """
+        Render template paths and check that they map one-to-one.
+
+        :param names: The paths relative to the template directory with "/"
+            separators.
+        :type names: iterable of str
+        :return: The rendered paths in the order of `names`.
+        :rtype: list of str
+        :raises InvalidTargetPath: If two paths render to the same target.
+        """
+        sources = {}
+        target_paths = []
+        for name in names:
+            target_path = self.render_path(name)
+            source = sources.setdefault(target_path, name)
+            if source != name:
+                raise InvalidTargetPath(
+                    f"Both {source!r} and {name!r} render to {target_path!r}"
+                )
+            target_paths.append(target_path)
+        return target_paths
@@ -0,0 +1,216 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import queue
+import stat
+import threading
+import time
+
+from gst_templates import profiles
+
+
+# The number of templates loaded ahead of the one being rendered
+LOAD_QUEUE_SIZE = 16
+
+# The number of pending writes. Every write holds at most one buffered piece
+# of a rendered file, so this bounds the memory used by the pipeline.
+WRITE_QUEUE_SIZE = 64
+
+# How often blocked stages check whether the pipeline was stopped, in seconds
+_POLL_INTERVAL = 0.1
+
+_MAKE_DIR = "make_dir"
+_OPEN = "open"
+_WRITE = "write"
+_CLOSE = "close"
+_COPY = "copy"
+_END = "end"
+
+
+class PipelineStopped(Exception):
+    pass
+
+
+class RenderPipeline:
+    """
+    Reads, renders and writes files in three overlapping stages.
+
+    A loader thread reads and compiles the templates ahead of the render
+    stage. The render stage runs in the calling thread and passes the
+    rendered output piece by piece to a writer thread through a bounded
+    queue. The writer is the only stage touching the sink: it creates the
+    directories, then writes and copies files in order. CPU bound rendering
+    thus overlaps the I/O of slow disks or the compression of archives,
+    while memory stays bounded by the depth of the queues.
+    """
+
+    def __init__(
+        self,
+        template_path,
+        environment,
+        settings_vars,
+        sink,
+        buffer_items,
+        load_queue_size=LOAD_QUEUE_SIZE,
+        write_queue_size=WRITE_QUEUE_SIZE,
+    ):
+        super().__init__()
+        self._template_path = template_path
+        self._environment = environment
+        self._settings_vars = settings_vars
+        self._sink = sink
+        self._buffer_items = buffer_items
+        self._loaded = queue.Queue(maxsize=load_queue_size)
+        self._writes = queue.Queue(maxsize=write_queue_size)
+        self._stopped = threading.Event()
+        self._error = None
+
+    def _put(self, target_queue, item):
+        while True:
+            if self._stopped.is_set():
+                raise PipelineStopped()
+            try:
+                target_queue.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+    def _load(self, files):
+        """The loader stage: compile templates ahead of rendering."""
+        try:
+            for template_name, target_file, needs_render in files:
+                template, compile_time = None, 0.0
+                if needs_render:
+                    start = time.perf_counter()
+                    template = self._environment.get_template(template_name)
+                    compile_time = time.perf_counter() - start
+                self._put(
+                    self._loaded,
+                    (template_name, target_file, template, compile_time),
+                )
+        except PipelineStopped:
+            pass
+        except Exception as e:
+            self._error = e
+            self._stopped.set()
+
+    def _write(self):
+        """The writer stage: apply writes to the sink in order."""
+        open_file = None
+        fp = None
+        while True:
+            action, *args = self._writes.get()
+            if action == _END:
+                break
+            if self._error is not None:
+                # Keep draining, so the other stages never block
+                continue
+            try:
+                if action == _WRITE:
+                    fp.write(args[0])
+                elif action == _OPEN:
+                    open_file = self._sink.open_file(*args)
+                    fp = open_file.__enter__()
+                elif action == _CLOSE:
+                    open_file.__exit__(None, None, None)
+                    open_file = fp = None
+                elif action == _COPY:
+                    self._sink.copy_file(*args)
+                elif action == _MAKE_DIR:
+                    self._sink.make_dir(*args)
+            except Exception as e:
+                self._error = e
+                self._stopped.set()
+
+        if open_file is not None:
+            # The render stage failed in the middle of a file
+            open_file.__exit__(PipelineStopped, PipelineStopped(), None)
+
+    def _render(self, template_name, target_file, template, compile_time):
+        """The render stage: render a file into the write queue."""
+        start = time.perf_counter()
+        source_path = os.path.join(self._template_path, template_name)
+        if template is None:
+            self._put(self._writes, (_COPY, source_path, target_file))
+            return profiles.FileStats(
+                template_name,
+                target_file,
+                compile_time,
+                time.perf_counter() - start,
+                os.stat(source_path).st_size,
+            )
+
+        size = 0
+        mode = stat.S_IMODE(os.stat(source_path).st_mode)
+        self._put(self._writes, (_OPEN, target_file, mode))
+        stream = template.stream(**self._settings_vars)
+        stream.enable_buffering(self._buffer_items)
+        for piece in stream:
+            data = piece.encode("utf-8")
+            size += len(data)
+            self._put(self._writes, (_WRITE, data))
+        self._put(self._writes, (_CLOSE,))
+        return profiles.FileStats(
+            template_name,
+            target_file,
+            compile_time,
+            time.perf_counter() - start,
+            size,
+        )
+
+    def run(self, dirs, files):
+        """
+        Create directories and render files.
+
+        :param dirs: The directories to create, parents first, relative to
+            the root of the sink.
+        :type dirs: list of str
+        :param files: A list of (template name, target file, needs render)
+            tuples.
+        :type files: list
+        :return: An iterator over the statistics of rendered files in the
+            order of `files`. All files are written to the sink once it is
+            exhausted.
+        """
+        loader = threading.Thread(target=self._load, args=(files,), daemon=True)
+        writer = threading.Thread(target=self._write, daemon=True)
+        writer.start()
+        loader.start()
+        try:
+            for path in dirs:
+                self._put(self._writes, (_MAKE_DIR, path))
+            for _ in files:
+                while True:
+                    if self._stopped.is_set():
+                        raise PipelineStopped()
+                    try:
+                        loaded = self._loaded.get(timeout=_POLL_INTERVAL)
+                        break
+                    except queue.Empty:
+                        pass
+                yield self._render(*loaded)
+        except PipelineStopped:
+            pass
+        finally:
+            self._stopped.set()
+            # The writer drains everything queued before the end marker
+            self._writes.put((_END,))
+            writer.join()
+            loader.join()
+
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,142 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import contextlib
+import cProfile
+import json
+import resource
+import time
+
+
+# The number of slowest templates in the report
+SLOWEST_TEMPLATES = 10
+
+
+PhaseStats = collections.namedtuple("PhaseStats", ("name", "wall", "cpu"))
+
+FileStats = collections.namedtuple(
+    "FileStats",
+    ("template_name", "target_file", "compile_time", "render_time", "size"),
+)
+
+
+def _get_cpu_time():
+    # Include the CPU time of terminated child processes, like the workers
+    # of a process pool or git
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+class Profiler:
+    """
+    Collects the time spent in every phase of a generation and per file.
+
+    Recording is cheap, so a profiler is always used and only saved when a
+    report is requested.
+    """
+
+    def __init__(self, stats_path=None):
+        super().__init__()
+        self._stats_path = stats_path
+        self._phases = []
+        self._files = []
+
+    @contextlib.contextmanager
+    def phase(self, name, detailed=False):
+        """
+        Measure the wall and CPU time of a phase.
+
+        :param name: The name of the phase.
+        :type name: str
+        :param detailed: Whether to run the phase under cProfile. The
+            statistics are only collected if the profiler has a stats path.
+        :type detailed: bool
+        """
+        profile = None
+        if detailed and self._stats_path:
+            profile = cProfile.Profile()
+
+        wall = time.perf_counter()
+        cpu = _get_cpu_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(self._stats_path)
+            self._phases.append(
+                PhaseStats(
+                    name,
+                    time.perf_counter() - wall,
+                    _get_cpu_time() - cpu,
+                )
+            )
+
+    def add_file(self, file_stats):
+        """
+        Record the statistics of a rendered file.
+
+        :param file_stats: The statistics of the file.
+        :type file_stats: FileStats
+        """
+        self._files.append(file_stats)
+
+    @property
+    def phases(self):
+        return self._phases
+
+    @property
+    def files(self):
+        return self._files
+
+    def get_report(self, slowest=SLOWEST_TEMPLATES):
+        """
+        Build the profile report.
+
+        :param slowest: The number of slowest templates to list.
+        :type slowest: int
+        :return: The report, ready to be serialized to JSON.
+        :rtype: dict
+        """
+        files = sorted(
+            self._files,
+            key=lambda stats: stats.compile_time + stats.render_time,
+            reverse=True,
+        )
+        return {
+            "phases": [stats._asdict() for stats in self._phases],
+            "files": {
+                "count": len(self._files),
+                "size": sum(stats.size for stats in self._files),
+                "compile_time": sum(stats.compile_time for stats in self._files),
+                "render_time": sum(stats.render_time for stats in self._files),
+            },
+            "slowest": [stats._asdict() for stats in files[:slowest]],
+            "all_files": [stats._asdict() for stats in self._files],
+        }
+
+    def save(self, path):
+        """
+        Save the profile report as JSON.
+
+        :param path: The path of the report.
+        :type path: str
+        """
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(self.get_report(), fp, indent=4)
@@ -14,19 +14,271 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 import os
+import json
 import logging
+import pickle
+import stat
+import time
 
-import jinja2
+from gst_templates.common import constants
+from gst_templates.common import imports
+from gst_templates import jinja_functions
+from gst_templates import manifests
+from gst_templates import paths
+from gst_templates import pipelines
+from gst_templates import profiles
+from gst_templates import sinks
+
+
+jinja2 = imports.lazy_import("jinja2")
+
+
+LOG = logging.getLogger(__name__)
+
+# The number of rendered pieces joined together before each write
+STREAM_BUFFER_ITEMS = 1024
+
+
+def get_bytecode_cache(template_settings, cache_dir=None):
+    """
+    Build an on-disk bytecode cache for the given template.
+
+    Compiled templates are stored in a directory keyed by the template name
+    and version. Each cache entry also stores a checksum of the template
+    source, so a modified file is recompiled even if the version stays the
+    same.
+
+    :param template_settings: The template settings.
+    :type template_settings: gst_templates.settings.TemplateSetting
+    :param cache_dir: The root cache directory. Defaults to
+        `constants.DEFAULT_CACHE_DIR`.
+    :type cache_dir: str or None
+    :return: The bytecode cache.
+    :rtype: jinja2.FileSystemBytecodeCache
+    """
+    cache_dir = os.path.expanduser(cache_dir or constants.DEFAULT_CACHE_DIR)
+    bytecode_dir = os.path.join(
+        cache_dir,
+        "bytecode",
+        f"{template_settings.name}-{template_settings.version}",
+    )
+    os.makedirs(bytecode_dir, exist_ok=True)
+    return jinja2.FileSystemBytecodeCache(bytecode_dir)
+
+
+def build_environment(template_settings, cache_dir=None):
+    """
+    Build a Jinja environment for the given template.
+
+    The environment loads files from the precompiled template artifact if
+    there is an up to date one, otherwise from the template directory, and
+    keeps compiled templates both in memory and in the on-disk bytecode cache.
+    Trailing newlines are kept, so rendered files end the same way as the
+    files copied without rendering.
+
+    :param template_settings: The template settings.
+    :type template_settings: gst_templates.settings.TemplateSetting
+    :param cache_dir: The root cache directory.
+    :type cache_dir: str or None
+    :return: The Jinja environment.
+    :rtype: jinja2.Environment
+    """
+    loader = jinja2.FileSystemLoader(template_settings.path)
+    if template_settings.artifact is not None:
+        # Templates missing from the artifact are still loaded from source
+        loader = jinja2.ChoiceLoader([template_settings.artifact.get_loader(), loader])
+    return jinja2.Environment(
+        loader=loader,
+        bytecode_cache=get_bytecode_cache(template_settings, cache_dir),
+        keep_trailing_newline=True,
+    )
+
+
+class _CountingWriter:
+    """Counts the bytes written to a binary file."""
+
+    def __init__(self, fp):
+        super().__init__()
+        self._fp = fp
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return self._fp.write(data)
+
+    def writelines(self, lines):
+        for data in lines:
+            self.write(data)
+
+
+class FileRender:
+    """Renders single template files with a fixed set of variables."""
+
+    def __init__(self, template_path, environment, settings_vars, sink):
+        super().__init__()
+        self._template_path = template_path
+        self._environment = environment
+        self._settings_vars = settings_vars
+        self._sink = sink
+
+    def render_file(self, template_name, target_file, needs_render=True):
+        """
+        Render a template file and write the result to the sink.
+
+        The output is streamed to the sink through a buffered writer, so
+        memory usage does not depend on the size of the rendered file. Files
+        without Jinja markup and binary files are copied as is. The
+        permission bits of the source file are kept in both cases.
+
+        :param template_name: The template name relative to the template
+            directory.
+        :type template_name: str
+        :param target_file: The path of the file to write, relative to the
+            root of the sink, with "/" separators.
+        :type target_file: str
+        :param needs_render: Whether the file has to be rendered or may be
+            copied as is.
+        :type needs_render: bool
+        :return: The statistics of the rendered file.
+        :rtype: gst_templates.profiles.FileStats
+        """
+        source_path = os.path.join(self._template_path, template_name)
+        start = time.perf_counter()
+        if not needs_render:
+            self._sink.copy_file(source_path, target_file)
+            return profiles.FileStats(
+                template_name,
+                target_file,
+                0.0,
+                time.perf_counter() - start,
+                os.stat(source_path).st_size,
+            )
+
+        template = self._environment.get_template(template_name)
+        compiled = time.perf_counter()
+        mode = stat.S_IMODE(os.stat(source_path).st_mode)
+        with self._sink.open_file(target_file, mode) as fp:
+            writer = _CountingWriter(fp)
+            stream = template.stream(**self._settings_vars)
+            stream.enable_buffering(STREAM_BUFFER_ITEMS)
+            stream.dump(writer, encoding="utf-8")
+        return profiles.FileStats(
+            template_name,
+            target_file,
+            compiled - start,
+            time.perf_counter() - compiled,
+            writer.size,
+        )
+
+
+# The file render of a pool worker process. It is built once per worker by
+# `_init_worker`, so the settings are transferred once per worker and not
+# once per file.
+_worker_file_render = None
+
+
+def _init_worker(template_settings, cache_dir, settings_vars, sink):
+    global _worker_file_render
+    _worker_file_render = FileRender(
+        template_settings.path,
+        build_environment(template_settings, cache_dir),
+        settings_vars,
+        sink,
+    )
+
+
+def _render_file_in_worker(template_name, target_file, needs_render):
+    return _worker_file_render.render_file(template_name, target_file, needs_render)
 
 
 class JinjaTemplateRender:
-    def __init__(self, template_settings, repository):
+    def __init__(
+        self,
+        template_settings,
+        repository,
+        cache_dir=None,
+        jobs=1,
+        environment=None,
+        sink=None,
+        profiler=None,
+        render_cache=None,
+        timestamp=None,
+        compiled_segments=None,
+    ):
         super().__init__()
+        self._profiler = profiler or profiles.Profiler()
+        self._compiled_segments = compiled_segments
+        self._render_cache = render_cache
+        self._render_context = None
+        self._timestamp = timestamp
+        self._timestamp_pinned = (
+            timestamp is not None or jinja_functions.is_generation_timestamp_pinned()
+        )
         self._template_settings = template_settings
         self._repository = repository
+        self._sink = sink or sinks.DirectorySink(repository.path)
+        self._cache_dir = cache_dir
+        self._jobs = max(jobs, 1)
+        self._environment = environment or build_environment(
+            template_settings, cache_dir
+        )
+
+    @property
+    def environment(self):
+        """
+        The Jinja environment shared by all files of the template.
+
+        :return: The Jinja environment.
+        :rtype: jinja2.Environment
+        """
+        return self._environment
+
+    @property
+    def sink(self):
+        """
+        The default output of rendered files.
+
+        :return: The sink, a directory sink on the repository path unless
+            another sink was given.
+        :rtype: gst_templates.sinks.AbstractSink
+        """
+        return self._sink
 
-    def initialize_project_settings(self):
+    @property
+    def render_context(self):
+        """
+        The variables all files are rendered with.
+
+        The context is built on first use, once the project settings are
+        initialized, and then shared by every path and file of the project.
+        `functions.now()` returns the timestamp given to the render, or the
+        generation timestamp by default.
+
+        :return: The render context.
+        :rtype: gst_templates.contexts.FrozenDict
+        """
+        if self._render_context is None:
+            self._timestamp = (
+                self._timestamp or jinja_functions.get_generation_timestamp()
+            )
+            self._render_context = self._template_settings.get_render_context(
+                self._timestamp
+            )
+        return self._render_context
+
+    @property
+    def profiler(self):
+        """
+        The profiler recording render phases and per-file statistics.
+
+        :return: The profiler.
+        :rtype: gst_templates.profiles.Profiler
+        """
+        return self._profiler
+
+    def initialize_project_settings(self, interactive=True):
         """
         Initialize the project settings using the given template settings and
         repository.
@@ -35,47 +287,384 @@ class JinjaTemplateRender:
         to initialize the project settings. It then saves the project settings
         to a file in the repository and commits the changes.
 
+        :param interactive: Whether to ask the user for every parameter. If
+            False, the current values of the template settings are saved.
+        :type interactive: bool
         :return: None
         """
-        self._template_settings.initialize()
+        if interactive:
+            self._template_settings.initialize()
 
-        template_path = os.path.join(self._repository.path, "project_settings.json")
+        template_path = os.path.join(
+            self._repository.path,
+            constants.PROJECT_SETTINGS_FILE_NAME,
+        )
 
         self._template_settings.save(template_path)
         self._repository.add_file(template_path)
         self._repository.commit("Initialize project settings")
 
-    def render_template(self):
-        template_files = self._template_settings.template_files
+    def write_project_settings(self, sink=None):
+        """
+        Write the project settings file to a sink.
 
-        target_files = (
-            jinja2.Template("\n".join(template_files))
-            .render(**self._template_settings.settings_vars)
-            .split("\n")
+        :param sink: The sink to write to. Defaults to the render sink.
+        :type sink: gst_templates.sinks.AbstractSink or None
+        """
+        sink = sink or self._sink
+        sink.write_bytes(
+            constants.PROJECT_SETTINGS_FILE_NAME,
+            json.dumps(self._template_settings.project_settings, indent=4).encode(
+                "utf-8"
+            ),
         )
 
-        # Replace template path prefix to repository path prefix
-        target_files = [
-            (self._repository.path + target_file[len(self._template_settings.path) :])
-            for target_file in target_files
-        ]
+    def _get_file_render(self, settings_vars, sink):
+        return FileRender(
+            self._template_settings.path,
+            self._environment,
+            settings_vars,
+            sink,
+        )
+
+    def _start_process_pool(self, settings_vars, sink):
+        """
+        Create a pool of worker processes and wait for a worker to start.
+
+        Errors of processes, like a platform without them or settings which
+        can not be pickled, are thus raised before any file is rendered.
+
+        :param settings_vars: The variables to render templates with.
+        :type settings_vars: dict
+        :param sink: The sink to write to, shared by all workers.
+        :type sink: gst_templates.sinks.AbstractSink
+        :return: The started pool.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+        executor = futures.ProcessPoolExecutor(
+            max_workers=self._jobs,
+            initializer=_init_worker,
+            initargs=(self._template_settings, self._cache_dir, settings_vars, sink),
+        )
+        probe = executor.submit(int)
+        try:
+            probe.result()
+        except BaseException:
+            # `shutdown(cancel_futures=True)` needs Python 3.9. With the
+            # probe cancelled nothing is left to wait for, and Python 3.8
+            # needs the wait so its pool thread does not use closed queues.
+            probe.cancel()
+            executor.shutdown()
+            raise
+        return executor
+
+    def _render_files_in_processes(self, executor, files):
+        """
+        Render files across a pool of worker processes.
+
+        :param executor: The started pool.
+        :type executor: concurrent.futures.ProcessPoolExecutor
+        :param files: A list of (template name, target file, needs render)
+            tuples.
+        :type files: list
+        :return: An iterator over the statistics of rendered files in the
+            order of `files`.
+        """
+        return executor.map(
+            _render_file_in_worker,
+            *zip(*files),
+            chunksize=max(len(files) // (self._jobs * 4), 1),
+        )
+
+    def _render_files_in_threads(self, files, settings_vars, sink):
+        """
+        Render files across a pool of threads sharing one environment.
+
+        :param files: A list of (template name, target file, needs render)
+            tuples.
+        :type files: list
+        :param settings_vars: The variables to render templates with.
+        :type settings_vars: dict
+        :param sink: The sink to write to.
+        :type sink: gst_templates.sinks.AbstractSink
+        :return: An iterator over the statistics of rendered files in the
+            order of `files`.
+        """
+        file_render = self._get_file_render(settings_vars, sink)
+        with futures.ThreadPoolExecutor(max_workers=self._jobs) as executor:
+            yield from executor.map(file_render.render_file, *zip(*files))
+
+    def _render_files(self, dirs, files, settings_vars, sink):
+        """
+        Create directories and render files serially or in parallel depending
+        on the number of jobs.
 
-        for source_path, target_path in zip(template_files, target_files):
-            # create directory if it does not exist
-            if os.path.isdir(source_path):
-                os.makedirs(target_path, exist_ok=True)
+        Serial rendering goes through a pipeline overlapping reading,
+        rendering and writing. Parallel rendering prefers a process pool and
+        falls back to a thread pool when processes can not be started, for
+        example when the settings can not be pickled, or when a worker
+        dies. Files are independent from each other, so a file that was
+        already rendered by the failed pool is simply rendered again. Errors
+        of the render itself, like write errors, are raised. Sinks which are
+        not safe for parallel writes, like archives, are always written
+        serially.
+
+        :param dirs: The directories to create, parents first.
+        :type dirs: list of str
+        :param files: A list of (template name, target file, needs render)
+            tuples.
+        :type files: list
+        :param settings_vars: The variables to render templates with.
+        :type settings_vars: dict
+        :param sink: The sink to write to.
+        :type sink: gst_templates.sinks.AbstractSink
+        :return: An iterator over the statistics of rendered files in the
+            order of `files`.
+        """
+        if self._jobs == 1 or len(files) < 2 or not sink.parallel_safe:
+            return pipelines.RenderPipeline(
+                self._template_settings.path,
+                self._environment,
+                settings_vars,
+                sink,
+                STREAM_BUFFER_ITEMS,
+            ).run(dirs, files)
+
+        # Workers write files concurrently, so the whole skeleton has to
+        # exist first
+        for path in dirs:
+            sink.make_dir(path)
+        try:
+            executor = self._start_process_pool(settings_vars, sink)
+        except (
+            OSError,
+            NotImplementedError,
+            pickle.PicklingError,
+            futures.BrokenExecutor,
+        ) as e:
+            LOG.warning("Unable to start render processes (%s), using threads", e)
+            return self._render_files_in_threads(files, settings_vars, sink)
+
+        with executor:
+            try:
+                return iter(list(self._render_files_in_processes(executor, files)))
+            except futures.BrokenExecutor as e:
+                LOG.warning("Render processes died (%s), using threads", e)
+        return self._render_files_in_threads(files, settings_vars, sink)
+
+    def _render_files_cached(self, dirs, files, settings_vars, sink):
+        """
+        Create directories and render files through the render cache.
+
+        Files missing from the cache are rendered into a staging directory
+        and moved into the cache. Then every file is written to the sink in
+        order: rendered files are linked or copied from the cache and the
+        other ones are copied from the template. Entries evicted by a
+        concurrent generation in the meantime are rendered again.
+
+        :param dirs: The directories to create, parents first.
+        :type dirs: list of str
+        :param files: A list of (template name, target file, needs render)
+            tuples.
+        :type files: list
+        :param settings_vars: The variables to render templates with.
+        :type settings_vars: dict
+        :param sink: The sink to write to.
+        :type sink: gst_templates.sinks.AbstractSink
+        :return: An iterator over the statistics of written files.
+        """
+        base_key = self._render_cache.get_base_key(
+            self._template_settings, self._timestamp
+        )
+        keys = {}
+        cached = {}
+        misses = []
+        for template_name, target_file, needs_render in files:
+            if not needs_render:
                 continue
+            source_path = os.path.join(self._template_settings.path, template_name)
+            keys[target_file] = self._render_cache.get_key(
+                base_key,
+                template_name,
+                stat.S_IMODE(os.stat(source_path).st_mode),
+            )
+            cached[target_file] = self._render_cache.get(keys[target_file])
+            if cached[target_file] is None:
+                misses.append((template_name, target_file, needs_render))
+        LOG.info(
+            "%d of %d rendered files found in the render cache",
+            len(keys) - len(misses),
+            len(keys),
+        )
 
-            # Render and copy files
-            with open(source_path, "r", encoding="utf-8") as fp1:
-                with open(target_path, "w", encoding="utf-8") as fp2:
-                    logging.info(
-                        "Rendering %s to %s",
-                        source_path,
-                        target_path,
-                    )
-                    fp2.write(
-                        jinja2.Template(fp1.read()).render(
-                            **self._template_settings.settings_vars
-                        )
+        rendered = set()
+        if misses:
+            with self._render_cache.stage() as staging_sink:
+                for file_stats in self._render_files(
+                    dirs, misses, settings_vars, staging_sink
+                ):
+                    rendered.add(file_stats.target_file)
+                    yield file_stats
+                # Files are complete once the render loop is over
+                for target_file in rendered:
+                    cached[target_file] = self._render_cache.put(
+                        keys[target_file], staging_sink.get_path(target_file)
                     )
+
+        for path in dirs:
+            sink.make_dir(path)
+        for template_name, target_file, needs_render in files:
+            start = time.perf_counter()
+            if needs_render:
+                source_path = cached[target_file]
+                try:
+                    self._render_cache.materialize(source_path, sink, target_file)
+                except FileNotFoundError:
+                    # Evicted by a concurrent generation since the lookup
+                    LOG.debug("Render cache entry of %s vanished", target_file)
+                    for file_stats in self._render_files(
+                        [],
+                        [(template_name, target_file, needs_render)],
+                        settings_vars,
+                        sink,
+                    ):
+                        if target_file not in rendered:
+                            yield file_stats
+                    continue
+            else:
+                source_path = os.path.join(self._template_settings.path, template_name)
+                sink.copy_file(source_path, target_file)
+            if target_file not in rendered:
+                yield profiles.FileStats(
+                    template_name,
+                    target_file,
+                    0.0,
+                    time.perf_counter() - start,
+                    os.stat(source_path).st_size,
+                )
+
+    def get_target_files(self):
+        """
+        Map template entries to their target paths.
+
+        Entries whose condition is false for the project are left out.
+
+        :return: A list of (index entry, target path) pairs, in the order of
+            the template index. Target paths are relative to the target
+            directory.
+        :rtype: list
+        :raises gst_templates.paths.InvalidTargetPath: If a path renders to an
+            invalid name or two paths render to the same target.
+        """
+        # Subtrees disabled by the conditions of the template are dropped
+        # before any of their paths is rendered
+        entries = self._template_settings.rules.get_disabled(
+            self._environment, self.render_context
+        ).exclude(self._template_settings.index.entries)
+        artifact = self._template_settings.artifact
+        path_render = paths.PathRender(
+            self._environment,
+            self.render_context,
+            segment_templates=artifact.segments if artifact else None,
+            compiled_segments=self._compiled_segments,
+        )
+        target_files = path_render.render_paths(entry.name for entry in entries)
+        return [
+            (entry, target_file.replace("/", os.sep))
+            for entry, target_file in zip(entries, target_files)
+        ]
+
+    def render_template(self, sink=None, template_names=None):
+        """
+        Render the template into a sink.
+
+        The directory skeleton is created first and files are written
+        afterwards, so the render loop does not depend on the kind of the
+        sink. Written files are synced by the sink at the end, in a single
+        batch. With a render cache and a pinned timestamp, only files missing
+        from the cache are rendered.
+
+        :param sink: The sink to render to. Defaults to the render sink.
+        :type sink: gst_templates.sinks.AbstractSink or None
+        :param template_names: The names of the template files to render. All
+            files are rendered if None. Directories are always created.
+        :type template_names: set or None
+        :return: A dict mapping rendered paths, relative to the root of the
+            sink, to template names.
+        :rtype: dict
+        """
+        sink = sink or self._sink
+        settings_vars = self.render_context
+
+        with self._profiler.phase("path_render"):
+            target_files = self.get_target_files()
+
+        dirs = []
+        files = []
+        rendered_files = {}
+        for entry, target_file in target_files:
+            if entry.is_dir:
+                dirs.append(target_file.replace(os.sep, "/"))
+                continue
+
+            if template_names is not None and entry.name not in template_names:
+                continue
+
+            files.append(
+                (
+                    entry.name,
+                    target_file.replace(os.sep, "/"),
+                    entry.needs_render,
+                )
+            )
+            rendered_files[target_file] = entry.name
+
+        render_files = self._render_files
+        if self._render_cache is not None:
+            if self._timestamp_pinned:
+                render_files = self._render_files_cached
+            else:
+                # Every generation would have its own keys
+                LOG.info("Render cache skipped, SOURCE_DATE_EPOCH is not set")
+
+        with self._profiler.phase("file_render", detailed=True):
+            for file_stats in render_files(dirs, files, settings_vars, sink):
+                self._profiler.add_file(file_stats)
+                LOG.info(
+                    "Rendered %s to %s",
+                    os.path.join(
+                        self._template_settings.path, file_stats.template_name
+                    ),
+                    file_stats.target_file,
+                )
+            sink.sync(dirs, [target_file for _, target_file, _ in files])
+
+        return rendered_files
+
+    def save_manifest(self, rendered_files):
+        """
+        Save the content-hash manifest of the rendered project.
+
+        :param rendered_files: The rendered files as returned by
+            `render_template`.
+        :type rendered_files: dict
+        """
+        manifests.ProjectManifest.build(
+            self._template_settings,
+            self._repository,
+            rendered_files,
+        ).save(self._repository)
+
+    def commit_project(self):
+        """
+        Stage and commit the rendered project.
+
+        All rendered files and the manifest are staged by a single git
+        process and committed at once, whatever the number of files.
+
+        :return: None
+        """
+        self._repository.add_all()
+        self._repository.commit(
+            f"Render {self._template_settings.name} {self._template_settings.version}"
+        )
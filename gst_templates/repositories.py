@@ -14,15 +14,52 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import binascii
 import os
+import tempfile
 
-import git
+from gst_templates.common import imports
+
+
+git = imports.lazy_import("git")
+
+
+def _make_input(lines):
+    """
+    Make a file object to pass lines to the standard input of git.
+
+    :param lines: The lines to pass.
+    :type lines: iterable of str
+    :return: A binary file object positioned at its beginning.
+    """
+    fp = tempfile.TemporaryFile()
+    for line in lines:
+        fp.write(line.encode("utf-8") + b"\n")
+    fp.seek(0)
+    return fp
 
 
 class GitRepository:
     def __init__(self, repository_path):
         super().__init__()
         self._repository_path = os.path.abspath(repository_path)
+        self._repo = None
+
+    def _get_repo(self):
+        """
+        Get the repository handle, opening it on first use.
+
+        The handle is reused by all methods, together with the persistent
+        `git cat-file` processes GitPython keeps for it.
+
+        :return: The repository handle.
+        :rtype: git.Repo
+        :raises git.InvalidGitRepositoryError: If the path is not a git
+            repository.
+        """
+        if self._repo is None:
+            self._repo = git.Repo(self._repository_path)
+        return self._repo
 
     def _init_directory(self):
         """
@@ -49,9 +86,9 @@ class GitRepository:
         :rtype: bool
         """
         try:
-            git.Repo(self._repository_path)
+            self._get_repo()
             return True
-        except git.InvalidGitRepositoryError:
+        except (git.InvalidGitRepositoryError, git.NoSuchPathError):
             return False
 
     def has_uncommitted_changes(self):
@@ -65,7 +102,7 @@ class GitRepository:
         :rtype: bool
         """
 
-        repo = git.Repo(self._repository_path)
+        repo = self._get_repo()
         return repo.is_dirty(untracked_files=True)
 
     def initialize_repository(self):
@@ -80,7 +117,7 @@ class GitRepository:
         """
         self._init_directory()
         if not self.is_repo_initialized():
-            git.Repo.init(self._repository_path)
+            self._repo = git.Repo.init(self._repository_path)
 
     @property
     def path(self):
@@ -93,10 +130,131 @@ class GitRepository:
         return self._repository_path
 
     def add_file(self, file_path):
-        repo = git.Repo(self._repository_path)
+        repo = self._get_repo()
         repo.git.add(file_path)
 
+    def add_all(self):
+        """
+        Stage all changes of the working tree in one operation.
+
+        New, modified and removed files are staged by a single `git add`
+        process, files ignored by `.gitignore` are skipped.
+
+        :return: None
+        """
+        repo = self._get_repo()
+        repo.git.add(all=True)
+
     def commit(self, message=None):
         message = message or "Automated commit"
-        repo = git.Repo(self._repository_path)
+        repo = self._get_repo()
         repo.git.commit(m=message)
+
+    def hash_files(self, file_paths, write=True):
+        """
+        Calculate git blob hashes of files.
+
+        All files are hashed by a single git process.
+
+        :param file_paths: The paths of the files to hash.
+        :type file_paths: list of str
+        :param write: Whether to write the blobs into the object database.
+        :type write: bool
+        :return: The blob hashes in the order of `file_paths`.
+        :rtype: list of str
+        """
+        if not file_paths:
+            return []
+
+        repo = self._get_repo()
+        args = ["-w", "--stdin-paths"] if write else ["--stdin-paths"]
+        with _make_input(file_paths) as istream:
+            return repo.git.hash_object(*args, istream=istream).split("\n")
+
+    def read_blob(self, blob_hash):
+        """
+        Read the content of a blob from the object database.
+
+        :param blob_hash: The hex hash of the blob.
+        :type blob_hash: str
+        :return: The content of the blob.
+        :rtype: bytes
+        """
+        repo = self._get_repo()
+        return repo.odb.stream(binascii.a2b_hex(blob_hash)).read()
+
+    def merge_file(self, current_path, base_path, other_path):
+        """
+        Merge changes between two versions of a file into the current one.
+
+        This method runs `git merge-file` and does not modify any file.
+
+        :param current_path: The path of the current version of the file.
+        :type current_path: str
+        :param base_path: The path of the common ancestor version.
+        :type base_path: str
+        :param other_path: The path of the version to merge.
+        :type other_path: str
+        :return: The merged content and the number of conflicts.
+        :rtype: tuple of (bytes, int)
+        """
+        repo = self._get_repo()
+        status, merged, stderr = repo.git.merge_file(
+            "-p",
+            "-L",
+            "current",
+            "-L",
+            "base",
+            "-L",
+            "template",
+            current_path,
+            base_path,
+            other_path,
+            with_extended_output=True,
+            with_exceptions=False,
+            stdout_as_string=False,
+            strip_newline_in_stdout=False,
+        )
+        # The number of conflicts is capped at 127, higher statuses are
+        # errors, like 255 for binary files
+        if status < 0 or status > 127:
+            raise git.GitCommandError("merge-file", status, stderr)
+        return merged, status
+
+    def save_snapshot(self, ref, blobs, message):
+        """
+        Commit a tree of existing blobs to a ref without touching the index
+        or the working tree.
+
+        The new commit has the previous commit of the ref as its parent, so
+        all blobs ever saved stay reachable.
+
+        :param ref: The full name of the ref to update.
+        :type ref: str
+        :param blobs: A dict mapping paths relative to the repository root to
+            (mode, blob hash) pairs.
+        :type blobs: dict
+        :param message: The commit message.
+        :type message: str
+        :return: The hash of the new commit.
+        :rtype: str
+        """
+        repo = self._get_repo()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = {"GIT_INDEX_FILE": os.path.join(tmp_dir, "index")}
+            with _make_input(
+                f"{mode:o} {blob_hash}\t{path}"
+                for path, (mode, blob_hash) in sorted(blobs.items())
+            ) as istream:
+                repo.git.update_index("--add", "--index-info", istream=istream, env=env)
+            tree = repo.git.write_tree(env=env)
+
+        parents = []
+        try:
+            parents = ["-p", repo.git.rev_parse("--verify", "-q", ref)]
+        except git.GitCommandError:
+            pass
+
+        commit = repo.git.commit_tree(tree, "-m", message, *parents)
+        repo.git.update_ref(ref, commit)
+        return commit
@@ -0,0 +1,320 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import http
+from http import server as http_server
+import json
+import logging
+import socket
+import threading
+from urllib import parse
+
+from gst_templates import paths
+from gst_templates import renders
+from gst_templates import sinks
+
+
+LOG = logging.getLogger(__name__)
+
+# The size limit of the settings posted to render a project, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+# The time in seconds a client may take to send a request, so a slow client
+# does not hold a worker forever
+REQUEST_TIMEOUT = 30
+
+CONTENT_TYPES = {
+    "tar": ("application/x-tar", "tar"),
+    "tgz": ("application/gzip", "tar.gz"),
+    "zip": ("application/zip", "zip"),
+}
+
+
+class DuplicateTemplate(Exception):
+    pass
+
+
+class WarmTemplate:
+    """
+    A template served by the render server.
+
+    The template is indexed and all its files and path segments are
+    compiled once, so requests only render. Every request renders with its
+    own copy of the settings and shares the Jinja environment and the
+    compiled path segments with the other requests.
+    """
+
+    def __init__(self, template_settings, cache_dir=None):
+        super().__init__()
+        self._template_settings = template_settings
+        self._environment = renders.build_environment(template_settings, cache_dir)
+        self._compiled_segments = {}
+
+    @property
+    def name(self):
+        return self._template_settings.name
+
+    @property
+    def version(self):
+        return self._template_settings.version
+
+    def warm_up(self):
+        """
+        Index the template and compile all its files and path segments.
+
+        :return: The number of compiled files.
+        :rtype: int
+        """
+        path_render = paths.PathRender(
+            self._environment, {}, compiled_segments=self._compiled_segments
+        )
+        compiled = 0
+        for entry in self._template_settings.index.entries:
+            path_render.compile_path(entry.name)
+            if entry.needs_render:
+                self._environment.get_template(entry.name)
+                compiled += 1
+        return compiled
+
+    def get_render(self, settings_values, sink):
+        """
+        Prepare the render of a project.
+
+        :param settings_values: The parameter values grouped by section,
+            like in the template settings file. Missing parameters keep
+            their default values.
+        :type settings_values: dict
+        :param sink: The sink to render to.
+        :type sink: gst_templates.sinks.AbstractSink
+        :return: The render of the project.
+        :rtype: gst_templates.renders.JinjaTemplateRender
+        """
+        template_settings = self._template_settings.copy()
+        template_settings.update(settings_values)
+        return renders.JinjaTemplateRender(
+            template_settings,
+            None,
+            environment=self._environment,
+            sink=sink,
+            compiled_segments=self._compiled_segments,
+        )
+
+
+class _ResponseWriter:
+    """
+    Sends the response headers right before the first byte of the body.
+
+    Errors raised before anything is written can thus still be reported
+    with a proper status.
+    """
+
+    def __init__(self, handler, content_type, file_name):
+        super().__init__()
+        self._handler = handler
+        self._content_type = content_type
+        self._file_name = file_name
+        self._discarded = False
+        self.started = False
+
+    def discard(self):
+        """Drop everything written from now on, like the end of an archive."""
+        self._discarded = True
+
+    def write(self, data):
+        if self._discarded:
+            return len(data)
+        if not self.started:
+            self.started = True
+            self._handler.send_response(http.HTTPStatus.OK)
+            self._handler.send_header("Content-Type", self._content_type)
+            self._handler.send_header(
+                "Content-Disposition", f'attachment; filename="{self._file_name}"'
+            )
+            self._handler.end_headers()
+        return self._handler.wfile.write(data)
+
+    def flush(self):
+        self._handler.wfile.flush()
+
+
+class _RequestHandler(http_server.BaseHTTPRequestHandler):
+    """
+    The API of the render server.
+
+    `GET /templates` lists the served templates. `POST
+    /templates/<name>/render?format=<tar|tgz|zip>` renders a project from
+    the JSON settings in the body and streams it back as an archive. The
+    response has no length and ends when the connection is closed.
+    """
+
+    server_version = "GenesisTemplates"
+    timeout = REQUEST_TIMEOUT
+
+    def log_message(self, format, *args):
+        LOG.info("%s %s", self.address_string(), format % args)
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {"error": message})
+
+    def do_GET(self):
+        if parse.urlsplit(self.path).path.rstrip("/") != "/templates":
+            self._send_error(http.HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        self._send_json(
+            http.HTTPStatus.OK,
+            {
+                "templates": [
+                    {"name": template.name, "version": template.version}
+                    for template in self.server.templates.values()
+                ]
+            },
+        )
+
+    def _read_settings(self):
+        try:
+            length = int(self.headers["Content-Length"])
+        except ValueError:
+            raise ValueError("Invalid Content-Length") from None
+        if length < 0:
+            raise ValueError("Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise ValueError(f"The settings are larger than {MAX_BODY_SIZE} bytes")
+        settings_values = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(settings_values, dict):
+            raise ValueError("The settings must be a JSON object")
+        return settings_values
+
+    def do_POST(self):
+        url = parse.urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "templates" or parts[2] != "render":
+            self._send_error(http.HTTPStatus.NOT_FOUND, "Not found")
+            return
+        template = self.server.templates.get(parts[1])
+        if template is None:
+            self._send_error(
+                http.HTTPStatus.NOT_FOUND, f"Unknown template {parts[1]!r}"
+            )
+            return
+
+        output = parse.parse_qs(url.query).get("format", [self.server.output])[0]
+        if output not in CONTENT_TYPES:
+            self._send_error(http.HTTPStatus.BAD_REQUEST, f"Unknown format {output!r}")
+            return
+
+        if self.headers.get("Content-Length") is None:
+            self._send_error(
+                http.HTTPStatus.LENGTH_REQUIRED, "Content-Length is required"
+            )
+            return
+
+        try:
+            settings_values = self._read_settings()
+        except ValueError as e:
+            self._send_error(http.HTTPStatus.BAD_REQUEST, str(e))
+            return
+        except socket.timeout:
+            LOG.warning("Timed out reading the settings of %s", self.client_address)
+            self.close_connection = True
+            self._send_error(http.HTTPStatus.REQUEST_TIMEOUT, "Request timed out")
+            return
+
+        content_type, extension = CONTENT_TYPES[output]
+        writer = _ResponseWriter(self, content_type, f"{template.name}.{extension}")
+        try:
+            sink = sinks.SINKS[output](writer)
+            template_render = template.get_render(settings_values, sink)
+            template_render.write_project_settings()
+            template_render.render_template()
+            sink.close()
+        except Exception as e:
+            writer.discard()
+            if writer.started:
+                # Part of the archive is sent already, so the only way to
+                # report the error is to drop the connection
+                LOG.exception("Unable to render %s", template.name)
+                self.close_connection = True
+                return
+            if isinstance(e, paths.InvalidTargetPath):
+                self._send_error(http.HTTPStatus.BAD_REQUEST, str(e))
+                return
+            LOG.exception("Unable to render %s", template.name)
+            self._send_error(http.HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+
+
+class TemplateServer(http_server.HTTPServer):
+    """
+    An HTTP server rendering projects from warm templates.
+
+    Requests are handled by a fixed pool of worker threads, so the number of
+    concurrent renders is bounded. Up to `queue_size` more accepted
+    requests wait for a free worker. Once they are all taken, no connection
+    is accepted until a worker is free, and new connections wait in the
+    listen backlog of `queue_size` connections. Projects are rendered as
+    `output` archives unless a request asks for another format.
+    """
+
+    def __init__(
+        self,
+        server_address,
+        templates,
+        workers=4,
+        output="tgz",
+        queue_size=16,
+    ):
+        self.templates = {}
+        for template in templates:
+            if template.name in self.templates:
+                raise DuplicateTemplate(f"Template {template.name} is served twice")
+            self.templates[template.name] = template
+        self.output = output
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="render"
+        )
+        # The requests being rendered or waiting for a worker
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self.request_queue_size = max(queue_size, 1)
+        super().__init__(server_address, _RequestHandler)
+
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        self._executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def handle_error(self, request, client_address):
+        LOG.exception("Unable to handle a request of %s", client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
@@ -12,10 +12,37 @@
 #    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
 #
 
+import copy
 import os
 import json
+import logging
 
+from gst_templates import artifacts
+from gst_templates import contexts
+from gst_templates import indexes
 from gst_templates import jinja_functions
+from gst_templates import matchers
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ConsolePrompt:
+    """Asks for parameter values on the console."""
+
+    def __init__(self):
+        super().__init__()
+        self._section_name = None
+
+    def __call__(self, section_name, param_name, param_value):
+        if section_name != self._section_name:
+            self._section_name = section_name
+            print(f"Initializing {section_name} settings...")
+        print(
+            f"Initializing parameter '{param_name}' [{param_value}]: ",
+            end="",
+        )
+        return input() or param_value
 
 
 class TemplateSetting:
@@ -26,6 +53,9 @@ class TemplateSetting:
         self._template_setting_path = template_setting_path
         self._settings_vars = self._load_template_settings(template_setting_path)
         self._fill_template_parameters(self._settings_vars)
+        self._index = None
+        self._artifact = None
+        self._artifact_loaded = False
         super().__init__()
 
     def _load_template_settings(self, template_setting_path):
@@ -49,7 +79,8 @@ class TemplateSetting:
         Fill in the template parameters based on the given template settings.
 
         This method takes the template settings dictionary and fills in the
-        template parameters such as the name, version and path of the template.
+        template parameters such as the name, version and path of the template,
+        and the rules selecting how its files are handled.
 
         :param settings_vars: The template settings dictionary.
         :type settings_vars: dict
@@ -58,8 +89,18 @@ class TemplateSetting:
         self._name = template_settings.pop("name")
         self._version = template_settings.pop("version")
         self._path = self._get_template_path(template_settings.pop("path"))
+        self._rules = matchers.TemplateRules.from_template_info(template_settings)
+
+    def initialize(self, prompt=None):
+        """
+        Ask for the value of every parameter.
 
-    def initialize(self):
+        :param prompt: A callable taking the section name, the parameter
+            name and its current value, and returning the new value.
+            Defaults to asking on the console.
+        :type prompt: callable or None
+        """
+        prompt = prompt or ConsolePrompt()
         tmp_settings = self.settings_vars
         for section_name, settings in self.settings_vars.items():
             if section_name in [
@@ -68,16 +109,69 @@ class TemplateSetting:
             ]:
                 continue
 
-            print(f"Initializing {section_name} settings...")
             for param_name, param_value in settings.items():
-                print(
-                    f"Initializing parameter '{param_name}' [{param_value}]: ",
-                    end="",
+                tmp_settings[section_name][param_name] = prompt(
+                    section_name, param_name, param_value
                 )
-                tmp_settings[section_name][param_name] = input() or param_value
 
         self._settings_vars = tmp_settings
 
+    def update(self, settings_values):
+        """
+        Update the template parameters with the given values.
+
+        Only parameters known by the template are updated, so values of
+        parameters removed from the template are ignored, and new parameters
+        keep their default values.
+
+        :param settings_values: A dictionary mapping section names to
+            dictionaries of parameter values, like the content of a saved
+            project settings file.
+        :type settings_values: dict
+        """
+        for section_name, settings in settings_values.items():
+            if section_name in [
+                self.TEMPLATE_INFO_SECTION,
+                self.FUNCTIONS_SECTION,
+            ] or not isinstance(settings, dict):
+                continue
+
+            section = self._settings_vars.get(section_name)
+            if section is None:
+                continue
+
+            for param_name, param_value in settings.items():
+                if param_name in section:
+                    section[param_name] = param_value
+
+    def copy(self):
+        """
+        Make a copy of the template settings with independent parameter
+        values.
+
+        The copy shares everything that depends on the template only, like
+        the template index.
+
+        :return: The copy of the template settings.
+        :rtype: TemplateSetting
+        """
+        # Make sure the index and the artifact are loaded once and shared
+        self.build_index()
+        self.load_artifact()
+        template_settings = copy.copy(self)
+        template_settings._settings_vars = copy.deepcopy(self._settings_vars)
+        return template_settings
+
+    def load_project_settings(self, project_settings_path):
+        """
+        Update the template parameters from a saved project settings file.
+
+        :param project_settings_path: The path to the project settings file
+            written by `save`.
+        :type project_settings_path: str
+        """
+        self.update(self._load_template_settings(project_settings_path))
+
     def save(self, new_project_settings_path):
         """
         Save the project settings to the specified path.
@@ -89,6 +183,18 @@ class TemplateSetting:
             file.
         :type new_project_settings_path: str
         """
+        with open(new_project_settings_path, "w", encoding="utf-8") as fp:
+            json.dump(self.project_settings, fp, indent=4)
+
+    @property
+    def project_settings(self):
+        """
+        The project settings as saved by `save`.
+
+        :return: The parameter values and the template information, without
+            the Jinja functions.
+        :rtype: dict
+        """
         settings_vars = self.settings_vars
         settings_vars.pop(self.FUNCTIONS_SECTION)
         settings_vars.update(
@@ -100,30 +206,27 @@ class TemplateSetting:
                 }
             }
         )
-        with open(new_project_settings_path, "w", encoding="utf-8") as fp:
-            json.dump(settings_vars, fp, indent=4)
+        return settings_vars
 
     def _get_template_path(self, path_from_settings):
         """
         Resolve the absolute path of the template using the given path from the
         settings.
 
-        This method first changes the current working directory to the parent
-        directory of the template setting path, then it resolves the absolute
-        path of the template using the given path and finally it changes the
-        current working directory back to the original current working
-        directory.
+        Relative paths are relative to the directory of the template
+        settings file. The current working directory is not changed, so
+        settings may be loaded concurrently from several threads.
 
         :param path_from_settings: The path of the template from the settings.
         :type path_from_settings: str
         :return: The absolute path of the template.
         :rtype: str
         """
-        current_dir = os.getcwd()
-        os.chdir(os.path.dirname(self._template_setting_path))
-        template_path = os.path.abspath(path_from_settings)
-        os.chdir(current_dir)
-        return template_path
+        return os.path.abspath(
+            os.path.join(
+                os.path.dirname(self._template_setting_path), path_from_settings
+            )
+        )
 
     @property
     def settings_vars(self):
@@ -137,6 +240,28 @@ class TemplateSetting:
         copy_settings[self.FUNCTIONS_SECTION] = jinja_functions.get_jinja_functions()
         return copy_settings
 
+    def get_render_context(self, timestamp=None):
+        """
+        Build the immutable variables to render templates with.
+
+        The context is meant to be built once per generation and shared by
+        all files: parameter values are copied and frozen, `functions.now`
+        returns the same moment for every file and memoized functions cache
+        their results.
+
+        :param timestamp: The moment of the generation. Defaults to
+            `jinja_functions.get_generation_timestamp()`.
+        :type timestamp: datetime.datetime or None
+        :return: The render context.
+        :rtype: gst_templates.contexts.FrozenDict
+        """
+        timestamp = timestamp or jinja_functions.get_generation_timestamp()
+        render_context = dict(contexts.freeze(self._settings_vars))
+        render_context[self.FUNCTIONS_SECTION] = contexts.FrozenDict(
+            jinja_functions.get_jinja_functions(timestamp)
+        )
+        return contexts.FrozenDict(render_context)
+
     @property
     def name(self):
         """
@@ -167,27 +292,123 @@ class TemplateSetting:
         """
         return self._path
 
+    @property
+    def rules(self):
+        """
+        The rules of `template_info` selecting how template files are
+        handled.
+
+        :return: The template rules.
+        :rtype: gst_templates.matchers.TemplateRules
+        """
+        return self._rules
+
+    @property
+    def index_path(self):
+        """
+        The path of the template index file, next to the settings file.
+
+        :return: The path of the template index file.
+        :rtype: str
+        """
+        return os.path.splitext(self._template_setting_path)[0] + ".index.json"
+
+    @property
+    def index(self):
+        """
+        The index of the template directory, see `build_index`.
+
+        :return: The template index.
+        :rtype: gst_templates.indexes.TemplateIndex
+        """
+        return self.build_index()
+
+    def build_index(self):
+        """
+        Load the index of the template directory if it is not loaded yet.
+
+        The index is loaded from `index_path` and refreshed once, on the
+        first call. Only files modified since the index was saved are read.
+
+        :return: The template index.
+        :rtype: gst_templates.indexes.TemplateIndex
+        """
+        if self._index is None:
+            self._index = indexes.TemplateIndex.load_or_build(
+                self.index_path,
+                self.path,
+                self._rules,
+            )
+        return self._index
+
+    @property
+    def artifact_path(self):
+        """
+        The path of the precompiled template artifact, next to the settings
+        file.
+
+        :return: The path of the artifact.
+        :rtype: str
+        """
+        return os.path.splitext(self._template_setting_path)[0] + ".compiled.zip"
+
+    @property
+    def artifact(self):
+        """
+        The precompiled template artifact, see `load_artifact`.
+
+        :return: The artifact or None if there is no up to date artifact.
+        :rtype: gst_templates.artifacts.TemplateArtifact or None
+        """
+        return self.load_artifact()
+
+    def load_artifact(self):
+        """
+        Load the precompiled template artifact if it is not loaded yet.
+
+        The artifact is loaded once, on the first call, and only used if it
+        was compiled from the current content of the template.
+
+        :return: The artifact or None if there is no up to date artifact.
+        :rtype: gst_templates.artifacts.TemplateArtifact or None
+        """
+        if not self._artifact_loaded:
+            artifact = artifacts.TemplateArtifact.load(self.artifact_path)
+            if artifact is not None and not artifact.is_up_to_date(self):
+                LOG.warning(
+                    "Template artifact %s is outdated, recompile it with"
+                    " genesis-compile-template",
+                    self.artifact_path,
+                )
+                artifact = None
+            self._artifact = artifact
+            self._artifact_loaded = True
+        return self._artifact
+
     @property
     def template_files(self):
         """
         Retrieve all file paths within the template directory.
 
-        This property method traverses the template directory specified by the
-        `path` attribute, collecting all directory and file paths.
+        Every directory is listed before its files and subdirectories.
 
         :return: A list of directory and file paths within the template
                  directory.
         :rtype: list
         """
+        return [self.index.get_path(entry) for entry in self.index.entries]
 
-        all_paths = []
-        for dirpath, _, filenames in os.walk(self.path):
-            all_paths.append(dirpath)
-            for filename in filenames:
-                full_file_path = os.path.join(dirpath, filename)
-                all_paths.append(full_file_path)
+    def get_file_hash(self, template_name):
+        """
+        Get the hash of a template file.
 
-        return all_paths
+        :param template_name: The path of the file relative to the template
+            directory, with "/" separators.
+        :type template_name: str
+        :return: The hex digest of the file content.
+        :rtype: str
+        """
+        return self.index.get(template_name).hash
 
     @property
     def file_name(self):
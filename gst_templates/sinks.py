@@ -0,0 +1,342 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import contextlib
+import errno
+import io
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+import time
+import zipfile
+
+from gst_templates.common import files as file_utils
+
+
+# The size of the write buffer of files written to disk
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Archive members are spooled in memory up to this size, then on disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Errors of hard links falling back to a copy: another file system, too many
+# links or a file system without hard links
+_LINK_UNSUPPORTED = frozenset((errno.EXDEV, errno.EMLINK, errno.EPERM))
+
+
+class AbstractSink(metaclass=abc.ABCMeta):
+    """
+    The output of a rendered project.
+
+    All paths are relative to the root of the project and use "/"
+    separators.
+    """
+
+    # Whether files may be written concurrently from several processes
+    parallel_safe = False
+
+    @abc.abstractmethod
+    def make_dir(self, path):
+        """
+        Create a directory and its missing parents.
+
+        :param path: The path of the directory.
+        :type path: str
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def open_file(self, path, mode=0o644):
+        """
+        Open a file for writing.
+
+        The file is complete once the returned context manager exits.
+
+        :param path: The path of the file.
+        :type path: str
+        :param mode: The permission bits of the file.
+        :type mode: int
+        :return: A context manager yielding a binary file object.
+        """
+        raise NotImplementedError()
+
+    def copy_file(self, source_path, path):
+        """
+        Copy a file with its permission bits.
+
+        :param source_path: The path of the file on disk.
+        :type source_path: str
+        :param path: The path of the copy.
+        :type path: str
+        """
+        with open(source_path, "rb") as src:
+            mode = stat.S_IMODE(os.fstat(src.fileno()).st_mode)
+            with self.open_file(path, mode) as dst:
+                shutil.copyfileobj(src, dst)
+
+    def link_file(self, source_path, path):
+        """
+        Link a file into the output, or copy it if it can not be linked.
+
+        :param source_path: The path of the file on disk.
+        :type source_path: str
+        :param path: The path of the link.
+        :type path: str
+        """
+        self.copy_file(source_path, path)
+
+    def write_bytes(self, path, data, mode=0o644):
+        """
+        Write a file with the given content.
+
+        :param path: The path of the file.
+        :type path: str
+        :param data: The content of the file.
+        :type data: bytes
+        :param mode: The permission bits of the file.
+        :type mode: int
+        """
+        with self.open_file(path, mode) as fp:
+            fp.write(data)
+
+    def sync(self, dirs, files):
+        """
+        Flush written directories and files to stable storage.
+
+        :param dirs: The paths of the directories.
+        :type dirs: list of str
+        :param files: The paths of the files.
+        :type files: list of str
+        """
+        pass
+
+    def close(self):
+        """
+        Finish the output, like writing the end of an archive.
+        """
+        pass
+
+
+class DirectorySink(AbstractSink):
+    """Writes the project into a directory, like a git working tree."""
+
+    parallel_safe = True
+
+    def __init__(self, root_path, fsync=False):
+        super().__init__()
+        self._root_path = root_path
+        self._fsync = fsync
+
+    @property
+    def root_path(self):
+        return self._root_path
+
+    def get_path(self, path):
+        """
+        Get the path on disk of a project path.
+
+        :param path: The path relative to the project root.
+        :type path: str
+        :return: The path on disk.
+        :rtype: str
+        """
+        return os.path.join(self._root_path, *path.split("/"))
+
+    def make_dir(self, path):
+        os.makedirs(self.get_path(path), exist_ok=True)
+
+    @contextlib.contextmanager
+    def open_file(self, path, mode=0o644):
+        target_path = self.get_path(path)
+        with open(target_path, "wb", buffering=WRITE_BUFFER_SIZE) as fp:
+            yield fp
+        os.chmod(target_path, mode)
+
+    def copy_file(self, source_path, path):
+        file_utils.copy_file(source_path, self.get_path(path))
+
+    def link_file(self, source_path, path):
+        target_path = self.get_path(path)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(target_path)
+        try:
+            os.link(source_path, target_path)
+        except OSError as e:
+            if e.errno not in _LINK_UNSUPPORTED:
+                raise
+            file_utils.copy_file(source_path, target_path)
+
+    def sync(self, dirs, files):
+        """
+        Flush written directories and files to disk if fsync is enabled.
+
+        Files are synced in one batch once everything is written, which is
+        much cheaper than syncing every file right after writing it.
+        Directories are synced after their files, so new entries are
+        durable too.
+        """
+        if not self._fsync:
+            return
+
+        for path in files:
+            fd = os.open(self.get_path(path), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        for path in reversed(dirs):
+            fd = os.open(self.get_path(path), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+class TarSink(AbstractSink):
+    """
+    Streams the project as a tarball.
+
+    The archive is written in stream mode, so the output does not have to be
+    seekable and may be a pipe like the standard output.
+    """
+
+    def __init__(self, fileobj, compression="gz"):
+        super().__init__()
+        self._tar = tarfile.open(fileobj=fileobj, mode=f"w|{compression}")
+        self._mtime = time.time()
+
+    def _get_info(self, path, mode, type_=tarfile.REGTYPE):
+        info = tarfile.TarInfo(path)
+        info.type = type_
+        info.mode = mode
+        info.mtime = self._mtime
+        return info
+
+    def make_dir(self, path):
+        if path:
+            self._tar.addfile(self._get_info(path, 0o755, tarfile.DIRTYPE))
+
+    @contextlib.contextmanager
+    def open_file(self, path, mode=0o644):
+        # The size of a member precedes its content, so the content is
+        # spooled first
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as fp:
+            yield fp
+            info = self._get_info(path, mode)
+            info.size = fp.tell()
+            fp.seek(0)
+            self._tar.addfile(info, fp)
+
+    def copy_file(self, source_path, path):
+        with open(source_path, "rb") as fp:
+            file_stat = os.fstat(fp.fileno())
+            info = self._get_info(path, stat.S_IMODE(file_stat.st_mode))
+            info.size = file_stat.st_size
+            self._tar.addfile(info, fp)
+
+    def close(self):
+        self._tar.close()
+
+
+class ZipSink(AbstractSink):
+    """Streams the project as a zip archive."""
+
+    def __init__(self, fileobj):
+        super().__init__()
+        self._zip = zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+        self._date_time = time.localtime()[:6]
+
+    def _get_info(self, path, mode):
+        info = zipfile.ZipInfo(path, self._date_time)
+        info.external_attr = (mode & 0xFFFF) << 16
+        if not path.endswith("/"):
+            info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    def make_dir(self, path):
+        if path:
+            self._zip.writestr(self._get_info(f"{path}/", stat.S_IFDIR | 0o755), b"")
+
+    @contextlib.contextmanager
+    def open_file(self, path, mode=0o644):
+        with self._zip.open(
+            self._get_info(path, stat.S_IFREG | mode), "w", force_zip64=True
+        ) as fp:
+            yield fp
+
+    def close(self):
+        self._zip.close()
+
+
+class _MemoryFile(io.BytesIO):
+    def __init__(self, on_close):
+        super().__init__()
+        self._on_close = on_close
+
+    def close(self):
+        if not self.closed:
+            self._on_close(self.getvalue())
+        super().close()
+
+
+class MemorySink(AbstractSink):
+    """Keeps the project in memory, mostly for tests."""
+
+    def __init__(self):
+        super().__init__()
+        self._dirs = set()
+        self._files = {}
+        self._modes = {}
+
+    @property
+    def dirs(self):
+        return self._dirs
+
+    @property
+    def files(self):
+        """
+        The content of written files.
+
+        :return: A dict mapping paths to file contents.
+        :rtype: dict
+        """
+        return self._files
+
+    @property
+    def modes(self):
+        return self._modes
+
+    def make_dir(self, path):
+        self._dirs.add(path)
+
+    @contextlib.contextmanager
+    def open_file(self, path, mode=0o644):
+        def store(data):
+            self._files[path] = data
+            self._modes[path] = mode
+
+        with _MemoryFile(store) as fp:
+            yield fp
+
+
+SINKS = {
+    "tar": lambda fileobj: TarSink(fileobj, compression=""),
+    "tgz": lambda fileobj: TarSink(fileobj, compression="gz"),
+    "zip": ZipSink,
+}
@@ -0,0 +1,232 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""End-to-end and per-phase project generation times on synthetic templates.
+
+Usage::
+
+    python -m gst_templates.tests.benchmarks.bench_generate \
+        [--scenario small] [--rounds 3] [--jobs 1] \
+        [--output results.json] [--baseline previous.json] [--threshold 0.2]
+
+Every round generates a project the same way `genesis-create-project` does,
+in a fresh process with empty caches, and records the time of each phase:
+
+- `walk`: scanning the template directory into the template index
+- `path_render`: rendering the target paths
+- `file_render`: rendering and writing the files
+- `git`: creating the repository, committing the settings, the manifest
+  and the rendered files
+
+The best time of every phase over the rounds and the peak RSS are reported
+and optionally saved as JSON. Given a baseline saved by a previous run,
+phases slower than the baseline by more than the threshold are reported as
+regressions and the exit code is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from gst_templates.tests.benchmarks import synthetic
+
+
+PHASES = ("walk", "path_render", "file_render", "git", "total")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def generate(settings_path, target_dir, cache_dir, jobs=1):
+    """
+    Generate a project and measure every phase.
+
+    :return: A dict mapping phase names to wall times in seconds.
+    :rtype: dict
+    """
+    start = time.perf_counter()
+
+    # Imports are part of the end-to-end time of a new process
+    from gst_templates import profiles
+    from gst_templates import renders
+    from gst_templates import repositories
+    from gst_templates import settings
+
+    timings = {}
+    phase_start = time.perf_counter()
+    template_setting = settings.TemplateSetting(settings_path)
+    template_setting.build_index()
+    timings["walk"] = time.perf_counter() - phase_start
+
+    repository = repositories.GitRepository(target_dir)
+    profiler = profiles.Profiler()
+    template_render = renders.JinjaTemplateRender(
+        template_setting,
+        repository,
+        cache_dir=cache_dir,
+        jobs=jobs,
+        profiler=profiler,
+    )
+
+    phase_start = time.perf_counter()
+    repository.initialize_repository()
+    template_render.initialize_project_settings(interactive=False)
+    git_time = time.perf_counter() - phase_start
+
+    # The target paths are rendered once, by the render itself, which
+    # times them apart from the files
+    rendered_files = template_render.render_template()
+    for phase in profiler.phases:
+        if phase.name in ("path_render", "file_render"):
+            timings[phase.name] = phase.wall
+
+    phase_start = time.perf_counter()
+    template_render.save_manifest(rendered_files)
+    template_render.commit_project()
+    timings["git"] = git_time + time.perf_counter() - phase_start
+
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def run_round(settings_path, target_dir, cache_dir, jobs):
+    os.environ.update(GIT_ENV)
+    result = generate(settings_path, target_dir, cache_dir, jobs)
+    # ru_maxrss is in kilobytes on Linux
+    result["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps(result))
+
+
+def run_scenario(name, rounds, jobs):
+    scenario = synthetic.SCENARIOS[name]
+    results = []
+    with tempfile.TemporaryDirectory() as path:
+        settings_path = synthetic.make_template(path, scenario)
+        for index in range(rounds):
+            target_dir = os.path.join(path, f"target_{index}")
+            # Every round starts without an index nor a bytecode cache
+            index_path = os.path.splitext(settings_path)[0] + ".index.json"
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    __spec__.name,
+                    "--round",
+                    settings_path,
+                    target_dir,
+                    os.path.join(path, f"cache_{index}"),
+                    str(jobs),
+                ],
+                check=True,
+                stdout=subprocess.PIPE,
+            ).stdout
+            results.append(json.loads(output))
+
+    return {
+        "scenario": scenario._asdict(),
+        "rounds": rounds,
+        "jobs": jobs,
+        "time": {phase: min(r[phase] for r in results) for phase in PHASES},
+        "peak_rss_kb": max(r["peak_rss_kb"] for r in results),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    :return: A list of (scenario, phase, baseline, current) tuples of the
+        phases slower than the baseline by more than `threshold`.
+    :rtype: list
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        for phase in PHASES:
+            if result["time"][phase] > previous["time"][phase] * (1 + threshold):
+                regressions.append(
+                    (name, phase, previous["time"][phase], result["time"][phase])
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(synthetic.SCENARIOS),
+        help="The scenarios to run, all but 'large' by default.",
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--output", help="The file to save the results to.")
+    parser.add_argument("--baseline", help="The results of a previous run.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {},
+    }
+    for name in args.scenario or ("small", "medium"):
+        result = run_scenario(name, args.rounds, args.jobs)
+        results["scenarios"][name] = result
+        print(
+            f"{name}: "
+            + ", ".join(
+                f"{phase} {result['time'][phase] * 1000:.1f} ms" for phase in PHASES
+            )
+            + f", peak RSS {result['peak_rss_kb'] / 1024:.1f} MB"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+        regressions = compare(results, baseline, args.threshold)
+        for name, phase, previous, current in regressions:
+            print(
+                f"REGRESSION {name}/{phase}:"
+                f" {previous * 1000:.1f} ms -> {current * 1000:.1f} ms"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 6 and sys.argv[1] == "--round":
+        run_round(*sys.argv[2:5], int(sys.argv[5]))
+    else:
+        main()
@@ -0,0 +1,95 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Import times of the commands.
+
+Usage::
+
+    python -m gst_templates.tests.benchmarks.bench_import [rounds]
+
+`--help` of every command is run with `python -X importtime` and the self
+import times of the modules of the package and of all modules are reported,
+the best of `rounds`.
+"""
+
+import subprocess
+import sys
+
+
+COMMANDS = (
+    "gst_templates.cmd.compile_template",
+    "gst_templates.cmd.create_project",
+    "gst_templates.cmd.create_projects",
+    "gst_templates.cmd.templates_server",
+    "gst_templates.cmd.update_project",
+)
+
+
+def get_import_times(command):
+    """
+    Run `--help` of a command and collect the import time of every module.
+
+    :return: A dict mapping module names to their self import time in
+        microseconds.
+    :rtype: dict
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys; import {command} as cmd;"
+            f" sys.argv = ['cmd', '--help']; cmd.main()",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = int(self_time)
+    return import_times
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for command in COMMANDS:
+        package_times = []
+        total_times = []
+        for _ in range(rounds):
+            import_times = get_import_times(command)
+            package_times.append(
+                sum(
+                    import_time
+                    for name, import_time in import_times.items()
+                    if name.split(".")[0] == "gst_templates"
+                )
+            )
+            total_times.append(sum(import_times.values()))
+        print(
+            f"{command}: package {min(package_times) / 1000:.1f} ms,"
+            f" total {min(total_times) / 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Peak memory of rendering a very large file.
+
+Usage::
+
+    python -m gst_templates.tests.benchmarks.bench_memory [size_mb]
+
+A synthetic template producing `size_mb` megabytes of output is rendered
+twice, each time in a fresh process: once by materializing the whole output
+with `Template.render()` and once through `JinjaTemplateRender`, which
+streams the output to disk. The peak RSS of both processes is reported.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import jinja2
+
+from gst_templates import renders
+from gst_templates import repositories
+from gst_templates import settings
+
+
+ROW = "INSERT INTO seeds VALUES ({{ i }}, '{{ project.name }}', '{{ '%064d' % i }}');\n"
+
+# The approximate size of one rendered row in bytes
+ROW_SIZE = 110
+
+
+def make_template(path, size_mb):
+    template_path = os.path.join(path, "template")
+    os.makedirs(template_path)
+    rows = size_mb * 1024 * 1024 // ROW_SIZE
+    with open(os.path.join(template_path, "seeds.sql"), "w") as fp:
+        fp.write("{%% for i in range(%d) %%}%s{%% endfor %%}" % (rows, ROW))
+
+    settings_path = os.path.join(path, "bench.settings.json")
+    with open(settings_path, "w") as fp:
+        json.dump(
+            {
+                "project": {"name": "Bench"},
+                "template_info": {
+                    "name": "bench",
+                    "version": "1.0.0",
+                    "path": "./template",
+                },
+            },
+            fp,
+        )
+    return settings_path
+
+
+def run(mode, settings_path, target_dir):
+    template_setting = settings.TemplateSetting(settings_path)
+    start = time.perf_counter()
+    if mode == "render":
+        source_path = os.path.join(template_setting.path, "seeds.sql")
+        with open(source_path) as fp1:
+            with open(os.path.join(target_dir, "seeds.sql"), "w") as fp2:
+                fp2.write(
+                    jinja2.Template(fp1.read()).render(**template_setting.settings_vars)
+                )
+    else:
+        renders.JinjaTemplateRender(
+            template_setting,
+            repositories.GitRepository(target_dir),
+            cache_dir=os.path.join(target_dir, ".cache"),
+        ).render_template()
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(os.path.join(target_dir, "seeds.sql"))
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"time": elapsed, "size": size, "peak_rss_kb": peak_rss}))
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    with tempfile.TemporaryDirectory() as path:
+        settings_path = make_template(path, size_mb)
+        for mode in ("render", "stream"):
+            target_dir = os.path.join(path, mode)
+            os.makedirs(target_dir)
+            output = subprocess.run(
+                [sys.executable, "-m", __spec__.name, mode, settings_path, target_dir],
+                check=True,
+                stdout=subprocess.PIPE,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{mode}: {result['size'] / 1024 / 1024:.0f} MB"
+                f" in {result['time']:.2f} s,"
+                f" peak RSS {result['peak_rss_kb'] / 1024:.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        run(*sys.argv[1:])
+    else:
+        main()
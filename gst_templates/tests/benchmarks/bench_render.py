@@ -0,0 +1,79 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cold and warm render times of a template.
+
+Usage::
+
+    python -m gst_templates.tests.benchmarks.bench_render \
+        [path/to/template.settings.json] [rounds]
+
+The cold run starts with an empty bytecode cache, so every file is compiled.
+The warm runs build a new renderer on top of the populated cache, the same
+way a new `genesis-create-project` process does.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from gst_templates import renders
+from gst_templates import repositories
+from gst_templates import settings
+
+
+DEFAULT_SETTINGS = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "..",
+    "templates",
+    "py_element.settings.json",
+)
+
+
+def render_once(settings_path, cache_dir):
+    template_setting = settings.TemplateSetting(settings_path)
+    with tempfile.TemporaryDirectory() as target_dir:
+        repository = repositories.GitRepository(target_dir)
+        start = time.perf_counter()
+        renders.JinjaTemplateRender(
+            template_setting,
+            repository,
+            cache_dir=cache_dir,
+        ).render_template()
+        return time.perf_counter() - start
+
+
+def main():
+    settings_path = os.path.abspath(
+        sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SETTINGS
+    )
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = render_once(settings_path, cache_dir)
+        warm = [render_once(settings_path, cache_dir) for _ in range(rounds)]
+
+    print(f"template: {settings_path}")
+    print(f"cold: {cold * 1000:.2f} ms")
+    print(f"warm: {min(warm) * 1000:.2f} ms (best of {rounds})")
+    print(f"speedup: {cold / min(warm):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Synthetic templates of configurable size for benchmarks."""
+
+import collections
+import json
+import os
+
+
+Scenario = collections.namedtuple(
+    "Scenario",
+    (
+        # The number of regular template files
+        "files",
+        # The number of templated directories
+        "dirs",
+        # The nesting depth of templated directories
+        "depth",
+        # The number of large files and their rendered size in megabytes
+        "large_files",
+        "large_file_mb",
+        # The number of items of the loops of every regular file
+        "loop_items",
+    ),
+)
+
+
+SCENARIOS = {
+    "small": Scenario(
+        files=50, dirs=5, depth=2, large_files=0, large_file_mb=0, loop_items=10
+    ),
+    "medium": Scenario(
+        files=500, dirs=20, depth=3, large_files=1, large_file_mb=10, loop_items=50
+    ),
+    "large": Scenario(
+        files=5000, dirs=100, depth=4, large_files=4, large_file_mb=50, loop_items=100
+    ),
+}
+
+
+MACROS = """\
+{% macro field(name, type) -%}
+    {{ name }}: {{ type }} = None  # {{ project.name }}
+{%- endmacro %}
+{% macro method(name) -%}
+    def {{ name }}(self):
+        return "{{ project.package_name }}.{{ name }}"
+{%- endmacro %}
+"""
+
+REGULAR_FILE = """\
+{%% import "macros.j2" as m with context %%}
+# {{ project.name }} {{ project.version }} - file %(index)d
+{%% for i in range(%(loop_items)d) %%}
+class {{ project.package_name | title }}Model{{ i }}:
+{%% for j in range(5) %%}
+    {{ m.field("field_" ~ j, "int" if j is even else "str") }}
+{%% endfor %%}
+    {{ m.method("get_" ~ i) }}
+{%% if i is divisibleby 3 %%}
+    # {{ project.description | upper }}
+{%% endif %%}
+{%% endfor %%}
+"""
+
+LARGE_FILE_ROW = (
+    "INSERT INTO rows VALUES ({{ i }}, '{{ project.package_name }}',"
+    " '{{ '%064d' % i }}');\n"
+)
+
+# The approximate size of one rendered large file row in bytes
+LARGE_FILE_ROW_SIZE = 100
+
+PLAIN_FILE = "Plain file %d without any markup.\n" * 20
+
+
+def _get_dirs(dirs, depth):
+    """
+    Build the names of templated directories.
+
+    Directories are spread across `dirs // depth` chains of `depth` nested
+    directories, so both wide and deep trees are exercised.
+    """
+    names = []
+    chains = max(dirs // max(depth, 1), 1)
+    for chain in range(chains):
+        parent = ""
+        for level in range(depth):
+            if len(names) == dirs:
+                return names
+            parent = os.path.join(
+                parent, "{{ project.package_name }}_%d_%d" % (chain, level)
+            )
+            names.append(parent)
+    return names
+
+
+def make_template(path, scenario):
+    """
+    Write a synthetic template and its settings file.
+
+    :param path: The directory to write the template to.
+    :type path: str
+    :param scenario: The shape of the template.
+    :type scenario: Scenario
+    :return: The path of the settings file.
+    :rtype: str
+    """
+    template_path = os.path.join(path, "template")
+    os.makedirs(template_path)
+    dirs = [""] + _get_dirs(scenario.dirs, scenario.depth)
+    for name in dirs:
+        os.makedirs(os.path.join(template_path, name), exist_ok=True)
+
+    with open(os.path.join(template_path, "macros.j2"), "w") as fp:
+        fp.write(MACROS)
+
+    for index in range(scenario.files):
+        directory = dirs[index % len(dirs)]
+        # Every tenth file is copied without rendering
+        if index % 10 == 9:
+            name = "plain_%d.txt" % index
+            content = PLAIN_FILE % ((index,) * 20)
+        else:
+            name = "{{ project.package_name }}_module_%d.py" % index
+            content = REGULAR_FILE % {
+                "index": index,
+                "loop_items": scenario.loop_items,
+            }
+        with open(os.path.join(template_path, directory, name), "w") as fp:
+            fp.write(content)
+
+    rows = scenario.large_file_mb * 1024 * 1024 // LARGE_FILE_ROW_SIZE
+    for index in range(scenario.large_files):
+        name = "large_%d.sql" % index
+        with open(os.path.join(template_path, name), "w") as fp:
+            fp.write(
+                "{%% for i in range(%d) %%}%s{%% endfor %%}" % (rows, LARGE_FILE_ROW)
+            )
+
+    settings_path = os.path.join(path, "synthetic.settings.json")
+    with open(settings_path, "w") as fp:
+        json.dump(
+            {
+                "project": {
+                    "name": "Synthetic project",
+                    "package_name": "synthetic",
+                    "version": "1.0.0",
+                    "description": "A synthetic project for benchmarks",
+                },
+                "template_info": {
+                    "name": "synthetic",
+                    "version": "1.0.0",
+                    "path": "./template",
+                },
+            },
+            fp,
+        )
+    return settings_path
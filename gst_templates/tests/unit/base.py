@@ -0,0 +1,85 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+class TemplateTestCase(unittest.TestCase):
+    """Test case with a template tree in a temporary directory.
+
+    The template lives in `template` next to `tpl.settings.json`, the
+    render cache goes to `cache`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self._template_path = os.path.join(self._tmp.name, "template")
+        self._settings_path = os.path.join(self._tmp.name, "tpl.settings.json")
+        self._cache_dir = os.path.join(self._tmp.name, "cache")
+
+    def _write_template_files(self, files):
+        """Write files to the template.
+
+        :param files: the content by the template relative path, `bytes`
+            are written as is and `None` removes the file
+        :type files: dict
+        """
+        for name, content in files.items():
+            path = os.path.join(self._template_path, name)
+            if content is None:
+                os.remove(path)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if isinstance(content, bytes):
+                with open(path, "wb") as fp:
+                    fp.write(content)
+                continue
+            with open(path, "w", encoding="utf-8") as fp:
+                fp.write(content)
+
+    def _write_settings(self, values, version="1.0.0", **template_info):
+        """Write the template settings with the template info.
+
+        :param values: the settings of the template
+        :type values: dict
+        :param version: the version of the template
+        :type version: str
+        :param template_info: other fields of the template info
+        """
+        values = dict(
+            values,
+            template_info=dict(
+                template_info,
+                name="tpl",
+                version=version,
+                path="./template",
+            ),
+        )
+        with open(self._settings_path, "w", encoding="utf-8") as fp:
+            json.dump(values, fp)
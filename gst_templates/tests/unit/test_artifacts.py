@@ -0,0 +1,108 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+from unittest import mock
+
+import jinja2
+
+from gst_templates import artifacts
+from gst_templates import renders
+from gst_templates import settings
+from gst_templates import sinks
+from gst_templates.tests.unit import base
+
+
+class TemplateArtifactTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_template_files(
+            {
+                "{{ project.name }}/README.md": "# {{ project.name }}\n",
+                "static.txt": "plain\n",
+            }
+        )
+        self._write_settings({"project": {"name": "my_project"}})
+
+    def _compile(self):
+        template_setting = settings.TemplateSetting(self._settings_path)
+        return artifacts.TemplateArtifact.compile(
+            template_setting,
+            renders.build_environment(template_setting, self._cache_dir),
+            template_setting.artifact_path,
+        )
+
+    def _render(self):
+        sink = sinks.MemorySink()
+        renders.JinjaTemplateRender(
+            settings.TemplateSetting(self._settings_path),
+            None,
+            cache_dir=self._cache_dir,
+            sink=sink,
+        ).render_template()
+        return sink
+
+    def test_render_from_artifact(self):
+        self._compile()
+
+        with mock.patch.object(
+            jinja2.FileSystemLoader, "get_source"
+        ) as get_source, mock.patch.object(
+            jinja2.Environment, "from_string"
+        ) as from_string:
+            sink = self._render()
+
+        get_source.assert_not_called()
+        from_string.assert_not_called()
+        self.assertEqual(
+            {
+                "my_project/README.md": b"# my_project\n",
+                "static.txt": b"plain\n",
+            },
+            sink.files,
+        )
+
+    def test_outdated_artifact_is_ignored(self):
+        self._compile()
+        self._write_template_files(
+            {"{{ project.name }}/README.md": "# {{ project.name }}!\n"}
+        )
+
+        template_setting = settings.TemplateSetting(self._settings_path)
+
+        self.assertIsNone(template_setting.artifact)
+        self.assertEqual(
+            b"# my_project!\n",
+            self._render().files["my_project/README.md"],
+        )
+
+    def test_syntax_errors(self):
+        self._write_template_files(
+            {
+                "broken.txt": "{% if project.name %}\n",
+                "{{ project.name }/other.txt": "{{ x }}\n",
+            }
+        )
+
+        with self.assertRaises(artifacts.TemplateCompileError) as ctx:
+            self._compile()
+
+        self.assertEqual(
+            ["broken.txt", "{{ project.name }"],
+            sorted(os.path.basename(name) for name, _, _ in ctx.exception.errors),
+        )
+        template_setting = settings.TemplateSetting(self._settings_path)
+        self.assertFalse(os.path.exists(template_setting.artifact_path))
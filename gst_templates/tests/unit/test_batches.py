@@ -0,0 +1,85 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+from unittest import mock
+
+import git
+
+from gst_templates import batches
+from gst_templates import settings
+from gst_templates.tests.unit import base
+
+
+class BatchGeneratorTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(os.environ, base.GIT_ENV)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self._write_template_files(
+            {"{{ project.name }}.txt": "{{ project.name }} by {{ author.name }}\n"}
+        )
+        self._write_settings(
+            {"project": {"name": "default"}, "author": {"name": "Genesis"}}
+        )
+
+    def _write_batch_file(self, name, content):
+        path = os.path.join(self._tmp.name, name)
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(content)
+        return path
+
+    def test_load_yaml_batch_file(self):
+        path = self._write_batch_file(
+            "batch.yaml",
+            "- target_directory: a\n  settings:\n    project:\n      name: a\n",
+        )
+
+        self.assertEqual(
+            [{"target_directory": "a", "settings": {"project": {"name": "a"}}}],
+            batches.load_batch_file(path),
+        )
+
+    def test_generate(self):
+        entries = [
+            {
+                "target_directory": os.path.join(self._tmp.name, name),
+                "settings": {"project": {"name": name, "unknown": "ignored"}},
+            }
+            for name in ("first", "second", "third")
+        ]
+        path = self._write_batch_file(
+            "batch.jsonl",
+            "\n".join(json.dumps(entry) for entry in entries),
+        )
+
+        results = batches.BatchGenerator(
+            settings.TemplateSetting(self._settings_path),
+            cache_dir=self._cache_dir,
+            jobs=2,
+        ).generate(batches.load_batch_file(path))
+
+        self.assertEqual([None, None, None], [result.error for result in results])
+        for entry in entries:
+            name = entry["settings"]["project"]["name"]
+            with open(os.path.join(entry["target_directory"], f"{name}.txt")) as fp:
+                self.assertEqual(f"{name} by Genesis\n", fp.read())
+            repo = git.Repo(entry["target_directory"])
+            self.assertFalse(repo.is_dirty(untracked_files=True))
+            self.assertEqual(2, len(list(repo.iter_commits())))
@@ -0,0 +1,157 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+from unittest import mock
+
+from gst_templates import caches
+from gst_templates import renders
+from gst_templates import repositories
+from gst_templates import settings
+from gst_templates import sinks
+from gst_templates.tests.unit import base
+
+
+TEMPLATE_FILES = {
+    "README.md": "# {{ project.name }} {{ functions.now().year }}\n",
+    "bin/run.sh": "#!/bin/sh\necho {{ project.name }}\n",
+    "plain.txt": "plain\n",
+}
+
+
+class RenderCacheTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_template_files(TEMPLATE_FILES)
+        os.chmod(os.path.join(self._template_path, "bin", "run.sh"), 0o755)
+        self._write_settings({"project": {"name": "Test project"}})
+
+        patcher = mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1735689600"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _render(self, target_name, render_cache, name="Test project", sink=None):
+        template_setting = settings.TemplateSetting(self._settings_path)
+        template_setting.update({"project": {"name": name}})
+        target_path = os.path.join(self._tmp.name, target_name)
+        template_render = renders.JinjaTemplateRender(
+            template_setting,
+            repositories.GitRepository(target_path),
+            cache_dir=self._cache_dir,
+            sink=sink,
+            render_cache=render_cache,
+        )
+        template_render.render_template()
+        return target_path
+
+    def _read(self, *path):
+        with open(os.path.join(*path), encoding="utf-8") as fp:
+            return fp.read()
+
+    def test_hit(self):
+        render_cache = caches.RenderCache(self._cache_dir)
+        self._render("first", render_cache)
+
+        with mock.patch.object(
+            renders.JinjaTemplateRender,
+            "_render_files",
+            side_effect=AssertionError("Nothing should be rendered"),
+        ):
+            target_path = self._render("second", render_cache)
+            sink = sinks.MemorySink()
+            self._render("memory", render_cache, sink=sink)
+
+        self.assertEqual("# Test project 2025\n", self._read(target_path, "README.md"))
+        self.assertEqual("plain\n", self._read(target_path, "plain.txt"))
+        self.assertEqual(
+            0o755, os.stat(os.path.join(target_path, "bin", "run.sh")).st_mode & 0o777
+        )
+        self.assertEqual(b"# Test project 2025\n", sink.files["README.md"])
+        self.assertEqual(0o755, sink.modes["bin/run.sh"])
+
+    def test_changed_inputs(self):
+        render_cache = caches.RenderCache(self._cache_dir)
+        self._render("first", render_cache)
+
+        target_path = self._render("second", render_cache, name="Other")
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1"}):
+            dated_path = self._render("third", render_cache)
+
+        self.assertEqual("# Other 2025\n", self._read(target_path, "README.md"))
+        self.assertEqual("# Test project 1970\n", self._read(dated_path, "README.md"))
+
+    def test_hardlink(self):
+        render_cache = caches.RenderCache(self._cache_dir, hardlink=True)
+        first_path = self._render("first", render_cache)
+        second_path = self._render("second", render_cache)
+
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(first_path, "README.md"),
+                os.path.join(second_path, "README.md"),
+            )
+        )
+        self.assertFalse(
+            os.path.samefile(
+                os.path.join(first_path, "plain.txt"),
+                os.path.join(second_path, "plain.txt"),
+            )
+        )
+
+    def test_entry_evicted_before_materialize(self):
+        render_cache = caches.RenderCache(self._cache_dir)
+        self._render("first", render_cache)
+        materialize = render_cache.materialize
+
+        def evict_and_materialize(cache_path, sink, path):
+            os.unlink(cache_path)
+            materialize(cache_path, sink, path)
+
+        with mock.patch.object(
+            render_cache, "materialize", side_effect=evict_and_materialize
+        ):
+            target_path = self._render("second", render_cache)
+
+        self.assertEqual("# Test project 2025\n", self._read(target_path, "README.md"))
+        self.assertEqual(
+            0o755, os.stat(os.path.join(target_path, "bin", "run.sh")).st_mode & 0o777
+        )
+
+    def test_unpinned_timestamp_is_not_cached(self):
+        render_cache = caches.RenderCache(self._cache_dir)
+        with mock.patch.dict(os.environ):
+            del os.environ["SOURCE_DATE_EPOCH"]
+            target_path = self._render("first", render_cache)
+
+        self.assertTrue(os.path.isfile(os.path.join(target_path, "README.md")))
+        self.assertFalse(os.path.exists(render_cache.root_path))
+
+    def test_prune(self):
+        render_cache = caches.RenderCache(self._cache_dir, max_size=250)
+        for i, key in enumerate(("aa1", "bb2", "aa3")):
+            path = os.path.join(self._tmp.name, key)
+            with open(path, "wb") as fp:
+                fp.write(b"x" * 100)
+            cache_path = render_cache.put(key, path)
+            os.utime(cache_path, ns=(i, i))
+        # A hit makes the oldest entry the most recently used one
+        render_cache.get("aa1")
+
+        render_cache.prune()
+
+        self.assertIsNotNone(render_cache.get("aa1"))
+        self.assertIsNone(render_cache.get("bb2"))
+        self.assertIsNotNone(render_cache.get("aa3"))
@@ -0,0 +1,114 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import os
+import pickle
+import unittest
+from unittest import mock
+
+import jinja2
+
+from gst_templates import contexts
+from gst_templates import jinja_functions
+from gst_templates import settings
+from gst_templates.tests.unit import base
+
+
+class RenderContextTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_settings({"project": {"name": "my_project", "tags": ["a", "b"]}})
+
+    def test_context_is_frozen(self):
+        template_setting = settings.TemplateSetting(self._settings_path)
+        context = template_setting.get_render_context()
+
+        self.assertRaises(TypeError, context["project"].__setitem__, "name", "x")
+        self.assertRaises(TypeError, context["project"]["tags"].append, "c")
+        # Lists render the same as in the settings
+        self.assertEqual(
+            "['a', 'b']",
+            jinja2.Environment().from_string("{{ project.tags }}").render(context),
+        )
+        self.assertEqual(
+            context["project"],
+            pickle.loads(pickle.dumps(context))["project"],
+        )
+
+        # The context does not follow later changes of the settings
+        template_setting.update({"project": {"name": "other"}})
+        self.assertEqual("my_project", context["project"]["name"])
+
+    def test_now_is_pinned(self):
+        timestamp = datetime.datetime(
+            2024, 12, 31, 23, 59, tzinfo=datetime.timezone.utc
+        )
+        context = settings.TemplateSetting(self._settings_path).get_render_context(
+            timestamp
+        )
+        now = context["functions"]["now"]
+
+        self.assertEqual(timestamp, now(datetime.timezone.utc))
+        self.assertEqual(now(), now())
+
+    def test_source_date_epoch(self):
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "86400"}):
+            context = settings.TemplateSetting(self._settings_path).get_render_context()
+
+        self.assertEqual(
+            datetime.datetime(1970, 1, 2, tzinfo=datetime.timezone.utc),
+            context["functions"]["now"](datetime.timezone.utc),
+        )
+
+    def test_memoized_function(self):
+        calls = []
+
+        @jinja_functions.memoize
+        def slow(value):
+            calls.append(value)
+            return value * 2
+
+        with mock.patch.dict(jinja_functions.FUNCTIONS, {"slow": slow}):
+            context = settings.TemplateSetting(self._settings_path).get_render_context()
+
+        function = context["functions"]["slow"]
+        self.assertEqual(
+            [4, 4, ["x", "x"]],
+            [function(2), function(2), function(["x"])],
+        )
+        self.assertEqual([2, ["x"]], calls)
+
+
+class FrozenDictTestCase(unittest.TestCase):
+    def test_freeze(self):
+        frozen = contexts.freeze({"a": {"b": [1, {"c": 2}]}})
+
+        self.assertIsInstance(frozen["a"], contexts.FrozenDict)
+        self.assertIsInstance(frozen["a"]["b"], contexts.FrozenList)
+        self.assertEqual([1, {"c": 2}], frozen["a"]["b"])
+        self.assertEqual(frozen, pickle.loads(pickle.dumps(frozen)))
+        for value, method, args in (
+            (frozen, "update", ({},)),
+            (frozen, "pop", ("a",)),
+            (frozen, "setdefault", ("d", 1)),
+            (frozen, "clear", ()),
+            (frozen["a"]["b"], "append", (3,)),
+            (frozen["a"]["b"], "sort", ()),
+            (frozen["a"]["b"], "__setitem__", (0, 3)),
+            (frozen["a"]["b"], "__iadd__", ([3],)),
+        ):
+            self.assertRaises(TypeError, getattr(value, method), *args)
@@ -0,0 +1,137 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+from concurrent import futures
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from gst_templates import generators
+from gst_templates import settings
+from gst_templates import sinks
+from gst_templates.tests.unit import base
+
+
+TEMPLATE_FILES = {
+    "README.md": "# {{ project.name }} {{ functions.now().year }}\n",
+    "{{ project.package_name }}/__init__.py": "",
+}
+
+TIMESTAMP = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def get_overrides(i):
+    return {"project": {"name": f"Project {i}", "package_name": f"pkg{i}"}}
+
+
+class GenerateTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_template_files(TEMPLATE_FILES)
+        self._write_settings(
+            {"project": {"name": "Test project", "package_name": "test"}}
+        )
+
+        # Generations must not touch the process wide state
+        for target in ("os.chdir", "builtins.input", "builtins.print"):
+            patcher = mock.patch(target, side_effect=AssertionError(target))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _generate(self, i):
+        sink = sinks.MemorySink()
+        rendered_files = generators.generate(
+            self._settings_path,
+            get_overrides(i),
+            sink,
+            cache_dir=self._cache_dir,
+            timestamp=TIMESTAMP,
+        )
+        return rendered_files, sink
+
+    def _assert_generated(self, i, rendered_files, sink):
+        self.assertEqual(
+            {"README.md", os.path.join(f"pkg{i}", "__init__.py")},
+            set(rendered_files),
+        )
+        self.assertEqual(f"# Project {i} 2024\n".encode(), sink.files["README.md"])
+        self.assertEqual(
+            f"Project {i}",
+            json.loads(sink.files["project_settings.json"])["project"]["name"],
+        )
+
+    def test_generate_in_threads(self):
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self._generate, range(16)))
+
+        for i, (rendered_files, sink) in enumerate(results):
+            self._assert_generated(i, rendered_files, sink)
+
+    def test_generate_async(self):
+        async def generate_all():
+            sinks_ = [sinks.MemorySink() for _ in range(4)]
+            results = await asyncio.gather(
+                *(
+                    generators.generate_async(
+                        self._settings_path,
+                        get_overrides(i),
+                        sink,
+                        cache_dir=self._cache_dir,
+                        timestamp=TIMESTAMP,
+                    )
+                    for i, sink in enumerate(sinks_)
+                )
+            )
+            return zip(results, sinks_)
+
+        for i, (rendered_files, sink) in enumerate(asyncio.run(generate_all())):
+            self._assert_generated(i, rendered_files, sink)
+
+
+class InitializeTestCase(unittest.TestCase):
+    def test_prompt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            settings_path = os.path.join(tmp, "tpl.settings.json")
+            with open(settings_path, "w", encoding="utf-8") as fp:
+                json.dump(
+                    {
+                        "project": {"name": "Test project", "package_name": "x"},
+                        "template_info": {
+                            "name": "tpl",
+                            "version": "1.0.0",
+                            "path": "./template",
+                        },
+                    },
+                    fp,
+                )
+            template_setting = settings.TemplateSetting(settings_path)
+
+        self.assertEqual(os.path.join(tmp, "template"), template_setting.path)
+
+        template_setting.initialize(
+            lambda section, name, value: f"{section}.{name}={value}"
+        )
+        self.assertEqual(
+            {
+                "name": "project.name=Test project",
+                "package_name": "project.package_name=x",
+            },
+            template_setting.settings_vars["project"],
+        )
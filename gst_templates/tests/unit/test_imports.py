@@ -0,0 +1,74 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import subprocess
+import sys
+import unittest
+
+from gst_templates.common import imports
+from gst_templates.tests.benchmarks import bench_import
+
+
+# Dependencies only needed once a command does its actual work
+HEAVY_MODULES = frozenset(("git", "jinja2", "yaml"))
+
+
+def get_imported_modules(command):
+    """
+    Run `--help` of a command and collect the modules it imported.
+
+    :return: The names of the modules in `sys.modules` at exit.
+    :rtype: set
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import atexit, json, sys;"
+            " atexit.register(lambda: print(json.dumps(list(sys.modules)),"
+            " file=sys.stderr));"
+            f" import {command} as cmd;"
+            " sys.argv = ['cmd', '--help']; cmd.main()",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return set(json.loads(result.stderr.splitlines()[-1]))
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_help_does_not_import_heavy_modules(self):
+        for command in bench_import.COMMANDS:
+            with self.subTest(command=command):
+                modules = get_imported_modules(command)
+
+                self.assertIn(command, modules)
+                self.assertEqual(set(), HEAVY_MODULES & modules)
+
+
+class LazyModuleTestCase(unittest.TestCase):
+    def test_lazy_import(self):
+        module = imports.LazyModule("json")
+
+        self.assertIsNone(module._module)
+        self.assertEqual("[1]", module.dumps([1]))
+        self.assertIs(sys.modules["json"], module._module)
+
+    def test_lazy_import_of_imported_module(self):
+        self.assertIs(sys.modules["sys"], imports.lazy_import("sys"))
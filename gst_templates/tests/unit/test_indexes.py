@@ -0,0 +1,128 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+from unittest import mock
+
+from gst_templates.common import files as file_utils
+from gst_templates import indexes
+from gst_templates import matchers
+from gst_templates import settings
+from gst_templates.tests.unit import base
+
+
+class TemplateIndexTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._index_path = os.path.join(self._tmp.name, "index.json")
+        self._write_template_files(
+            {
+                "b/z.txt": "{{ z }}",
+                "b/a.txt": "plain",
+                "a.txt": "plain",
+                "c/d/e.txt": "{% if x %}{% endif %}",
+            }
+        )
+
+    def test_build(self):
+        index = indexes.TemplateIndex.build(self._template_path)
+
+        self.assertEqual(
+            ["", "a.txt", "b", "b/a.txt", "b/z.txt", "c", "c/d", "c/d/e.txt"],
+            [entry.name for entry in index.entries],
+        )
+        self.assertEqual(
+            [False, True, True],
+            [
+                index.get(name).needs_render
+                for name in ("b/a.txt", "b/z.txt", "c/d/e.txt")
+            ],
+        )
+        self.assertTrue(index.get("c/d").is_dir)
+        self.assertEqual(
+            os.path.join(self._template_path, "c", "d", "e.txt"),
+            index.get_path(index.get("c/d/e.txt")),
+        )
+
+    def test_load_or_build_reads_only_modified_files(self):
+        index = indexes.TemplateIndex.load_or_build(
+            self._index_path, self._template_path
+        )
+        self._write_template_files({"b/z.txt": "changed"})
+        os.utime(
+            os.path.join(self._template_path, "b", "z.txt"),
+            ns=(1, 1),
+        )
+
+        with mock.patch.object(
+            file_utils, "scan_file", wraps=file_utils.scan_file
+        ) as scan_file:
+            new_index = indexes.TemplateIndex.load_or_build(
+                self._index_path, self._template_path
+            )
+
+        scan_file.assert_called_once_with(
+            os.path.join(self._template_path, "b", "z.txt")
+        )
+        self.assertNotEqual(index.get("b/z.txt").hash, new_index.get("b/z.txt").hash)
+        self.assertFalse(new_index.get("b/z.txt").needs_render)
+        self.assertEqual(
+            new_index.entries,
+            indexes.TemplateIndex.load(self._index_path, self._template_path).entries,
+        )
+
+    def test_rules(self):
+        rules = matchers.TemplateRules(
+            exclude=["c/**"], copy_without_render=["**/z.txt"]
+        )
+
+        with mock.patch.object(
+            file_utils, "scan_file", wraps=file_utils.scan_file
+        ) as scan_file, mock.patch.object(os, "scandir", wraps=os.scandir) as scandir:
+            index = indexes.TemplateIndex.load_or_build(
+                self._index_path, self._template_path, rules
+            )
+
+        self.assertEqual(
+            ["", "a.txt", "b", "b/a.txt", "b/z.txt"],
+            [entry.name for entry in index.entries],
+        )
+        self.assertFalse(index.get("b/z.txt").needs_render)
+        # Excluded directories are neither listed nor read
+        self.assertEqual(3, scan_file.call_count)
+        self.assertEqual(2, scandir.call_count)
+
+        # An index saved with other rules is not used
+        self.assertIsNone(
+            indexes.TemplateIndex.load(self._index_path, self._template_path)
+        )
+
+    def test_settings_build_index_once(self):
+        self._write_settings({"project": {"name": "test"}})
+        template_setting = settings.TemplateSetting(self._settings_path)
+
+        with mock.patch.object(
+            indexes.TemplateIndex,
+            "load_or_build",
+            wraps=indexes.TemplateIndex.load_or_build,
+        ) as load_or_build:
+            index = template_setting.build_index()
+            self.assertIs(index, template_setting.build_index())
+            self.assertIs(index, template_setting.index)
+            self.assertIs(index, template_setting.copy().index)
+
+        load_or_build.assert_called_once()
+        self.assertIsNotNone(index.get("c/d/e.txt"))
@@ -0,0 +1,113 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pickle
+import unittest
+from unittest import mock
+
+import jinja2
+
+from gst_templates import matchers
+from gst_templates import renders
+from gst_templates import repositories
+from gst_templates import settings
+from gst_templates import sinks
+from gst_templates.tests.unit import base
+
+
+class PathMatcherTestCase(unittest.TestCase):
+    def test_match(self):
+        for pattern, matching, not_matching in (
+            ("*.pyc", ["a.pyc"], ["a/b.pyc", "a.py"]),
+            ("**/*.pyc", ["a.pyc", "a/b/c.pyc"], ["a.py"]),
+            ("a/**", ["a", "a/b", "a/b/c"], ["ab", "b/a"]),
+            ("a/**/c", ["a/c", "a/b/c", "a/b/b/c"], ["a/cc", "c"]),
+            ("?.[ch]", ["a.c", "b.h"], ["ab.c", "a.o"]),
+            ("[!a].txt", ["b.txt"], ["a.txt"]),
+            ("{{ x }}/*", ["{{ x }}/a"], ["x/a"]),
+        ):
+            matcher = matchers.PathMatcher([pattern])
+            for name in matching:
+                self.assertTrue(matcher.match(name), (pattern, name))
+            for name in not_matching:
+                self.assertFalse(matcher.match(name), (pattern, name))
+
+    def test_empty(self):
+        self.assertFalse(matchers.PathMatcher([]).match("a"))
+
+
+class ConditionsTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_template_files(
+            {
+                name: "{{ project.name }}\n"
+                for name in (
+                    "README.md",
+                    "images/{{ project.image }}/build.sh",
+                    "docs/a.md",
+                )
+            }
+        )
+        self._write_settings(
+            {"project": {"name": "Test", "image": "", "docs": "yes"}},
+            conditions={
+                "images": "project.image",
+                "docs/**": "project.docs == 'yes'",
+            },
+        )
+
+    def _render(self, settings_values):
+        template_setting = settings.TemplateSetting(self._settings_path)
+        template_setting.update(settings_values)
+        sink = sinks.MemorySink()
+        renders.JinjaTemplateRender(
+            template_setting,
+            repositories.GitRepository(self._tmp.name),
+            cache_dir=self._cache_dir,
+            sink=sink,
+        ).render_template()
+        return sink
+
+    def test_conditions(self):
+        # The empty image name would be an invalid path, but the whole
+        # subtree is skipped
+        sink = self._render({})
+        self.assertEqual({"README.md", "docs/a.md"}, set(sink.files))
+        self.assertEqual({"", "docs"}, sink.dirs)
+
+        sink = self._render({"project": {"image": "base", "docs": "no"}})
+        self.assertEqual({"README.md", "images/base/build.sh"}, set(sink.files))
+
+    def test_conditions_are_compiled_once(self):
+        rules = matchers.TemplateRules(conditions={"docs/**": "docs == 'yes'"})
+        environment = jinja2.Environment()
+
+        with mock.patch.object(
+            environment,
+            "compile_expression",
+            wraps=environment.compile_expression,
+        ) as compile_expression:
+            for docs, disabled in (("yes", False), ("no", True), ("no", True)):
+                self.assertEqual(
+                    disabled,
+                    rules.get_disabled(environment, {"docs": docs}).match("docs/a"),
+                )
+
+        compile_expression.assert_called_once_with("docs == 'yes'")
+        # Compiled expressions stay in the process which compiled them
+        rules = pickle.loads(pickle.dumps(rules))
+        self.assertTrue(rules.get_disabled(environment, {"docs": "no"}).match("docs"))
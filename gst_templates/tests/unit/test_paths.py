@@ -0,0 +1,95 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+from unittest import mock
+
+import jinja2
+
+from gst_templates import paths
+
+
+class PathRenderTestCase(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self._environment = jinja2.Environment()
+
+    def _get_path_render(self, **project):
+        return paths.PathRender(self._environment, {"project": project})
+
+    def test_render_paths(self):
+        path_render = self._get_path_render(name="my_project")
+
+        with mock.patch.object(
+            self._environment,
+            "from_string",
+            wraps=self._environment.from_string,
+        ) as from_string:
+            target_paths = path_render.render_paths(
+                [
+                    "",
+                    "README.md",
+                    "{{ project.name }}",
+                    "{{ project.name }}/{{ project.name }}.conf",
+                    "{{ project.name }}/{{ project.name }}.conf.d",
+                ]
+            )
+
+        self.assertEqual(
+            [
+                "",
+                "README.md",
+                "my_project",
+                "my_project/my_project.conf",
+                "my_project/my_project.conf.d",
+            ],
+            target_paths,
+        )
+        self.assertEqual(
+            [
+                mock.call("{{ project.name }}"),
+                mock.call("{{ project.name }}.conf"),
+                mock.call("{{ project.name }}.conf.d"),
+            ],
+            from_string.call_args_list,
+        )
+
+    def test_newline_in_value(self):
+        path_render = self._get_path_render(name="my\nproject")
+
+        self.assertRaises(
+            paths.InvalidTargetPath,
+            path_render.render_path,
+            "{{ project.name }}/file.txt",
+        )
+
+    def test_empty_segment(self):
+        path_render = self._get_path_render(name="")
+
+        self.assertRaises(
+            paths.InvalidTargetPath,
+            path_render.render_path,
+            "{{ project.name }}/file.txt",
+        )
+
+    def test_collision(self):
+        path_render = self._get_path_render(name="README.md")
+
+        self.assertRaises(
+            paths.InvalidTargetPath,
+            path_render.render_paths,
+            ["README.md", "{{ project.name }}"],
+        )
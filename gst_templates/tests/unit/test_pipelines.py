@@ -0,0 +1,98 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+from unittest import mock
+
+import jinja2
+
+from gst_templates import pipelines
+from gst_templates import sinks
+from gst_templates.tests.unit import base
+
+
+TEMPLATE_FILES = {
+    "a/one.txt": "{% for i in range(n) %}{{ i }}\n{% endfor %}",
+    "a/two.txt": "{{ name }}\n",
+    "plain.txt": "plain\n",
+}
+
+
+class RenderPipelineTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_template_files(TEMPLATE_FILES)
+        self._environment = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(self._template_path),
+            keep_trailing_newline=True,
+        )
+        self._files = [
+            ("a/one.txt", "b/one.txt", True),
+            ("a/two.txt", "b/two.txt", True),
+            ("plain.txt", "plain.txt", False),
+        ]
+
+    def _run(self, sink, **kwargs):
+        pipeline = pipelines.RenderPipeline(
+            self._template_path,
+            self._environment,
+            {"n": 1000, "name": "test"},
+            sink,
+            buffer_items=10,
+            **kwargs,
+        )
+        return list(pipeline.run(["", "b"], self._files))
+
+    def test_run(self):
+        sink = sinks.MemorySink()
+
+        # A queue of one write forces the stages to wait for each other
+        stats = self._run(sink, load_queue_size=1, write_queue_size=1)
+
+        self.assertEqual({"", "b"}, sink.dirs)
+        self.assertEqual(
+            {
+                "b/one.txt": "".join(f"{i}\n" for i in range(1000)).encode(),
+                "b/two.txt": b"test\n",
+                "plain.txt": b"plain\n",
+            },
+            sink.files,
+        )
+        self.assertEqual(
+            ["b/one.txt", "b/two.txt", "plain.txt"],
+            [file_stats.target_file for file_stats in stats],
+        )
+        self.assertEqual(
+            [len(content) for content in sink.files.values()],
+            [file_stats.size for file_stats in stats],
+        )
+
+    def test_render_error(self):
+        self._files.insert(1, ("missing.txt", "missing.txt", True))
+        threads = threading.active_count()
+
+        self.assertRaises(
+            jinja2.TemplateNotFound,
+            self._run,
+            sinks.MemorySink(),
+        )
+        self.assertEqual(threads, threading.active_count())
+
+    def test_write_error(self):
+        sink = sinks.MemorySink()
+
+        with mock.patch.object(sink, "copy_file", side_effect=OSError("full")):
+            self.assertRaises(OSError, self._run, sink)
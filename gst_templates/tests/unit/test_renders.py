@@ -0,0 +1,219 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import os
+import tarfile
+from unittest import mock
+
+from gst_templates import profiles
+from gst_templates import renders
+from gst_templates import repositories
+from gst_templates import settings
+from gst_templates import sinks
+from gst_templates.tests.unit import base
+
+
+TEMPLATE_FILES = {
+    "README.md": "# {{ project.name }}\n",
+    "{{ project.package_name }}/__init__.py": "",
+    "{{ project.package_name }}/version.py": "NAME = '{{ project.package_name }}'\n",
+    "bin/run.sh": "#!/bin/sh\necho {{ project.name }}\n",
+    "static/plain.txt": "no markup in ${here} or {not}\n",
+}
+
+BINARY_CONTENT = b"\x89PNG\r\n\x1a\n\x00\xff{{ not a template }}\xfe"
+
+
+def _fail_to_init_worker(*args):
+    raise RuntimeError("Unable to start a worker")
+
+
+class JinjaTemplateRenderTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_template_files(TEMPLATE_FILES)
+        self._write_template_files({"static/image.bin": BINARY_CONTENT})
+        os.chmod(os.path.join(self._template_path, "bin", "run.sh"), 0o755)
+        self._write_settings(
+            {"project": {"name": "Test project", "package_name": "test_project"}}
+        )
+
+    def _render(self, target_name="target", jobs=1, sink=None):
+        target_path = os.path.join(self._tmp.name, target_name)
+        template_render = renders.JinjaTemplateRender(
+            settings.TemplateSetting(self._settings_path),
+            repositories.GitRepository(target_path),
+            cache_dir=self._cache_dir,
+            jobs=jobs,
+            sink=sink,
+        )
+        template_render.render_template()
+        return target_path
+
+    def _read(self, *path):
+        with open(os.path.join(*path), encoding="utf-8") as fp:
+            return fp.read()
+
+    def test_render_template(self):
+        target_path = self._render()
+
+        self.assertEqual(
+            "# Test project\n",
+            self._read(target_path, "README.md"),
+        )
+        self.assertEqual(
+            "NAME = 'test_project'\n",
+            self._read(target_path, "test_project", "version.py"),
+        )
+        self.assertTrue(
+            os.path.isfile(os.path.join(target_path, "test_project", "__init__.py"))
+        )
+
+    def test_bytecode_cache_is_reused(self):
+        self._render("first")
+        bytecode_dir = os.path.join(self._cache_dir, "bytecode", "tpl-1.0.0")
+        cached = sorted(os.listdir(bytecode_dir))
+
+        self._render("second")
+
+        # Only files with Jinja markup are compiled
+        self.assertEqual(3, len(cached))
+        self.assertEqual(cached, sorted(os.listdir(bytecode_dir)))
+
+    def test_render_template_in_parallel(self):
+        serial_path = self._render("serial")
+        parallel_path = self._render("parallel", jobs=2)
+
+        for name in ("README.md", os.path.join("test_project", "version.py")):
+            self.assertEqual(
+                self._read(serial_path, name),
+                self._read(parallel_path, name),
+            )
+
+    def test_render_in_threads_without_processes(self):
+        serial_path = self._render("serial")
+        with mock.patch.object(
+            renders.futures, "ProcessPoolExecutor", side_effect=NotImplementedError
+        ):
+            parallel_path = self._render("parallel", jobs=2)
+
+        self.assertEqual(
+            self._read(serial_path, "README.md"),
+            self._read(parallel_path, "README.md"),
+        )
+
+    def test_render_in_threads_if_workers_fail_to_start(self):
+        with mock.patch.object(renders, "_init_worker", _fail_to_init_worker):
+            target_path = self._render(jobs=2)
+
+        self.assertEqual("# Test project\n", self._read(target_path, "README.md"))
+
+    def test_render_errors_in_processes_are_raised(self):
+        # A directory is in the way of a rendered file
+        os.makedirs(os.path.join(self._tmp.name, "target", "README.md"))
+
+        with mock.patch.object(
+            renders.JinjaTemplateRender,
+            "_render_files_in_threads",
+            side_effect=AssertionError("Nothing should be rendered in threads"),
+        ):
+            with self.assertRaises(IsADirectoryError):
+                self._render(jobs=2)
+
+    def test_files_without_markup_are_copied(self):
+        target_path = self._render()
+
+        self.assertEqual(
+            TEMPLATE_FILES["static/plain.txt"],
+            self._read(target_path, "static", "plain.txt"),
+        )
+        with open(os.path.join(target_path, "static", "image.bin"), "rb") as fp:
+            self.assertEqual(BINARY_CONTENT, fp.read())
+
+    def test_permission_bits_are_kept(self):
+        target_path = self._render()
+
+        self.assertEqual(
+            0o755,
+            os.stat(os.path.join(target_path, "bin", "run.sh")).st_mode & 0o777,
+        )
+
+    def test_render_to_memory(self):
+        sink = sinks.MemorySink()
+        self._render(jobs=2, sink=sink)
+
+        self.assertEqual(
+            {"", "bin", "static", "test_project"},
+            sink.dirs,
+        )
+        self.assertEqual(
+            {
+                "README.md": b"# Test project\n",
+                "bin/run.sh": b"#!/bin/sh\necho Test project\n",
+                "static/image.bin": BINARY_CONTENT,
+                "static/plain.txt": TEMPLATE_FILES["static/plain.txt"].encode(),
+                "test_project/__init__.py": b"",
+                "test_project/version.py": b"NAME = 'test_project'\n",
+            },
+            sink.files,
+        )
+        self.assertEqual(0o755, sink.modes["bin/run.sh"])
+        self.assertFalse(os.path.exists(os.path.join(self._tmp.name, "target")))
+
+    def test_render_to_tar_stream(self):
+        output = io.BytesIO()
+        sink = sinks.SINKS["tgz"](output)
+        self._render(sink=sink)
+        sink.close()
+
+        output.seek(0)
+        with tarfile.open(fileobj=output, mode="r|gz") as tar:
+            members = {
+                member.name: (member.mode, tar.extractfile(member).read())
+                for member in tar
+                if member.isfile()
+            }
+
+        self.assertEqual(
+            (0o755, b"#!/bin/sh\necho Test project\n"),
+            members["bin/run.sh"],
+        )
+        self.assertEqual((0o644, BINARY_CONTENT), members["static/image.bin"])
+        self.assertEqual(6, len(members))
+
+    def test_file_stats_are_recorded(self):
+        profiler = profiles.Profiler()
+        template_render = renders.JinjaTemplateRender(
+            settings.TemplateSetting(self._settings_path),
+            None,
+            cache_dir=self._cache_dir,
+            sink=sinks.MemorySink(),
+            profiler=profiler,
+        )
+        template_render.render_template()
+
+        self.assertEqual(
+            ["path_render", "file_render"],
+            [stats.name for stats in profiler.phases],
+        )
+        files = {stats.target_file: stats for stats in profiler.files}
+        self.assertEqual(len("# Test project\n"), files["README.md"].size)
+        self.assertEqual(len(BINARY_CONTENT), files["static/image.bin"].size)
+        self.assertEqual(0.0, files["static/image.bin"].compile_time)
+        report = profiler.get_report(slowest=2)
+        self.assertEqual(6, report["files"]["count"])
+        self.assertEqual(2, len(report["slowest"]))
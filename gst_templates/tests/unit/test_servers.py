@@ -0,0 +1,212 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import io
+import json
+import socket
+import tarfile
+import threading
+from unittest import mock
+from urllib import error
+from urllib import request
+
+import jinja2
+
+from gst_templates import servers
+from gst_templates import settings
+from gst_templates.tests.unit import base
+
+
+TEMPLATE_FILES = {
+    "README.md": "# {{ project.name }}\n",
+    "{{ project.package_name }}/__init__.py": "",
+}
+
+
+class TemplateServerTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write_template_files(TEMPLATE_FILES)
+        self._write_settings(
+            {"project": {"name": "Test project", "package_name": "test"}}
+        )
+
+        self._template = servers.WarmTemplate(
+            settings.TemplateSetting(self._settings_path),
+            cache_dir=self._cache_dir,
+        )
+        self.assertEqual(1, self._template.warm_up())
+        self._url = self._serve(workers=2)
+
+    def _serve(self, **kwargs):
+        server = servers.TemplateServer(("127.0.0.1", 0), [self._template], **kwargs)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return "http://%s:%d" % server.server_address[:2]
+
+    def _post(self, path, settings_values):
+        with request.urlopen(
+            f"{self._url}{path}", data=json.dumps(settings_values).encode()
+        ) as response:
+            return response.headers["Content-Type"], response.read()
+
+    def _send_raw(self, data, end=True):
+        host, port = self._url[len("http://") :].split(":")
+        with socket.create_connection((host, int(port)), timeout=10) as sock:
+            sock.sendall(data)
+            if end:
+                # A server reading up to the end of the stream gets it
+                sock.shutdown(socket.SHUT_WR)
+            response = b""
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                response += chunk
+        return int(response.split(b" ", 2)[1])
+
+    def _read_tar(self, data):
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as tar:
+            return {
+                member.name: tar.extractfile(member).read()
+                for member in tar.getmembers()
+                if member.isfile()
+            }
+
+    def test_list_templates(self):
+        with request.urlopen(f"{self._url}/templates") as response:
+            self.assertEqual(
+                {"templates": [{"name": "tpl", "version": "1.0.0"}]},
+                json.load(response),
+            )
+
+    def test_render(self):
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    self._post,
+                    ["/templates/tpl/render"] * 4,
+                    [{"project": {"name": f"Project {i}"}} for i in range(4)],
+                )
+            )
+
+        for i, (content_type, data) in enumerate(results):
+            files = self._read_tar(data)
+            self.assertEqual("application/gzip", content_type)
+            self.assertEqual(f"# Project {i}\n".encode(), files["README.md"])
+            self.assertEqual(b"", files["test/__init__.py"])
+            self.assertEqual(
+                f"Project {i}",
+                json.loads(files["project_settings.json"])["project"]["name"],
+            )
+
+    def test_render_tar(self):
+        content_type, data = self._post("/templates/tpl/render?format=tar", {})
+
+        self.assertEqual("application/x-tar", content_type)
+        self.assertEqual(b"# Test project\n", self._read_tar(data)["README.md"])
+
+    def test_errors(self):
+        for path, data, code in (
+            ("/templates/unknown/render", b"{}", 404),
+            ("/templates/tpl/render?format=rar", b"{}", 400),
+            ("/templates/tpl/render", b"[", 400),
+            (
+                "/templates/tpl/render",
+                json.dumps({"project": {"package_name": ".."}}).encode(),
+                400,
+            ),
+        ):
+            with self.subTest(path=path, data=data):
+                with self.assertRaises(error.HTTPError) as e:
+                    request.urlopen(f"{self._url}{path}", data=data)
+                self.assertEqual(code, e.exception.code)
+                self.assertIn("error", json.load(e.exception))
+                e.exception.close()
+
+    def test_path_segments_are_precompiled(self):
+        with mock.patch.object(
+            jinja2.Environment,
+            "from_string",
+            side_effect=AssertionError("Nothing should be compiled"),
+        ):
+            _, data = self._post("/templates/tpl/render", {})
+
+        self.assertIn("test/__init__.py", self._read_tar(data))
+
+    def test_busy(self):
+        self._url = self._serve(workers=1, queue_size=0)
+        started = threading.Semaphore(0)
+        release = threading.Event()
+        get_render = self._template.get_render
+
+        def wait_and_get_render(*args, **kwargs):
+            started.release()
+            release.wait()
+            return get_render(*args, **kwargs)
+
+        with mock.patch.object(
+            self._template, "get_render", side_effect=wait_and_get_render
+        ):
+            with futures.ThreadPoolExecutor(max_workers=2) as executor:
+                pending = [
+                    executor.submit(self._post, "/templates/tpl/render", {})
+                    for _ in range(2)
+                ]
+                try:
+                    self.assertTrue(started.acquire(timeout=10))
+                    # The second request is not accepted while the worker
+                    # is busy
+                    self.assertFalse(started.acquire(timeout=0.2))
+                finally:
+                    release.set()
+
+                for future in pending:
+                    self.assertEqual("application/gzip", future.result()[0])
+
+    def test_invalid_content_length(self):
+        body = b"{}"
+        for headers, code in (
+            (b"", 411),
+            (b"Content-Length: -1\r\n", 400),
+            (b"Content-Length: many\r\n", 400),
+            (b"Content-Length: %d\r\n" % (servers.MAX_BODY_SIZE + 1), 400),
+        ):
+            with self.subTest(headers=headers):
+                self.assertEqual(
+                    code,
+                    self._send_raw(
+                        b"POST /templates/tpl/render HTTP/1.0\r\n"
+                        + headers
+                        + b"\r\n"
+                        + body
+                    ),
+                )
+
+    def test_slow_client(self):
+        with mock.patch.object(servers._RequestHandler, "timeout", 0.2):
+            self._url = self._serve(workers=1, queue_size=0)
+            # The rest of the body never comes
+            code = self._send_raw(
+                b"POST /templates/tpl/render HTTP/1.0\r\nContent-Length: 10\r\n\r\n{",
+                end=False,
+            )
+
+        self.assertEqual(408, code)
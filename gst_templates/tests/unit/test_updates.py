@@ -0,0 +1,162 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+from unittest import mock
+
+from gst_templates.common import constants
+from gst_templates import manifests
+from gst_templates import renders
+from gst_templates import repositories
+from gst_templates import settings
+from gst_templates import updates
+from gst_templates.tests.unit import base
+
+
+class ProjectUpdaterTestCase(base.TemplateTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(os.environ, base.GIT_ENV)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self._write_template(
+            "1.0.0",
+            {
+                "app.py": "# header\n\nNAME = '{{ project.name }}'\n",
+                "obsolete.txt": "obsolete\n",
+                "{{ project.name }}.txt": "{{ project.name }}\n",
+                "logo.bin": b"\x89PNG\x00base",
+            },
+        )
+        os.chmod(os.path.join(self._template_path, "app.py"), 0o755)
+
+        self._repository = repositories.GitRepository(
+            os.path.join(self._tmp.name, "project")
+        )
+        self._repository.initialize_repository()
+        template_setting = self._get_template_setting()
+        template_render = renders.JinjaTemplateRender(
+            template_setting,
+            self._repository,
+            cache_dir=self._cache_dir,
+        )
+        template_setting.save(os.path.join(self._repository.path, "settings.json"))
+        template_render.save_manifest(template_render.render_template())
+        template_render.commit_project()
+
+    def _write_template(self, version, files):
+        self._write_template_files(files)
+        self._write_settings({"project": {"name": "demo"}}, version=version)
+
+    def _get_template_setting(self):
+        return settings.TemplateSetting(self._settings_path)
+
+    def _commit(self, message):
+        self._repository.add_all()
+        self._repository.commit(message)
+
+    def _project_file(self, name):
+        return os.path.join(self._repository.path, name)
+
+    def _read(self, name):
+        with open(self._project_file(name), encoding="utf-8") as fp:
+            return fp.read()
+
+    def _update(self):
+        return updates.ProjectUpdater(
+            self._get_template_setting(),
+            self._repository,
+            cache_dir=self._cache_dir,
+        ).update()
+
+    def test_update_merges_template_and_project_changes(self):
+        with open(self._project_file("app.py"), "a", encoding="utf-8") as fp:
+            fp.write("LOCAL = True\n")
+        self._commit("Local change")
+
+        self._write_template(
+            "1.1.0",
+            {
+                "app.py": "# new header\n\nNAME = '{{ project.name }}'\n",
+                "obsolete.txt": None,
+                "added.txt": "added\n",
+            },
+        )
+
+        self.assertEqual([], self._update())
+        self.assertEqual(
+            "# new header\n\nNAME = 'demo'\nLOCAL = True\n",
+            self._read("app.py"),
+        )
+        self.assertEqual("added\n", self._read("added.txt"))
+        self.assertEqual("demo\n", self._read("demo.txt"))
+        self.assertFalse(os.path.exists(self._project_file("obsolete.txt")))
+
+    def test_update_reports_conflicts(self):
+        with open(self._project_file("app.py"), "w", encoding="utf-8") as fp:
+            fp.write("# local header\n\nNAME = 'demo'\n")
+        self._commit("Local change")
+
+        self._write_template(
+            "1.1.0",
+            {"app.py": "# new header\n\nNAME = '{{ project.name }}'\n"},
+        )
+
+        self.assertEqual(["app.py"], self._update())
+        self.assertIn("<<<<<<< current", self._read("app.py"))
+
+    def test_update_keeps_changed_removed_files(self):
+        with open(self._project_file("obsolete.txt"), "w", encoding="utf-8") as fp:
+            fp.write("still used\n")
+        self._commit("Local change")
+
+        self._write_template("1.1.0", {"obsolete.txt": None})
+
+        self.assertEqual([], self._update())
+        self.assertEqual("still used\n", self._read("obsolete.txt"))
+
+    def test_update_keeps_changed_binary_files(self):
+        with open(self._project_file("logo.bin"), "wb") as fp:
+            fp.write(b"\x89PNG\x00local")
+        self._commit("Local change")
+
+        self._write_template("1.1.0", {"logo.bin": b"\x89PNG\x00template"})
+
+        self.assertEqual(["logo.bin"], self._update())
+        with open(self._project_file("logo.bin"), "rb") as fp:
+            self.assertEqual(b"\x89PNG\x00local", fp.read())
+
+    def test_merge_binary_files(self):
+        paths = []
+        for name in ("current", "base", "other"):
+            paths.append(os.path.join(self._tmp.name, name))
+            with open(paths[-1], "wb") as fp:
+                fp.write(b"\x00" + name.encode())
+
+        with self.assertRaises(repositories.git.GitCommandError):
+            self._repository.merge_file(*paths)
+
+    def test_manifest_records_file_modes(self):
+        manifest = manifests.ProjectManifest.load(self._repository)
+        tree = self._repository._get_repo().git.ls_tree(constants.PRISTINE_REF)
+
+        self.assertEqual(manifests.EXECUTABLE_FILE_MODE, manifest.files["app.py"].mode)
+        self.assertEqual(manifests.FILE_MODE, manifest.files["demo.txt"].mode)
+        self.assertIn(
+            "100755 blob",
+            next(line for line in tree.splitlines() if line.endswith("\tapp.py")),
+        )
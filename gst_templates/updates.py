@@ -0,0 +1,219 @@
+#    Copyright 2025 Genesis Corporation.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import os
+import tempfile
+
+from gst_templates.common import constants
+from gst_templates.common import files as file_utils
+from gst_templates import manifests
+from gst_templates import renders
+from gst_templates import sinks
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ManifestNotFound(Exception):
+    pass
+
+
+class ProjectUpdater:
+    """
+    Brings a generated project up to date with its template.
+
+    Only template files whose source or settings hash differs from the
+    project manifest are rendered again. Each of them is then merged into
+    the project with a three-way merge, using the previously rendered output
+    as the common ancestor, so local changes of the project are kept.
+    """
+
+    def __init__(self, template_settings, repository, cache_dir=None, jobs=1):
+        super().__init__()
+        self._template_settings = template_settings
+        self._repository = repository
+        self._template_render = renders.JinjaTemplateRender(
+            template_settings,
+            repository,
+            cache_dir=cache_dir,
+            jobs=jobs,
+        )
+
+    def _get_changed_files(self, manifest, target_files, settings_hash):
+        """
+        Find template files whose inputs changed since the last render.
+
+        :return: A dict mapping target paths to template names.
+        :rtype: dict
+        """
+        changed_files = {}
+        for target_file, template_name in target_files.items():
+            entry = manifest.files.get(target_file)
+            if (
+                entry is None
+                or entry.source != template_name
+                or entry.settings_hash != settings_hash
+                or entry.source_hash
+                != self._template_settings.get_file_hash(template_name)
+            ):
+                changed_files[target_file] = template_name
+        return changed_files
+
+    def _apply_file(self, target_file, entry, rendered_path, needs_render=True):
+        """
+        Merge a newly rendered file into the project.
+
+        Files copied as is, like binary files, are never merged. If they
+        were changed in the project, the local version is kept and reported
+        as a conflict.
+
+        :return: True if the file was applied without conflicts.
+        :rtype: bool
+        """
+        project_path = os.path.join(self._repository.path, target_file)
+
+        if not os.path.exists(project_path):
+            if entry is not None:
+                LOG.warning("Skip %s removed from the project", target_file)
+                return True
+            os.makedirs(os.path.dirname(project_path), exist_ok=True)
+            file_utils.copy_file(rendered_path, project_path)
+            LOG.info("Added %s", target_file)
+            return True
+
+        base = b"" if entry is None else self._repository.read_blob(entry.output_hash)
+        with open(project_path, "rb") as fp:
+            current = fp.read()
+
+        if current == base:
+            file_utils.copy_file(rendered_path, project_path)
+            LOG.info("Updated %s", target_file)
+            return True
+
+        if not needs_render:
+            LOG.error("Keep %s changed in the project and the template", target_file)
+            return False
+
+        with tempfile.NamedTemporaryFile() as base_fp:
+            base_fp.write(base)
+            base_fp.flush()
+            merged, conflicts = self._repository.merge_file(
+                project_path,
+                base_fp.name,
+                rendered_path,
+            )
+
+        with open(project_path, "wb") as fp:
+            fp.write(merged)
+
+        if conflicts:
+            LOG.error("Merged %s with %d conflict(s)", target_file, conflicts)
+            return False
+
+        LOG.info("Merged %s", target_file)
+        return True
+
+    def _remove_file(self, target_file, entry):
+        """
+        Remove a file that is no longer rendered by the template, unless it
+        was changed in the project.
+        """
+        project_path = os.path.join(self._repository.path, target_file)
+        if not os.path.exists(project_path):
+            return
+
+        [current_hash] = self._repository.hash_files([project_path], write=False)
+        if current_hash != entry.output_hash:
+            LOG.warning("Keep %s changed in the project", target_file)
+            return
+
+        os.remove(project_path)
+        LOG.info("Removed %s", target_file)
+
+    def update(self):
+        """
+        Update the project to the current template.
+
+        :return: The target paths that were merged with conflicts.
+        :rtype: list
+        """
+        manifest = manifests.ProjectManifest.load(self._repository)
+        if manifest is None:
+            raise ManifestNotFound(
+                f"{constants.PROJECT_MANIFEST_FILE_NAME} not found in"
+                f" {self._repository.path}"
+            )
+
+        settings_hash = manifests.get_settings_hash(self._template_settings)
+        target_entries = {
+            target_file: entry
+            for entry, target_file in self._template_render.get_target_files()
+            if not entry.is_dir
+        }
+        target_files = {
+            target_file: entry.name for target_file, entry in target_entries.items()
+        }
+        changed_files = self._get_changed_files(manifest, target_files, settings_hash)
+        removed_files = set(manifest.files) - set(target_files)
+
+        LOG.info(
+            "%d of %d file(s) changed, %d file(s) removed",
+            len(changed_files),
+            len(target_files),
+            len(removed_files),
+        )
+
+        files = {
+            target_file: entry
+            for target_file, entry in manifest.files.items()
+            if target_file in target_files
+        }
+        conflicts = []
+        with tempfile.TemporaryDirectory() as render_path:
+            self._template_render.render_template(
+                sink=sinks.DirectorySink(render_path),
+                template_names=set(changed_files.values()),
+            )
+            new_manifest = manifests.ProjectManifest.build(
+                self._template_settings,
+                self._repository,
+                changed_files,
+                target_path=render_path,
+            )
+            for target_file in sorted(changed_files):
+                if not self._apply_file(
+                    target_file,
+                    manifest.files.get(target_file),
+                    os.path.join(render_path, target_file),
+                    needs_render=target_entries[target_file].needs_render,
+                ):
+                    conflicts.append(target_file)
+            files.update(new_manifest.files)
+
+        for target_file in sorted(removed_files):
+            self._remove_file(target_file, manifest.files[target_file])
+
+        manifests.ProjectManifest(
+            self._template_settings.name,
+            self._template_settings.version,
+            files,
+        ).save(self._repository)
+        self._template_settings.save(
+            os.path.join(self._repository.path, constants.PROJECT_SETTINGS_FILE_NAME)
+        )
+
+        return conflicts
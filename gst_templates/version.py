@@ -14,10 +14,38 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from importlib.metadata import version
+import functools
 
-version_info = version("templater")
+# The name of the distribution of the package
+DISTRIBUTION_NAME = "gst_templates"
+
+
+@functools.lru_cache(maxsize=None)
+def get_version():
+    """
+    Get the version of the installed package.
+
+    The version is read from the package metadata on first call only, since
+    loading `importlib.metadata` is slow.
+
+    :return: The version or "unknown" if the package is not installed.
+    :rtype: str
+    """
+    from importlib import metadata
+
+    try:
+        return metadata.version(DISTRIBUTION_NAME)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def __getattr__(name):
+    # Keep `version.version_info` available without reading the metadata at
+    # import time
+    if name == "version_info":
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    print(version_info)
+    print(get_version())
@@ -0,0 +1,77 @@
+#    Copyright {{ functions.now().strftime('%Y') }} {{ author.name }}.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from restalchemy.storage.sql import migrations
+
+
+class MigrationStep(migrations.AbstarctMigrationStep):
+    def __init__(self):
+        self._depends = ["0000-init-example-table-f72eb7.py"]
+
+    @property
+    def migration_id(self):
+        return "f1863f7f-3458-4477-b04e-9133a58f93a1"
+
+    @property
+    def is_manual(self):
+        return False
+
+    def upgrade(self, session):
+        expressions = [
+            """
+            ALTER TABLE "examples"
+                DROP CONSTRAINT IF EXISTS "examples_status_check";
+            """,
+            """
+            ALTER TABLE "examples"
+                ADD CONSTRAINT "examples_status_check"
+                CHECK (status IN ('NEW', 'ACTIVE', 'ERROR')),
+                ALTER COLUMN "status" SET DEFAULT 'NEW';
+            """,
+            """
+            CREATE INDEX "examples_new_idx" ON "examples" ("created_at")
+                WHERE "status" = 'NEW';
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+    def downgrade(self, session):
+        expressions = [
+            """
+            DROP INDEX IF EXISTS "examples_new_idx";
+            """,
+            """
+            UPDATE "examples" SET "status" = 'ACTIVE';
+            """,
+            """
+            ALTER TABLE "examples"
+                DROP CONSTRAINT IF EXISTS "examples_status_check";
+            """,
+            """
+            ALTER TABLE "examples"
+                ADD CONSTRAINT "examples_status_check"
+                CHECK (status IN ('ACTIVE')),
+                ALTER COLUMN "status" SET DEFAULT 'ACTIVE';
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+
+migration_step = MigrationStep()
@@ -0,0 +1,70 @@
+#    Copyright {{ functions.now().strftime('%Y') }} {{ author.name }}.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from restalchemy.storage.sql import migrations
+
+
+class MigrationStep(migrations.AbstarctMigrationStep):
+    def __init__(self):
+        self._depends = ["0001-example-build-queue-f1863f.py"]
+
+    @property
+    def migration_id(self):
+        return "6c36a475-a351-41ac-8f5f-fd345c1c2960"
+
+    @property
+    def is_manual(self):
+        return False
+
+    def upgrade(self, session):
+        expressions = [
+            """
+            CREATE OR REPLACE FUNCTION "examples_notify_new"()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                -- Equal notifications of a transaction are sent once
+                PERFORM pg_notify('examples_new', '');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            """
+            CREATE TRIGGER "examples_notify_new_trigger"
+                AFTER INSERT OR UPDATE OF "status" ON "examples"
+                FOR EACH ROW
+                WHEN (NEW."status" = 'NEW')
+                EXECUTE FUNCTION "examples_notify_new"();
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+    def downgrade(self, session):
+        expressions = [
+            """
+            DROP TRIGGER IF EXISTS "examples_notify_new_trigger" ON "examples";
+            """,
+            """
+            DROP FUNCTION IF EXISTS "examples_notify_new"();
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+
+migration_step = MigrationStep()
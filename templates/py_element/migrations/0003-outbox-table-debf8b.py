@@ -0,0 +1,82 @@
+#    Copyright {{ functions.now().strftime('%Y') }} {{ author.name }}.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from restalchemy.storage.sql import migrations
+
+
+class MigrationStep(migrations.AbstarctMigrationStep):
+    def __init__(self):
+        self._depends = ["0002-example-notify-new-6c36a4.py"]
+
+    @property
+    def migration_id(self):
+        return "debf8b1a-6981-4afc-bea1-e89bcd18d14a"
+
+    @property
+    def is_manual(self):
+        return False
+
+    def upgrade(self, session):
+        expressions = [
+            """
+            CREATE TABLE IF NOT EXISTS "outbox" (
+                "seq" BIGSERIAL NOT NULL UNIQUE,
+                "uuid" UUID PRIMARY KEY,
+                "resource" VARCHAR(64) NOT NULL,
+                "resource_uuid" UUID NOT NULL,
+                "action" VARCHAR(16) NOT NULL
+                    CHECK (action IN ('CREATED', 'UPDATED', 'DELETED')),
+                "project_id" UUID NOT NULL,
+                "created_at" TIMESTAMP(6) NOT NULL DEFAULT NOW()
+            );
+            """,
+            """
+            CREATE OR REPLACE FUNCTION "outbox_notify"()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM pg_notify('outbox', '');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            """
+            CREATE TRIGGER "outbox_notify_trigger"
+                AFTER INSERT ON "outbox"
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION "outbox_notify"();
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+    def downgrade(self, session):
+        expressions = [
+            """
+            DROP TRIGGER IF EXISTS "outbox_notify_trigger" ON "outbox";
+            """,
+            """
+            DROP FUNCTION IF EXISTS "outbox_notify"();
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+        self._delete_table_if_exists(session, "outbox")
+
+
+migration_step = MigrationStep()
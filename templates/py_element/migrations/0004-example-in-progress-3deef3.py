@@ -0,0 +1,76 @@
+#    Copyright {{ functions.now().strftime('%Y') }} {{ author.name }}.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from restalchemy.storage.sql import migrations
+
+
+class MigrationStep(migrations.AbstarctMigrationStep):
+    def __init__(self):
+        self._depends = ["0003-outbox-table-debf8b.py"]
+
+    @property
+    def migration_id(self):
+        return "3deef3b4-9596-48bf-83d9-a442779a7772"
+
+    @property
+    def is_manual(self):
+        return False
+
+    def upgrade(self, session):
+        expressions = [
+            """
+            ALTER TABLE "examples"
+                DROP CONSTRAINT IF EXISTS "examples_status_check";
+            """,
+            """
+            ALTER TABLE "examples"
+                ADD CONSTRAINT "examples_status_check"
+                CHECK (status IN ('NEW', 'IN_PROGRESS', 'ACTIVE', 'ERROR'));
+            """,
+            """
+            CREATE INDEX "examples_in_progress_idx" ON "examples" ("updated_at")
+                WHERE "status" = 'IN_PROGRESS';
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+    def downgrade(self, session):
+        expressions = [
+            """
+            DROP INDEX IF EXISTS "examples_in_progress_idx";
+            """,
+            """
+            UPDATE "examples" SET "status" = 'NEW'
+                WHERE "status" = 'IN_PROGRESS';
+            """,
+            """
+            ALTER TABLE "examples"
+                DROP CONSTRAINT IF EXISTS "examples_status_check";
+            """,
+            """
+            ALTER TABLE "examples"
+                ADD CONSTRAINT "examples_status_check"
+                CHECK (status IN ('NEW', 'ACTIVE', 'ERROR'));
+            """,
+        ]
+
+        for expression in expressions:
+            session.execute(expression)
+
+
+migration_step = MigrationStep()
@@ -28,8 +28,75 @@ from {{ project.package_name }}.services.builders import agents
 
 DOMAIN = "builder_agent"
 
+builder_opts = [
+    cfg.IntOpt(
+        "workers",
+        default=1,
+        min=1,
+        help="The number of builder agent processes.",
+    ),
+    cfg.IntOpt(
+        "batch_size",
+        default=agents.DEFAULT_BATCH_SIZE,
+        min=1,
+        help="The number of examples claimed at once.",
+    ),
+    cfg.BoolOpt(
+        "commit_per_item",
+        default=False,
+        help="Claim and commit every example in its own transaction instead"
+        " of committing every batch at once. The batch size is not used.",
+    ),
+    cfg.BoolOpt(
+        "notifications",
+        default=True,
+        help="Wake up on the database notifications of new examples instead"
+        " of polling every iter_min_period.",
+    ),
+    cfg.FloatOpt(
+        "poll_timeout",
+        default=agents.DEFAULT_POLL_TIMEOUT,
+        min=0,
+        help="The maximum time in seconds to wait for notifications before"
+        " polling new examples anyway.",
+    ),
+    cfg.IntOpt(
+        "shards",
+        default=0,
+        min=0,
+        help="The number of shards the projects are split into between the"
+        " agents of all builders. Every agent builds the examples of the"
+        " shards it owns. Must be the same for all builders, 0 disables"
+        " sharding.",
+    ),
+    cfg.IntOpt(
+        "threads",
+        default=0,
+        min=0,
+        help="The number of examples every agent builds in parallel threads,"
+        " each with its own database connection, so [db]"
+        " connection_pool_max_size must be larger. 0 builds them one by one.",
+    ),
+    cfg.FloatOpt(
+        "build_timeout",
+        default=agents.DEFAULT_BUILD_TIMEOUT,
+        min=0,
+        help="The time in seconds an example may be built in a thread"
+        " before it is cancelled. Examples left in progress for longer by"
+        " a dead agent are built again.",
+    ),
+    cfg.FloatOpt(
+        "iter_min_period",
+        default=3,
+        min=0,
+        help="The minimum period in seconds between polls of new examples"
+        " without notifications.",
+    ),
+]
+
 
 CONF = cfg.CONF
+CONF.register_opts(builder_opts, DOMAIN)
 ra_config_opts.register_posgresql_db_opts(CONF)
 
 
@@ -41,15 +108,31 @@ def main():
 
     service_hub = hub.ProcessHubService()
 
-    service = agents.BuilderAgent(
-        iter_min_period=3,
-    )
-
-    service.add_setup(
-        lambda: engines.engine_factory.configure_postgresql_factory(conf=CONF)
-    )
+    # Notified agents wait inside their iterations
+    iter_min_period = CONF[DOMAIN].iter_min_period
+    if CONF[DOMAIN].notifications:
+        iter_min_period = 0
+
+    # Agents claim different rows, so every one adds to the throughput
+    for _ in range(CONF[DOMAIN].workers):
+        service = agents.BuilderAgent(
+            batch_size=CONF[DOMAIN].batch_size,
+            commit_per_item=CONF[DOMAIN].commit_per_item,
+            db_url=CONF.db.connection_url,
+            notifications=CONF[DOMAIN].notifications,
+            poll_timeout=CONF[DOMAIN].poll_timeout,
+            shard_count=CONF[DOMAIN].shards,
+            threads=CONF[DOMAIN].threads,
+            build_timeout=CONF[DOMAIN].build_timeout,
+            iter_min_period=iter_min_period,
+        )
+
+        service.add_setup(
+            lambda: engines.engine_factory.configure_postgresql_factory(conf=CONF)
+        )
+
+        service_hub.add_service(service)
 
-    service_hub.add_service(service)
     service_hub.start()
 
     log.info("Bye!!!")
@@ -14,24 +14,514 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import datetime
 import logging
+import threading
+import time
 
+import psycopg
 from restalchemy.common import contexts
 
 from gcl_looper.services import basic
 
+from {{ project.package_name }}.services.builders import shards
+from {{ project.package_name }}.user_api.dm import models
+
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_POLL_TIMEOUT = 30
+DEFAULT_BUILD_TIMEOUT = 300
+# The times an event is handled before it is dropped
+MAX_EVENT_ATTEMPTS = 5
+
+# The channel the trigger of the `examples` table notifies of new examples
+NOTIFY_CHANNEL = "examples_new"
+# The channel the trigger of the `outbox` table notifies of new events
+OUTBOX_CHANNEL = "outbox"
+
+# New examples and the examples left in progress by an agent that died
+# before building them. The examples being built are locked and skipped.
+CLAIMABLE_CONDITION = """
+    ("status" = %(status)s OR (
+        "status" = %(in_progress)s
+        AND "updated_at" < NOW() AT TIME ZONE 'UTC' - %(stale_after)s
+    ))
+"""
+
+# Rows locked by other agents are skipped instead of waited for, so every
+# agent claims a different batch.
+CLAIM_QUERY = """
+    SELECT * FROM "examples"
+    WHERE {claimable_condition} {shard_condition}
+    ORDER BY "created_at"
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+"""
+
+# The examples are marked as in progress by the claim transaction, so they
+# are not claimed again once it commits.
+CLAIM_IN_PROGRESS_QUERY = """
+    UPDATE "examples"
+    SET "status" = %(in_progress)s, "updated_at" = NOW() AT TIME ZONE 'UTC'
+    WHERE "uuid" IN (
+        SELECT "uuid" FROM "examples"
+        WHERE {claimable_condition} {shard_condition}
+        ORDER BY "created_at"
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING "uuid"
+"""
+
+SHARD_CONDITION = f"AND {shards.SHARD_EXPRESSION} = ANY(%(owned)s)"
+
+CLAIM_ONE_QUERY = """
+    SELECT * FROM "examples"
+    WHERE "uuid" = %s AND "status" = %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+# Only one agent consumes the events of a shard, or all events without
+# shards, so the rows are waited for instead of skipped. An agent taking
+# over a shard then consumes its events after the previous owner.
+CLAIM_EVENTS_QUERY = """
+    SELECT
+        "uuid", "resource", "resource_uuid", "action", "project_id", "created_at"
+    FROM "outbox"
+    WHERE NOT "uuid" = ANY(%(failed)s) {shard_condition}
+    ORDER BY "seq"
+    LIMIT %(limit)s
+    FOR UPDATE
+"""
+
+DELETE_EVENTS_QUERY = """
+    DELETE FROM "outbox" WHERE "uuid" = ANY(%s)
+"""
+
+RETRY_EVENTS_QUERY = """
+    UPDATE "outbox" SET "attempts" = "attempts" + 1 WHERE "uuid" = ANY(%s)
+"""
+
+DROP_EVENTS_QUERY = """
+    DELETE FROM "outbox" WHERE "uuid" = ANY(%s) AND "attempts" >= %s
+    RETURNING "uuid"
+"""
+
+SET_STATUS_QUERY = """
+    UPDATE "examples" SET "status" = %s WHERE "uuid" = %s
+"""
+
+
+class BuildCancelled(Exception):
+    pass
+
 
 class BuilderAgent(basic.BasicService):
-    def __init__(self, **kwargs):
+    """
+    Builds new examples.
+
+    Every iteration claims batches of new examples with
+    `SELECT ... FOR UPDATE SKIP LOCKED` until none are left. Any number of
+    agents, in one or many processes, share the queue without building an
+    example twice. The claimed rows stay locked until the transaction ends,
+    so the examples of an agent that dies are released to the others.
+
+    A batch is built and committed in one transaction. With
+    `commit_per_item` every example is claimed and committed in its own
+    transaction instead: slower, but an example is visible as soon as it is
+    built. A failed example is marked as ERROR without affecting the rest of
+    its batch.
+
+    Every iteration also consumes the changes of resources from the outbox
+    in batches ordered as they were written, see `_handle_event`. Handled
+    events are deleted, so the cost of an iteration depends on the number
+    of changes rather than on the size of the tables. Without `shards` only
+    one agent at a time consumes the events, the others skip them.
+
+    With `notifications` the agent listens to the notifications of new
+    examples and events on a dedicated connection to `db_url` and builds them as soon
+    as they are committed, instead of polling every `iter_min_period`. If
+    nothing is notified for `poll_timeout` seconds, the queue is polled
+    anyway, so missed notifications only delay the work.
+
+    With `shards` the projects are split into that many shards and the
+    agent only builds the examples of the shards it owns, see
+    `shards.ShardOwnership`. The examples of a project are then built by
+    one agent at a time, and the agents do not contend for the same rows.
+    The ownership is rebalanced every iteration on the dedicated
+    connection.
+
+    With `threads` the examples are built in a pool of that many threads,
+    for builds waiting on other services. Only as many examples as there
+    are free threads are claimed, and they are marked as IN_PROGRESS by the
+    claim transaction. Every example is then built and committed in its
+    own session. A new example is claimed as soon as a thread is free, up
+    to `batch_size` examples per iteration, and the builds go on across
+    iterations, so a slow example does not hold back the others.
+
+    A build is cancelled after `build_timeout` seconds: the event given to
+    `_build` is set and the example is marked as ERROR. Every database
+    statement of the build is also interrupted after `build_timeout`
+    seconds. Examples left IN_PROGRESS for longer than `build_timeout`,
+    because their agent died before building them, are claimed again.
+    """
+
+    def __init__(
+        self,
+        batch_size=DEFAULT_BATCH_SIZE,
+        commit_per_item=False,
+        db_url=None,
+        notifications=False,
+        poll_timeout=DEFAULT_POLL_TIMEOUT,
+        shard_count=0,
+        threads=0,
+        build_timeout=DEFAULT_BUILD_TIMEOUT,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
+        self._batch_size = batch_size
+        self._commit_per_item = commit_per_item
+        self._db_url = db_url
+        self._notifications = notifications
+        self._poll_timeout = poll_timeout
+        self._ownership = None
+        if shard_count:
+            self._ownership = shards.ShardOwnership(shard_count)
+        self._connection = None
+        self._threads = threads
+        self._build_timeout = build_timeout
+        self._executor = None
+        # The builds of the pool by their futures
+        self._running = {}
+        # More examples may be waiting after the last iteration
+        self._pending = False
 
     def _setup(self):
         pass
 
-    def _iteration(self):
+    def _connect(self):
+        self._connection = psycopg.connect(self._db_url, autocommit=True)
+        if self._notifications:
+            self._connection.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            self._connection.execute(f"LISTEN {OUTBOX_CHANNEL}")
+
+    def _close_connection(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._ownership is not None:
+            self._ownership.reset()
+
+    def _wait_for_examples(self):
+        """
+        Block until new examples are notified or the poll timeout expires.
+
+        The first call only starts listening and returns at once, so the
+        examples created before are built without waiting.
+        """
+        try:
+            if self._connection is None:
+                self._connect()
+                return
+
+            for _ in self._connection.notifies(
+                timeout=self._poll_timeout, stop_after=1
+            ):
+                pass
+        except psycopg.Error:
+            LOG.exception("Unable to listen to new examples, polling instead")
+            self._close_connection()
+            time.sleep(self._poll_timeout)
+
+    def _rebalance_shards(self):
+        try:
+            if self._connection is None:
+                self._connect()
+            return self._ownership.rebalance(self._connection)
+        except psycopg.Error:
+            # The locks may be lost with the connection
+            LOG.exception("Unable to own shards")
+            self._close_connection()
+            return []
+
+    def _get_shard_condition(self, values, owned):
+        if owned is None:
+            return ""
+        values.update(shards=self._ownership.shards, owned=owned)
+        return SHARD_CONDITION
+
+    def _get_claim_query(self, query, limit, owned):
+        values = {
+            "status": models.ExampleModel.STATUS.NEW.value,
+            "in_progress": models.ExampleModel.STATUS.IN_PROGRESS.value,
+            "stale_after": datetime.timedelta(seconds=self._build_timeout),
+            "limit": limit,
+        }
+        query = query.format(
+            claimable_condition=CLAIMABLE_CONDITION,
+            shard_condition=self._get_shard_condition(values, owned),
+        )
+        return query, values
+
+    def _claim(self, session, limit, owned=None):
+        result = session.execute(*self._get_claim_query(CLAIM_QUERY, limit, owned))
+        return [
+            models.ExampleModel.restore_from_storage(**row) for row in result.fetchall()
+        ]
+
+    def _claim_in_progress(self, limit, owned=None):
+        ctx = contexts.Context()
+        with ctx.session_manager() as session:
+            result = session.execute(
+                *self._get_claim_query(CLAIM_IN_PROGRESS_QUERY, limit, owned)
+            )
+            return [row["uuid"] for row in result.fetchall()]
+
+    def _build(self, session, example, cancelled):
+        """
+        Build an example. Put the actual work here.
+
+        The work is done in the transaction of the claim, so it is committed
+        with the new status of the example. Long builds should stop once
+        `cancelled` is set.
+
+        :type cancelled: threading.Event
+        """
+        example.status = models.ExampleModel.STATUS.ACTIVE.value
+        example.update(session=session)
+
+    def _build_claimed(self, session, examples, cancelled=None):
+        cancelled = cancelled or threading.Event()
+        for example in examples:
+            session.execute("SAVEPOINT build_example")
+            try:
+                self._build(session, example, cancelled)
+                if cancelled.is_set():
+                    raise BuildCancelled()
+            except Exception:
+                LOG.exception("Unable to build example %s", example.uuid)
+                session.execute("ROLLBACK TO SAVEPOINT build_example")
+                session.execute(
+                    SET_STATUS_QUERY,
+                    (models.ExampleModel.STATUS.ERROR.value, str(example.uuid)),
+                )
+            else:
+                session.execute("RELEASE SAVEPOINT build_example")
+
+    def _claim_and_build(self, limit, owned=None):
         ctx = contexts.Context()
-        with ctx.session_manager():
-            LOG.info("Hello from builder agent")
+        with ctx.session_manager() as session:
+            examples = self._claim(session, limit, owned)
+            self._build_claimed(session, examples)
+        return len(examples)
+
+    def _handle_event(self, session, event):
+        """
+        React to a change of a resource. Put the actual work here, like
+        cleaning up after deleted examples.
+
+        Events are only handled once they are committed, in the order they
+        were written. Only the last event of a resource in a batch is
+        handled. If handling fails, the event is handled again by the next
+        iterations, up to `MAX_EVENT_ATTEMPTS` times, and the next events
+        are handled meanwhile. So the handling must be idempotent and rely
+        on the current state of the resource rather than on the order of
+        its events.
+
+        :type event: {{ project.package_name }}.user_api.dm.models.OutboxEvent
+        """
+        LOG.debug(
+            "The %s %s has been %s",
+            event.resource,
+            event.resource_uuid,
+            event.action.lower(),
+        )
+
+    def _compact(self, events):
+        last_events = {}
+        for event in events:
+            key = (event.resource, event.resource_uuid)
+            last_events.pop(key, None)
+            last_events[key] = event
+        return list(last_events.values())
+
+    def _handle_events(self, session, events):
+        failed = []
+        for event in self._compact(events):
+            session.execute("SAVEPOINT handle_event")
+            try:
+                self._handle_event(session, event)
+            except Exception:
+                LOG.exception("Unable to handle event %s", event.uuid)
+                session.execute("ROLLBACK TO SAVEPOINT handle_event")
+                failed.append(event.uuid)
+            else:
+                session.execute("RELEASE SAVEPOINT handle_event")
+        return failed
+
+    def _retry_events(self, session, uuids):
+        session.execute(RETRY_EVENTS_QUERY, (uuids,))
+        result = session.execute(DROP_EVENTS_QUERY, (uuids, MAX_EVENT_ATTEMPTS))
+        for row in result.fetchall():
+            LOG.error("Drop event %s failed %d times", row["uuid"], MAX_EVENT_ATTEMPTS)
+
+    def _lock_events(self, session, owned):
+        if owned is not None:
+            return True
+        # Without shards, the events are consumed by one agent at a time
+        result = session.execute(
+            "SELECT pg_try_advisory_xact_lock(%s, 0) AS locked",
+            (shards.OUTBOX_LOCK_CLASS,),
+        )
+        return result.fetchone()["locked"]
+
+    def _consume_events(self, owned):
+        consumed = 0
+        # Failed events are retried by the next iteration
+        failed = []
+        while True:
+            values = {"limit": self._batch_size, "failed": failed}
+            shard_condition = self._get_shard_condition(values, owned)
+            ctx = contexts.Context()
+            with ctx.session_manager() as session:
+                if not self._lock_events(session, owned):
+                    break
+
+                result = session.execute(
+                    CLAIM_EVENTS_QUERY.format(shard_condition=shard_condition),
+                    values,
+                )
+                events = [
+                    models.OutboxEvent.restore_from_storage(**row)
+                    for row in result.fetchall()
+                ]
+                batch_failed = self._handle_events(session, events)
+                session.execute(
+                    DELETE_EVENTS_QUERY,
+                    (
+                        [
+                            event.uuid
+                            for event in events
+                            if event.uuid not in batch_failed
+                        ],
+                    ),
+                )
+                if batch_failed:
+                    self._retry_events(session, batch_failed)
+
+            consumed += len(events) - len(batch_failed)
+            failed.extend(batch_failed)
+            if len(events) < self._batch_size:
+                break
+
+        if consumed:
+            LOG.info("Consumed %d event(s)", consumed)
+        if failed:
+            LOG.warning("Unable to handle %d event(s)", len(failed))
+
+    def _build_serially(self, owned):
+        limit = 1 if self._commit_per_item else self._batch_size
+        built = 0
+        while True:
+            claimed = self._claim_and_build(limit, owned)
+            built += claimed
+            if claimed < limit:
+                break
+
+        if built:
+            LOG.info("Built %d example(s)", built)
+        # The queue is drained
+        return False
+
+    def _cancel(self, uuid, cancelled):
+        LOG.warning("Cancelling the build of example %s", uuid)
+        cancelled.set()
+
+    def _build_one(self, uuid, cancelled):
+        timer = threading.Timer(self._build_timeout, self._cancel, (uuid, cancelled))
+        timer.start()
+        try:
+            ctx = contexts.Context()
+            with ctx.session_manager() as session:
+                # Interrupt every statement of the build after the timeout
+                session.execute(
+                    "SELECT set_config('statement_timeout', %s, true)",
+                    (str(int(self._build_timeout * 1000)),),
+                )
+                result = session.execute(
+                    CLAIM_ONE_QUERY,
+                    (uuid, models.ExampleModel.STATUS.IN_PROGRESS.value),
+                )
+                examples = [
+                    models.ExampleModel.restore_from_storage(**row)
+                    for row in result.fetchall()
+                ]
+                self._build_claimed(session, examples, cancelled)
+        finally:
+            timer.cancel()
+
+    def _reap(self):
+        for future, uuid in list(self._running.items()):
+            if future.done():
+                del self._running[future]
+                if future.exception() is not None:
+                    LOG.error(
+                        "Unable to build example %s",
+                        uuid,
+                        exc_info=future.exception(),
+                    )
+
+    def _build_in_pool(self, owned):
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=self._threads, thread_name_prefix="builder"
+            )
+
+        submitted = 0
+        while submitted < self._batch_size:
+            self._reap()
+            free_threads = min(
+                self._threads - len(self._running), self._batch_size - submitted
+            )
+            if free_threads:
+                uuids = self._claim_in_progress(free_threads, owned)
+                for uuid in uuids:
+                    cancelled = threading.Event()
+                    future = self._executor.submit(self._build_one, uuid, cancelled)
+                    self._running[future] = uuid
+                submitted += len(uuids)
+                if len(uuids) < free_threads:
+                    # The queue is drained, the running builds go on
+                    return False
+
+            # Cancelled builds hold their threads until they return
+            done, _ = futures.wait(
+                self._running,
+                timeout=self._build_timeout,
+                return_when=futures.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+
+        self._reap()
+        return True
+
+    def _iteration(self):
+        if self._notifications and not self._pending:
+            self._wait_for_examples()
+
+        owned = None
+        if self._ownership is not None:
+            owned = self._rebalance_shards()
+            if not owned:
+                return
+
+        self._consume_events(owned)
+
+        if self._threads:
+            self._pending = self._build_in_pool(owned)
+        else:
+            self._pending = self._build_serially(owned)
@@ -0,0 +1,132 @@
+#    Copyright {{ functions.now().strftime('%Y') }} {{ author.name }}.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import logging
+
+
+LOG = logging.getLogger(__name__)
+
+# The namespaces of the advisory locks of the builder agents
+MEMBER_LOCK_CLASS = 7301
+SHARD_LOCK_CLASS = 7302
+OUTBOX_LOCK_CLASS = 7303
+
+# The shard of an example, the same for all examples of a project
+SHARD_EXPRESSION = 'mod(abs(hashtext("project_id"::text)::bigint), %(shards)s)'
+
+COUNT_MEMBERS_QUERY = """
+    SELECT count(*) FROM pg_locks
+    WHERE "locktype" = 'advisory'
+        AND "granted"
+        AND "classid"::bigint = %s
+        AND "objsubid" = 2
+        AND "database" = (
+            SELECT oid FROM pg_database WHERE datname = current_database()
+        )
+"""
+
+
+class ShardOwnership:
+    """
+    Owns a fair part of the shards of the project keyspace.
+
+    Every owned shard is a session level advisory lock on the connection
+    given to `rebalance`, so the shards of a dead owner are released with
+    its connection and taken over by the others on their next rebalance.
+    The owners are counted by their member locks, and every owner takes
+    `ceil(shards / owners)` shards at most.
+
+    Owners try the shards in the order of rendezvous hashing, the highest
+    hash of the owner and the shard first. The shards are spread evenly
+    and only the shards of the owners which come or go change hands.
+    """
+
+    def __init__(self, shards):
+        super().__init__()
+        self._shards = shards
+        self._owned = set()
+        self._connection = None
+        self._preferred = []
+
+    @property
+    def shards(self):
+        return self._shards
+
+    @property
+    def owned(self):
+        return sorted(self._owned)
+
+    def reset(self):
+        self._owned = set()
+        self._connection = None
+
+    def _get_weight(self, owner, shard):
+        return hashlib.sha256(f"{owner}/{shard}".encode()).digest()
+
+    def _join(self, connection):
+        self.reset()
+        owner = connection.execute("SELECT pg_backend_pid()").fetchone()[0]
+        connection.execute(
+            "SELECT pg_advisory_lock(%s, %s)", (MEMBER_LOCK_CLASS, owner)
+        )
+        self._preferred = sorted(
+            range(self._shards),
+            key=lambda shard: self._get_weight(owner, shard),
+            reverse=True,
+        )
+        self._connection = connection
+
+    def _try_lock(self, connection, shard):
+        return connection.execute(
+            "SELECT pg_try_advisory_lock(%s, %s)", (SHARD_LOCK_CLASS, shard)
+        ).fetchone()[0]
+
+    def rebalance(self, connection):
+        """
+        Release the shards above the fair part or take the free ones up to it.
+
+        :param connection: The autocommit connection holding the locks. The
+            shards are owned anew if it changes.
+        :type connection: psycopg.Connection
+        :return: The owned shards.
+        :rtype: list
+        """
+        if connection is not self._connection:
+            self._join(connection)
+
+        owners = connection.execute(
+            COUNT_MEMBERS_QUERY, (MEMBER_LOCK_CLASS,)
+        ).fetchone()[0]
+        fair_part = -(-self._shards // max(owners, 1))
+
+        for shard in reversed(self._preferred):
+            if len(self._owned) <= fair_part:
+                break
+            if shard in self._owned:
+                connection.execute(
+                    "SELECT pg_advisory_unlock(%s, %s)", (SHARD_LOCK_CLASS, shard)
+                )
+                self._owned.remove(shard)
+
+        for shard in self._preferred:
+            if len(self._owned) >= fair_part:
+                break
+            if shard not in self._owned and self._try_lock(connection, shard):
+                self._owned.add(shard)
+
+        LOG.debug("Own %d of %d shard(s)", len(self._owned), self._shards)
+        return self.owned
@@ -0,0 +1,84 @@
+#    Copyright {{ functions.now().strftime('%Y') }} {{ author.name }}.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import time
+import unittest
+
+import psycopg
+
+from {{ project.package_name }}.services.builders import agents
+from {{ project.package_name }}.services.builders import shards
+
+
+DATABASE_URI = os.environ.get("DATABASE_URI")
+
+
+@unittest.skipIf(DATABASE_URI is None, "DATABASE_URI is not set")
+class BuilderAgentNotificationsTestCase(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self._agent = agents.BuilderAgent(
+            db_url=DATABASE_URI,
+            notifications=True,
+            poll_timeout=10,
+        )
+        self.addCleanup(self._agent._close_connection)
+
+        # The first wait only starts listening
+        self._agent._wait_for_examples()
+
+    def test_wake_up_on_notification(self):
+        with psycopg.connect(DATABASE_URI, autocommit=True) as conn:
+            conn.execute(f"NOTIFY {agents.NOTIFY_CHANNEL}")
+
+        start = time.monotonic()
+        self._agent._wait_for_examples()
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_poll_timeout(self):
+        self._agent._poll_timeout = 0.1
+
+        start = time.monotonic()
+        self._agent._wait_for_examples()
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+
+@unittest.skipIf(DATABASE_URI is None, "DATABASE_URI is not set")
+class ShardOwnershipTestCase(unittest.TestCase):
+    def _connect(self):
+        connection = psycopg.connect(DATABASE_URI, autocommit=True)
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_rebalance(self):
+        first = shards.ShardOwnership(8)
+        first_connection = self._connect()
+        self.assertEqual(list(range(8)), first.rebalance(first_connection))
+
+        # A new owner takes the shards the others release
+        second = shards.ShardOwnership(8)
+        second_connection = self._connect()
+        second.rebalance(second_connection)
+        first.rebalance(first_connection)
+        second.rebalance(second_connection)
+        self.assertEqual(4, len(first.owned))
+        self.assertEqual(set(range(8)), set(first.owned) | set(second.owned))
+
+        # The shards of a dead owner are taken over. Its session is left
+        # alive, so the locks are released before the next rebalance.
+        second_connection.execute("SELECT pg_advisory_unlock_all()")
+        self.assertEqual(list(range(8)), first.rebalance(first_connection))
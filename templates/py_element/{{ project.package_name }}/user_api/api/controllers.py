@@ -17,6 +17,7 @@
 from gcl_iam.api import controllers as iam_controllers
 from restalchemy.api import controllers as ra_controllers
 from restalchemy.api import resources as ra_resources
+from restalchemy.common import contexts
 
 from {{ project.package_name }}.user_api.api import versions
 from {{ project.package_name }}.user_api.dm import models
@@ -28,7 +29,44 @@ class ApiEndpointController(ra_controllers.RoutesListController):
     __TARGET_PATH__ = f"/{versions.API_VERSION_1_0}/"
 
 
+class OutboxControllerMixin:
+    """
+    Appends an event to the outbox in the transaction of every create,
+    update and delete of a resource, so the builders learn about every
+    committed change and about nothing else.
+    """
+
+    def _append_event(self, dm, action, session):
+        models.OutboxEvent(
+            resource=self.model.__tablename__,
+            resource_uuid=dm.uuid,
+            project_id=dm.project_id,
+            action=action.value,
+        ).insert(session=session)
+
+    def create(self, **kwargs):
+        with contexts.Context().session_manager() as session:
+            dm = super().create(**kwargs)
+            self._append_event(dm, models.OutboxEvent.ACTION.CREATED, session)
+        return dm
+
+    def update(self, uuid, **kwargs):
+        with contexts.Context().session_manager() as session:
+            dm = super().update(uuid, **kwargs)
+            self._append_event(dm, models.OutboxEvent.ACTION.UPDATED, session)
+        return dm
+
+    def delete(self, uuid):
+        # Deletes the model as the base controller does, so it is loaded
+        # once for both the delete and the event
+        with contexts.Context().session_manager() as session:
+            dm = self.get(uuid=uuid)
+            dm.delete(session=session)
+            self._append_event(dm, models.OutboxEvent.ACTION.DELETED, session)
+
+
 class ExampleController(
+    OutboxControllerMixin,
     iam_controllers.PolicyBasedControllerMixin,
     ra_controllers.BaseResourceControllerPaginated,
 ):
@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import enum
 
 from restalchemy.dm import models
@@ -22,8 +23,11 @@ from restalchemy.dm import types
 from restalchemy.storage.sql import orm
 
 
-class AlwaysActiveStatus(str, enum.Enum):
+class ExampleStatus(str, enum.Enum):
+    NEW = "NEW"
+    IN_PROGRESS = "IN_PROGRESS"
     ACTIVE = "ACTIVE"
+    ERROR = "ERROR"
 
 
 class ExampleModel(
@@ -35,9 +39,55 @@ class ExampleModel(
 ):
     __tablename__ = "examples"
 
-    STATUS = AlwaysActiveStatus
+    STATUS = ExampleStatus
 
     status = properties.property(
         types.Enum([status.value for status in STATUS]),
-        default=STATUS.ACTIVE.value,
+        default=STATUS.NEW.value,
+    )
+
+
+class OutboxAction(str, enum.Enum):
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    DELETED = "DELETED"
+
+
+class OutboxEvent(
+    models.ModelWithUUID,
+    models.ModelWithProject,
+    orm.SQLStorableMixin,
+):
+    """
+    A change of a resource, appended in the transaction of the change.
+
+    Events only tell which resource has changed, the consumers read its
+    current state. They are ordered by the `seq` column of the table, which
+    is generated by the database and is not a part of the model, like the
+    `attempts` column counting the failed handlings.
+    """
+
+    __tablename__ = "outbox"
+
+    ACTION = OutboxAction
+
+    resource = properties.property(
+        types.String(max_length=64),
+        required=True,
+        read_only=True,
+    )
+    resource_uuid = properties.property(
+        types.UUID(),
+        required=True,
+        read_only=True,
+    )
+    action = properties.property(
+        types.Enum([action.value for action in ACTION]),
+        required=True,
+        read_only=True,
+    )
+    created_at = properties.property(
+        types.UTCDateTimeZ(),
+        read_only=True,
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
     )